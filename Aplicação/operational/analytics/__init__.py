@@ -0,0 +1 @@
+# operational/analytics/__init__.py
\ No newline at end of file
@@ -0,0 +1,476 @@
+# operational/analytics/ab_test_engine.py
+"""
+Análise de testes A/B: vários experimentos × métricas numa única chamada
+
+Entrada: uma linha por usuário com experimento, variante e as métricas
+(conversão 0/1, receita, retenção 0/1...). Cada variante é comparada com o
+controle do seu experimento:
+
+    proportion   teste z de duas proporções (variância agrupada)
+    mean         teste t de Welch (p-valor pela beta incompleta regularizada)
+    rank         Mann-Whitney U (receita com cauda pesada), com correção de empates
+
+Com covariáveis do período anterior ao teste (ex.: receita pré-experimento),
+CUPED ajusta cada métrica e reporta efeito, intervalo e p-valor ajustados e a
+redução de variância. Tudo sai de estatísticas suficientes por célula
+(experimento × variante) calculadas com np.bincount e de uma única ordenação
+para os postos do Mann-Whitney: não há laços por usuário, e os testes são
+vetorizados sobre todos os pares × métricas. O SciPy não é dependência do
+projeto, então as distribuições são implementadas aqui com NumPy.
+"""
+import logging
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Métricas padrão (coluna → tipo de teste), usadas quando presentes
+DEFAULT_METRICS = {'converted': 'proportion', 'revenue': 'mean', 'retained_d7': 'proportion'}
+# Métricas com cauda pesada que também recebem Mann-Whitney
+DEFAULT_RANK_METRICS = ('revenue',)
+# Acima disso a t de Student é tratada como normal (diferença < 1e-5 no p-valor)
+NORMAL_DF = 1e5
+
+_erfc = np.vectorize(math.erfc, otypes=[np.float64])
+
+
+# ---- Distribuições ------------------------------------------------------
+
+def norm_sf(z: np.ndarray) -> np.ndarray:
+    """P(Z > z) da normal padrão"""
+    return 0.5 * _erfc(np.asarray(z, dtype=np.float64) / math.sqrt(2.0))
+
+
+def norm_ppf(q: float) -> float:
+    """Quantil da normal padrão (bisseção sobre norm_sf; q escalar)"""
+    low, high = -40.0, 40.0
+    for _ in range(200):
+        mid = (low + high) / 2.0
+        if 1.0 - norm_sf(mid) < q:
+            low = mid
+        else:
+            high = mid
+    return (low + high) / 2.0
+
+
+_LANCZOS = np.array([76.18009172947146, -86.50532032941677, 24.01409824083091,
+                     -1.231739572450155, 0.1208650973866179e-2, -0.5395239384953e-5])
+
+
+def gammaln(x: np.ndarray) -> np.ndarray:
+    """log Γ(x) para x > 0 (aproximação de Lanczos, erro < 2e-10)"""
+    x = np.asarray(x, dtype=np.float64)
+    tmp = x + 5.5
+    tmp = tmp - (x + 0.5) * np.log(tmp)
+    series = np.full_like(x, 1.000000000190015)
+    for i, coefficient in enumerate(_LANCZOS):
+        series = series + coefficient / (x + 1.0 + i)
+    return -tmp + np.log(2.5066282746310005 * series / x)
+
+
+def _beta_cf(a: np.ndarray, b: np.ndarray, x: np.ndarray, max_iter: int = 500, eps: float = 3e-14) -> np.ndarray:
+    """Fração contínua da beta incompleta (Lentz modificado), vetorizada"""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 - qab * x / qap
+    d = 1.0 / np.where(np.abs(d) < tiny, tiny, d)
+    h = d.copy()
+    for m in range(1, max_iter + 1):
+        m2 = 2.0 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / np.where(np.abs(d) < tiny, tiny, d)
+        c = 1.0 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        h = h * d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / np.where(np.abs(d) < tiny, tiny, d)
+        c = 1.0 + aa / c
+        c = np.where(np.abs(c) < tiny, tiny, c)
+        delta = d * c
+        h = h * delta
+        if np.all(np.abs(delta - 1.0) < eps):
+            break
+    return h
+
+
+def betainc(a: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Beta incompleta regularizada I_x(a, b), vetorizada"""
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (a, b, x)))
+    result = np.where(x >= 1.0, 1.0, 0.0)
+    inside = (x > 0.0) & (x < 1.0)
+    if not inside.any():
+        return result
+    a_, b_, x_ = a[inside], b[inside], x[inside]
+    log_front = gammaln(a_ + b_) - gammaln(a_) - gammaln(b_) + a_ * np.log(x_) + b_ * np.log1p(-x_)
+    front = np.exp(log_front)
+    # A fração converge rápido de um lado do ponto (a+1)/(a+b+2); do outro usa a simetria
+    direct = x_ < (a_ + 1.0) / (a_ + b_ + 2.0)
+    value = np.where(direct,
+                     front * _beta_cf(a_, b_, np.where(direct, x_, 0.5)) / a_,
+                     1.0 - front * _beta_cf(b_, a_, np.where(direct, 0.5, 1.0 - x_)) / b_)
+    result[inside] = value
+    return result
+
+
+def t_sf_two_sided(t: np.ndarray, df: np.ndarray) -> np.ndarray:
+    """P(|T| > |t|) da t de Student com df graus de liberdade"""
+    t, df = np.broadcast_arrays(np.abs(np.asarray(t, dtype=np.float64)), np.asarray(df, dtype=np.float64))
+    normal = df > NORMAL_DF
+    with np.errstate(divide='ignore', invalid='ignore'):
+        student = betainc(np.where(normal, 1.0, df) / 2.0, 0.5, df / (df + t * t))
+    return np.where(normal, 2.0 * norm_sf(t), student)
+
+
+def t_pdf(t: np.ndarray, df: np.ndarray) -> np.ndarray:
+    """Densidade da t de Student"""
+    log_norm = gammaln((df + 1.0) / 2.0) - gammaln(df / 2.0) - 0.5 * np.log(df * math.pi)
+    return np.exp(log_norm - (df + 1.0) / 2.0 * np.log1p(t * t / df))
+
+
+def t_ppf(q: float, df: np.ndarray, newton_steps: int = 6) -> np.ndarray:
+    """
+    Quantil (q > 0.5) da t de Student
+
+    Parte da expansão de Cornish-Fisher em torno do quantil normal e refina
+    com passos de Newton sobre t_sf_two_sided (poucas avaliações da beta
+    incompleta, em vez de uma bisseção inteira).
+    """
+    df = np.asarray(df, dtype=np.float64)
+    z = norm_ppf(q)
+    t = (z + (z ** 3 + z) / (4 * df) + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * df ** 2)
+         + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * df ** 3))
+    tail = 2.0 * (1.0 - q)
+    for _ in range(newton_steps):
+        t = np.maximum(t + (t_sf_two_sided(t, df) - tail) / (2.0 * t_pdf(t, df)), 1e-8)
+    return t
+
+
+def benjamini_hochberg(p_values: np.ndarray) -> np.ndarray:
+    """q-valores (FDR de Benjamini-Hochberg) para um conjunto de p-valores"""
+    p = np.asarray(p_values, dtype=np.float64)
+    q = np.full_like(p, np.nan)
+    valid = ~np.isnan(p)
+    n = int(valid.sum())
+    if not n:
+        return q
+    order = np.argsort(p[valid])
+    ranked = p[valid][order] * n / np.arange(1, n + 1)
+    adjusted = np.minimum(np.minimum.accumulate(ranked[::-1])[::-1], 1.0)
+    values = np.empty(n)
+    values[order] = adjusted
+    q[valid] = values
+    return q
+
+
+def msprt(diff: np.ndarray, variance: np.ndarray, tau2: np.ndarray,
+          alpha: float = 0.05) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Teste sequencial mSPRT com mistura normal (Johari et al.)
+
+    Razão de verossimilhança da diferença observada contra H0 (diferença 0),
+    integrando o efeito sob uma priori N(0, tau2):
+
+        Λ = sqrt(V / (V + τ²)) · exp(Δ²·τ² / (2·V·(V + τ²)))
+
+    O p-valor sempre válido é o mínimo de 1/Λ ao longo das olhadas (quem
+    chama mantém o mínimo), então os dados podem ser consultados a qualquer
+    momento sem inflar o erro tipo I.
+
+    Args:
+        diff: Diferença observada Δ (tratamento - controle)
+        variance: Variância V do estimador de Δ
+        tau2: Variância da priori do efeito (escala de Δ)
+        alpha: Nível da sequência de confiança
+
+    Returns:
+        (1/Λ limitado a 1 nesta olhada, meia-largura da sequência de confiança
+        de 1 - alpha)
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        total = variance + tau2
+        log_lr = 0.5 * np.log(variance / total) + diff * diff * tau2 / (2.0 * variance * total)
+        p_value = np.minimum(np.exp(-log_lr), 1.0)
+        half_width = np.sqrt(variance * total / tau2 * (2.0 * math.log(1.0 / alpha) + np.log(total / variance)))
+    return p_value, half_width
+
+
+# ---- Estatísticas por célula ---------------------------------------------
+
+def cell_codes(experiment: pd.Series, variant: pd.Series) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Código denso da célula (experimento × variante) de cada usuário
+
+    Returns:
+        (códigos 0..n-1, tabela das células com colunas experiment e variant)
+    """
+    experiment_codes, experiments = pd.factorize(experiment.astype(str), sort=True)
+    variant_codes, variants = pd.factorize(variant.astype(str), sort=True)
+    present, codes = np.unique(experiment_codes.astype(np.int64) * len(variants) + variant_codes,
+                               return_inverse=True)
+    table = pd.DataFrame({'experiment': experiments[present // len(variants)],
+                          'variant': variants[present % len(variants)]})
+    return codes, table
+
+
+def _cells(users: pd.DataFrame, experiment_col: str, variant_col: str,
+           control: str) -> Tuple[np.ndarray, pd.DataFrame, np.ndarray, np.ndarray]:
+    """
+    Códigos das células (experimento × variante) e os pares controle × tratamento
+
+    Returns:
+        (célula de cada usuário, tabela das células, célula controle e
+        célula tratamento de cada par)
+    """
+    codes, table = cell_codes(users[experiment_col], users[variant_col])
+    is_control = (table['variant'] == control).to_numpy()
+    control_of = pd.Series(np.flatnonzero(is_control), index=table.loc[is_control, 'experiment'])
+
+    treatment = np.flatnonzero(~is_control)
+    experiments = table['experiment'].to_numpy()[treatment]
+    has_control = pd.Index(control_of.index).get_indexer(experiments) >= 0
+    if not has_control.all():
+        logger.warning(f"⚠️ Experimentos sem variante '{control}': {sorted(set(experiments[~has_control]))}")
+    treatment = treatment[has_control]
+    return codes, table, control_of.reindex(table['experiment'].to_numpy()[treatment]).to_numpy(), treatment
+
+
+def _moments(codes: np.ndarray, n_cells: int, y: np.ndarray,
+             x: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """n, Σy, Σy² (e Σx, Σx², Σxy) por célula"""
+    moments = {
+        'n': np.bincount(codes, minlength=n_cells).astype(np.float64),
+        'sy': np.bincount(codes, weights=y, minlength=n_cells),
+        'syy': np.bincount(codes, weights=y * y, minlength=n_cells),
+    }
+    if x is not None:
+        moments.update({
+            'sx': np.bincount(codes, weights=x, minlength=n_cells),
+            'sxx': np.bincount(codes, weights=x * x, minlength=n_cells),
+            'sxy': np.bincount(codes, weights=x * y, minlength=n_cells),
+        })
+    return moments
+
+
+def _mean_var(s: np.ndarray, ss: np.ndarray, n: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Média e variância amostral (ddof=1) a partir das somas"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = s / n
+        var = np.maximum(ss - n * mean * mean, 0.0) / (n - 1.0)
+    return mean, var
+
+
+def _welch(mean_c, var_c, n_c, mean_t, var_t, n_t, critical: float, alpha: float):
+    """Diferença, intervalo, estatística t e p-valor de Welch"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        a, b = var_c / n_c, var_t / n_t
+        se = np.sqrt(a + b)
+        diff = mean_t - mean_c
+        t = diff / se
+        df = (a + b) ** 2 / (a * a / (n_c - 1.0) + b * b / (n_t - 1.0))
+    df = np.where(np.isfinite(df), df, np.nan)
+    p = np.where(np.isnan(t) | np.isnan(df), np.nan, t_sf_two_sided(np.nan_to_num(t), np.nan_to_num(df, nan=1.0)))
+    half = np.where(df > NORMAL_DF, critical, t_ppf(1.0 - alpha / 2.0, np.nan_to_num(df, nan=1.0))) * se
+    return diff, diff - half, diff + half, t, p
+
+
+# ---- Análise -------------------------------------------------------------
+
+def analyze_experiments(users: pd.DataFrame,
+                        metrics: Optional[Dict[str, str]] = None,
+                        experiment_col: str = 'experiment',
+                        variant_col: str = 'variant',
+                        control: str = 'control',
+                        covariates: Optional[Dict[str, str]] = None,
+                        rank_metrics: Iterable[str] = DEFAULT_RANK_METRICS,
+                        alpha: float = 0.05, correction: bool = True) -> pd.DataFrame:
+    """
+    Compara cada variante com o controle em todas as métricas de uma vez
+
+    Args:
+        users: Uma linha por usuário (experimento, variante e métricas)
+        metrics: Coluna → 'proportion' (teste z) ou 'mean' (Welch); padrão:
+            as de DEFAULT_METRICS presentes em users
+        experiment_col / variant_col: Colunas do experimento e da variante
+        control: Nome da variante de controle
+        covariates: Métrica → coluna pré-experimento para CUPED (ex.:
+            {'revenue': 'pre_revenue'})
+        rank_metrics: Métricas que também recebem Mann-Whitney
+        alpha: Nível de significância (e intervalos de 1 - alpha)
+        correction: significant compara q_value (Benjamini-Hochberg) com
+            alpha; com False, compara o p_value bruto
+
+    Returns:
+        Uma linha por (experimento, variante, métrica, teste) com n_control,
+        n_treatment, control_mean, treatment_mean, diff, lift, ci_low,
+        ci_high, statistic, p_value, q_value (Benjamini-Hochberg sobre todas
+        as linhas), significant e, quando aplicável, prob_superiority
+        (Mann-Whitney) e cuped_diff, cuped_ci_low, cuped_ci_high,
+        cuped_p_value e variance_reduction
+    """
+    if metrics is None:
+        metrics = {name: kind for name, kind in DEFAULT_METRICS.items() if name in users.columns}
+    covariates = {metric: column for metric, column in (covariates or {}).items() if metric in metrics}
+    rank_metrics = [metric for metric in rank_metrics if metric in metrics]
+
+    codes, cells, control_cells, treatment_cells = _cells(users, experiment_col, variant_col, control)
+    n_cells = len(cells)
+    critical = norm_ppf(1.0 - alpha / 2.0)
+
+    frames = []
+    for metric, kind in metrics.items():
+        y = users[metric].to_numpy(dtype=np.float64)
+        x = users[covariates[metric]].to_numpy(dtype=np.float64) if metric in covariates else None
+        m = _moments(codes, n_cells, y, x)
+        mean, var = _mean_var(m['sy'], m['syy'], m['n'])
+        n_c, n_t = m['n'][control_cells], m['n'][treatment_cells]
+        mean_c, mean_t = mean[control_cells], mean[treatment_cells]
+
+        if kind == 'proportion':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                pooled = (m['sy'][control_cells] + m['sy'][treatment_cells]) / (n_c + n_t)
+                z = (mean_t - mean_c) / np.sqrt(pooled * (1.0 - pooled) * (1.0 / n_c + 1.0 / n_t))
+                se = np.sqrt(mean_c * (1 - mean_c) / n_c + mean_t * (1 - mean_t) / n_t)
+            diff = mean_t - mean_c
+            ci_low, ci_high, statistic = diff - critical * se, diff + critical * se, z
+            p_value = np.where(np.isfinite(z), 2.0 * norm_sf(np.abs(np.nan_to_num(z))), np.nan)
+            test = 'z'
+        elif kind == 'mean':
+            diff, ci_low, ci_high, statistic, p_value = _welch(
+                mean_c, var[control_cells], n_c, mean_t, var[treatment_cells], n_t, critical, alpha)
+            test = 'welch_t'
+        else:
+            raise ValueError(f"Tipo de métrica desconhecido para {metric}: {kind}")
+
+        frame = pd.DataFrame({
+            'experiment': cells['experiment'].to_numpy()[treatment_cells],
+            'variant': cells['variant'].to_numpy()[treatment_cells],
+            'metric': metric,
+            'test': test,
+            'n_control': n_c.astype(np.int64),
+            'n_treatment': n_t.astype(np.int64),
+            'control_mean': mean_c,
+            'treatment_mean': mean_t,
+            'diff': diff,
+            'lift': np.divide(diff, mean_c, out=np.full_like(diff, np.nan), where=mean_c != 0),
+            'ci_low': ci_low,
+            'ci_high': ci_high,
+            'statistic': statistic,
+            'p_value': p_value,
+        })
+        if x is not None:
+            frame = frame.assign(**_cuped(m, control_cells, treatment_cells, critical, alpha))
+        frames.append(frame)
+
+        if metric in rank_metrics:
+            frames.append(_mann_whitney(frame, codes, y, control_cells, treatment_cells))
+
+    result = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if result.empty:
+        return result
+    result['q_value'] = benjamini_hochberg(result['p_value'].to_numpy())
+    result['significant'] = result['q_value' if correction else 'p_value'] < alpha
+    logger.info(f"🧪 {len(treatment_cells)} comparações × {len(metrics)} métricas analisadas "
+                f"({len(users):,} usuários)")
+    return result
+
+
+def _cuped(m: Dict[str, np.ndarray], control_cells: np.ndarray, treatment_cells: np.ndarray,
+           critical: float, alpha: float) -> Dict[str, np.ndarray]:
+    """
+    Efeito ajustado por CUPED (Y - θ·(X - média de X)), θ estimado nos dois braços juntos
+
+    Usa só as somas por célula: média ajustada de cada braço
+    ȳ - θ·(x̄_braço - x̄_par) e variância ajustada var(y) - 2θ·cov(x, y) + θ²·var(x).
+    """
+    def pair_sum(key):
+        return m[key][control_cells] + m[key][treatment_cells]
+
+    n = pair_sum('n')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_x, mean_y = pair_sum('sx') / n, pair_sum('sy') / n
+        cov = (pair_sum('sxy') - n * mean_x * mean_y) / (n - 1.0)
+        var_x = (pair_sum('sxx') - n * mean_x * mean_x) / (n - 1.0)
+        theta = np.where(var_x > 0, cov / var_x, 0.0)
+
+    adjusted = {}
+    for arm, cells in (('c', control_cells), ('t', treatment_cells)):
+        n_arm = m['n'][cells]
+        my, vy = _mean_var(m['sy'][cells], m['syy'][cells], n_arm)
+        mx, vx = _mean_var(m['sx'][cells], m['sxx'][cells], n_arm)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cxy = (m['sxy'][cells] - n_arm * mx * my) / (n_arm - 1.0)
+        adjusted[arm] = (my - theta * (mx - mean_x), np.maximum(vy - 2 * theta * cxy + theta * theta * vx, 0.0),
+                         n_arm, vy)
+
+    (mean_c, var_c, n_c, raw_c), (mean_t, var_t, n_t, raw_t) = adjusted['c'], adjusted['t']
+    diff, ci_low, ci_high, _, p_value = _welch(mean_c, var_c, n_c, mean_t, var_t, n_t, critical, alpha)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduction = 1.0 - (var_c / n_c + var_t / n_t) / (raw_c / n_c + raw_t / n_t)
+    return {'cuped_diff': diff, 'cuped_ci_low': ci_low, 'cuped_ci_high': ci_high,
+            'cuped_p_value': p_value, 'variance_reduction': reduction}
+
+
+def _mann_whitney(frame: pd.DataFrame, codes: np.ndarray, y: np.ndarray,
+                  control_cells: np.ndarray, treatment_cells: np.ndarray) -> pd.DataFrame:
+    """
+    Mann-Whitney U de cada par, com uma única ordenação de todos os pares
+
+    Os usuários do controle entram uma vez em cada par do seu experimento.
+    Postos médios nos empates e correção de empates na variância; p-valor
+    bicaudal pela aproximação normal com correção de continuidade.
+    """
+    n_pairs = len(treatment_cells)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=int(codes.max()) + 1 if len(codes) else 0))])
+
+    def members(cell):
+        return order[bounds[cell]:bounds[cell + 1]]
+
+    index_parts, pair_parts, treated_parts = [], [], []
+    for pair, (control_cell, treatment_cell) in enumerate(zip(control_cells, treatment_cells)):
+        for cell, treated in ((control_cell, False), (treatment_cell, True)):
+            rows = members(cell)
+            index_parts.append(rows)
+            pair_parts.append(np.full(len(rows), pair))
+            treated_parts.append(np.full(len(rows), treated))
+    rows = np.concatenate(index_parts) if index_parts else np.zeros(0, dtype=np.int64)
+    pairs = np.concatenate(pair_parts) if pair_parts else np.zeros(0, dtype=np.int64)
+    treated = np.concatenate(treated_parts) if treated_parts else np.zeros(0, dtype=bool)
+    values = y[rows]
+
+    sort = np.lexsort((values, pairs))
+    values, pairs, treated = values[sort], pairs[sort], treated[sort]
+    sizes = np.bincount(pairs, minlength=n_pairs)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    position = np.arange(len(values)) - starts[pairs] + 1.0
+
+    # Grupos de empate: mesmo par e mesmo valor
+    new_group = np.ones(len(values), dtype=bool)
+    new_group[1:] = (pairs[1:] != pairs[:-1]) | (values[1:] != values[:-1])
+    tie_group = np.cumsum(new_group) - 1
+    tie_size = np.bincount(tie_group)
+    ranks = (np.bincount(tie_group, weights=position) / tie_size)[tie_group]
+    tie_pairs = pairs[new_group]
+    ties = np.bincount(tie_pairs, weights=tie_size.astype(np.float64) ** 3 - tie_size, minlength=n_pairs)
+
+    n_t = np.bincount(pairs, weights=treated, minlength=n_pairs)
+    n_c = sizes - n_t
+    rank_sum = np.bincount(pairs, weights=ranks * treated, minlength=n_pairs)
+    u = rank_sum - n_t * (n_t + 1.0) / 2.0
+    n = n_c + n_t
+    with np.errstate(divide='ignore', invalid='ignore'):
+        variance = n_c * n_t / 12.0 * ((n + 1.0) - ties / (n * (n - 1.0)))
+        z = (u - n_c * n_t / 2.0 - np.sign(u - n_c * n_t / 2.0) * 0.5) / np.sqrt(variance)
+        superiority = u / (n_c * n_t)
+    p_value = np.where(np.isfinite(z), 2.0 * norm_sf(np.abs(np.nan_to_num(z))), np.nan)
+
+    ranked = frame[['experiment', 'variant', 'metric', 'n_control', 'n_treatment',
+                    'control_mean', 'treatment_mean', 'diff', 'lift']].copy()
+    ranked.insert(3, 'test', 'mann_whitney')
+    return ranked.assign(statistic=z, p_value=p_value, prob_superiority=superiority)
@@ -0,0 +1,138 @@
+# operational/analytics/cohort_engine.py
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colunas esperadas numa exportação de sessões (uma linha por sessão)
+SESSION_COLUMNS = ('player_id', 'install_date', 'session_date')
+
+
+def has_session_columns(df: pd.DataFrame) -> bool:
+    """Indica se o DataFrame é uma exportação de sessões (e não coortes já agregadas)"""
+    return all(column in df.columns for column in SESSION_COLUMNS)
+
+
+def _codes(values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    """Códigos inteiros densos (0..n-1) e os valores únicos ordenados"""
+    codes, uniques = pd.factorize(values, sort=True)
+    return codes, pd.Index(uniques)
+
+
+def cohort_counts(sessions: pd.DataFrame, max_day: int = 30,
+                  player_col: str = 'player_id',
+                  install_col: str = 'install_date',
+                  session_col: str = 'session_date',
+                  day_col: Optional[str] = None) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Jogadores ativos por coorte × dia desde o install, em uma única passada
+    
+    Cada jogador é contado no máximo uma vez por dia, mesmo com várias
+    sessões. Sem laços em Python: os pares (jogador, dia) são deduplicados
+    com np.unique sobre uma chave inteira e contados com np.bincount, então
+    o custo é O(n log n) no número de sessões, não coortes × dias × linhas.
+    
+    Args:
+        sessions: Uma linha por sessão
+        max_day: Último dia desde o install incluído na matriz
+        player_col / install_col / session_col: Nomes das colunas
+        day_col: Coluna com dias desde o install já calculados (opcional)
+        
+    Returns:
+        (matriz de jogadores retidos [coorte × dia 0..max_day], tamanho de cada coorte)
+    """
+    install = pd.to_datetime(sessions[install_col]).dt.normalize()
+    if day_col is not None:
+        days = pd.to_numeric(sessions[day_col], errors='coerce')
+    else:
+        session = pd.to_datetime(sessions[session_col]).dt.normalize()
+        days = (session - install).dt.days
+    
+    # Linhas com install, sessão ou jogador em branco (NaT/NaN na planilha) ficam de fora
+    valid = (install.notna() & days.notna() & sessions[player_col].notna()).to_numpy()
+    install = install[valid]
+    days = days[valid].to_numpy(dtype=np.int64)
+    
+    player_codes, _ = _codes(sessions[player_col][valid])
+    cohort_codes, cohorts = _codes(install)
+    n_players = int(player_codes.max()) + 1 if len(player_codes) else 0
+    n_cohorts = len(cohorts)
+    width = max_day + 1
+    
+    # Coorte de cada jogador (o install é o mesmo em todas as sessões dele)
+    player_cohort = np.zeros(n_players, dtype=np.int64)
+    player_cohort[player_codes] = cohort_codes
+    sizes = np.bincount(player_cohort, minlength=n_cohorts)
+    
+    # Pares (jogador, dia) únicos dentro da janela
+    in_window = (days >= 0) & (days <= max_day)
+    keys = np.unique(player_codes[in_window].astype(np.int64) * width + days[in_window])
+    players, day_numbers = np.divmod(keys, width)
+    cells = player_cohort[players] * width + day_numbers
+    retained = np.bincount(cells, minlength=n_cohorts * width).reshape(n_cohorts, width)
+    
+    index = pd.DatetimeIndex(cohorts, name='install_date')
+    counts = pd.DataFrame(retained, index=index, columns=pd.RangeIndex(width, name='day'))
+    return counts, pd.Series(sizes, index=index, name='cohort_size')
+
+
+def retention_matrix(counts: pd.DataFrame, sizes: pd.Series,
+                     observation_end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Taxa de retenção (0 a 1) por coorte × dia
+    
+    Args:
+        counts: Jogadores retidos (saída de cohort_counts)
+        sizes: Tamanho de cada coorte
+        observation_end: Último dia com dados; dias que a coorte ainda não
+            viveu ficam NaN em vez de contarem como churn
+            
+    Returns:
+        DataFrame coorte × dia com as taxas
+    """
+    rates = counts.to_numpy(dtype=np.float64) / np.maximum(sizes.to_numpy(), 1)[:, None]
+    if observation_end is not None:
+        age = (pd.Timestamp(observation_end).normalize() - counts.index).days.to_numpy()
+        rates[counts.columns.to_numpy()[None, :] > age[:, None]] = np.nan
+    return pd.DataFrame(rates, index=counts.index, columns=counts.columns)
+
+
+def build_retention_matrix(sessions: pd.DataFrame, max_day: int = 30,
+                           observation_end: Optional[pd.Timestamp] = None,
+                           **columns) -> pd.DataFrame:
+    """
+    Matriz de retenção coorte × dia a partir das sessões
+    
+    Args:
+        sessions: Uma linha por sessão (player_id, install_date, session_date)
+        max_day: Último dia desde o install
+        observation_end: Fim da observação (padrão: última sessão do frame)
+        **columns: Nomes alternativos de colunas (ver cohort_counts)
+        
+    Returns:
+        DataFrame coorte × dia (0..max_day) com taxas de 0 a 1
+    """
+    counts, sizes = cohort_counts(sessions, max_day=max_day, **columns)
+    if observation_end is None:
+        session_col = columns.get('session_col', 'session_date')
+        if columns.get('day_col') is None and len(sessions):
+            observation_end = pd.to_datetime(sessions[session_col]).max()
+    return retention_matrix(counts, sizes, observation_end)
+
+
+def retention_summary(matrix: pd.DataFrame, sizes: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Curva de retenção agregada por dia
+    
+    Returns:
+        DataFrame por dia com a média simples entre coortes ('retention_rate')
+        e, se os tamanhos forem passados, a média ponderada pelo tamanho
+        ('weighted_retention_rate')
+    """
+    summary = pd.DataFrame({'retention_rate': matrix.mean(axis=0, skipna=True)})
+    if sizes is not None:
+        weights = matrix.notna().to_numpy() * sizes.to_numpy()[:, None]
+        weighted = np.nansum(matrix.to_numpy() * weights, axis=0) / np.maximum(weights.sum(axis=0), 1)
+        summary['weighted_retention_rate'] = weighted
+    summary.index.name = 'day'
+    return summary
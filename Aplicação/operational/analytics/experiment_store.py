@@ -0,0 +1,380 @@
+# operational/analytics/experiment_store.py
+"""
+Estatísticas incrementais de experimentos e testes sequenciais (mSPRT)
+
+Em vez de recalcular os testes sobre a tabela inteira de usuários a cada
+carregamento, o ExperimentStore guarda só as estatísticas suficientes por
+(experimento, variante, métrica): contagem, soma e soma dos quadrados. Um
+lote novo custa O(lote) (np.bincount) mais a soma com as poucas células já
+guardadas.
+
+Cada ingestão é uma "olhada" do teste sequencial: o mSPRT (ab_test_engine.msprt)
+dá p-valores sempre válidos, que o store mantém como mínimo acumulado, e
+sequências de confiança. Dá para monitorar os experimentos continuamente e
+parar quando o p-valor cair abaixo de alpha, sem o problema de espiar os
+dados de um teste de horizonte fixo.
+
+A priori do efeito (tau) de cada (experimento, métrica) é fixada na primeira
+olhada e reaproveitada nas seguintes: se ela mudasse com os dados, o p-valor
+deixaria de ser sempre válido.
+
+O estado fica em DATA_DIR/experiments/<nome>/ (Parquet + JSON) e sobrevive a
+reinícios do app. A escrita é atômica (tmp + replace) e protegida pelo mesmo
+lock de arquivo do SnapshotCache, então vários workers podem ingerir no
+mesmo store.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+import numpy as np
+import pandas as pd
+
+from operational.analytics.ab_test_engine import DEFAULT_METRICS, cell_codes, msprt
+from operational.utils.paths import EXPERIMENTS_DIR
+from operational.utils.snapshot_cache import file_lock
+
+KEY = ['experiment', 'variant', 'metric']
+STAT_COLUMNS = ['n', 'sum', 'sum_sq']
+SEQUENTIAL_COLUMNS = ['p_value', 'looks']
+
+
+def batch_stats(batch: pd.DataFrame, metrics: Sequence[str],
+                experiment_col: str = 'experiment', variant_col: str = 'variant') -> pd.DataFrame:
+    """
+    Contagem, soma e soma dos quadrados de um lote por (experimento, variante, métrica)
+
+    Valores ausentes (métrica ainda não observada para o usuário) não contam.
+    """
+    codes, cells = cell_codes(batch[experiment_col], batch[variant_col])
+    frames = []
+    for metric in metrics:
+        values = batch[metric].to_numpy(dtype=np.float64)
+        observed = ~np.isnan(values)
+        metric_codes, values = codes[observed], values[observed]
+        frames.append(cells.assign(
+            metric=metric,
+            n=np.bincount(metric_codes, minlength=len(cells)).astype(np.float64),
+            sum=np.bincount(metric_codes, weights=values, minlength=len(cells)),
+            sum_sq=np.bincount(metric_codes, weights=values * values, minlength=len(cells)),
+        ))
+    if not frames:
+        return _empty(STAT_COLUMNS)
+    return pd.concat(frames, ignore_index=True).set_index(KEY)
+
+
+def _empty(columns: Sequence[str]) -> pd.DataFrame:
+    index = pd.MultiIndex.from_arrays([[], [], []], names=KEY)
+    return pd.DataFrame({column: pd.Series(dtype=np.float64) for column in columns}, index=index)
+
+
+class ExperimentStore:
+    """
+    Estatísticas suficientes acumuladas e p-valores sequenciais por experimento
+
+    Args:
+        name: Nome do store (subdiretório de root)
+        root: Diretório dos stores; None mantém tudo só em memória
+        control: Variante de controle de cada experimento
+        mixing_sd: Desvio da priori do efeito no mSPRT, relativo à média do
+            controle na primeira olhada (0.1 = efeitos da ordem de 10%); com
+            média 0 usa o desvio por usuário
+        alpha: Nível dos testes e das sequências de confiança
+    """
+
+    def __init__(self, name: str = 'experiments', root: Optional[Path] = EXPERIMENTS_DIR,
+                 control: str = 'control', mixing_sd: float = 0.1, alpha: float = 0.05):
+        self.directory = Path(root) / name if root is not None else None
+        self.control = control
+        self.mixing_sd = mixing_sd
+        self.alpha = alpha
+        self.logger = logging.getLogger(__name__)
+        self._thread_lock = threading.RLock()
+        self._stats = _empty(STAT_COLUMNS)
+        self._sequential = _empty(SEQUENTIAL_COLUMNS)
+        self._meta: Dict[str, Any] = self._new_meta()
+        # Lotes já ingeridos: conjunto em memória, arquivo só-de-acréscimo em disco
+        self._batches: Set[str] = set()
+        self._new_batches: List[str] = []
+        self._rewrite_batches = False
+        self._refresh()
+
+    @staticmethod
+    def _new_meta() -> Dict[str, Any]:
+        return {'version': 0, 'rows': 0, 'batches': 0, 'offsets': {}, 'tau2': {}, 'updated_at': None}
+
+    # ---- Persistência ---------------------------------------------------
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    def _read_meta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path('meta.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _read_batches(self) -> Set[str]:
+        try:
+            with open(self._path('batches.txt'), 'r', encoding='utf-8') as f:
+                return set(f.read().splitlines())
+        except FileNotFoundError:
+            return set()
+
+    def _refresh(self):
+        """Relê o disco se outro processo gravou uma versão mais nova"""
+        if self.directory is None:
+            return
+        meta = self._read_meta()
+        if meta is None or meta['version'] == self._meta['version']:
+            return
+        try:
+            self._stats = pd.read_parquet(self._path('stats.parquet')).set_index(KEY)
+            self._sequential = pd.read_parquet(self._path('sequential.parquet')).set_index(KEY)
+            self._batches = self._read_batches()
+        except Exception as e:
+            self.logger.warning(f"⚠️ Store de experimentos ilegível em {self.directory}: {e}")
+            return
+        self._meta = meta
+        self._new_batches = []
+        self._rewrite_batches = False
+
+    def _write(self):
+        """Grava estatísticas, p-valores, lotes e metadados (o JSON por último marca a versão)"""
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for name, frame in (('stats.parquet', self._stats), ('sequential.parquet', self._sequential)):
+            tmp = self._path(f"{name}.{os.getpid()}.tmp")
+            frame.reset_index().to_parquet(tmp, index=False)
+            os.replace(tmp, self._path(name))
+        if self._rewrite_batches:
+            tmp = self._path(f"batches.txt.{os.getpid()}.tmp")
+            with open(tmp, 'w', encoding='utf-8') as f:
+                f.writelines(f"{batch_id}\n" for batch_id in self._batches)
+            os.replace(tmp, self._path('batches.txt'))
+        elif self._new_batches:
+            with open(self._path('batches.txt'), 'a', encoding='utf-8') as f:
+                f.writelines(f"{batch_id}\n" for batch_id in self._new_batches)
+        self._new_batches = []
+        self._rewrite_batches = False
+        tmp = self._path(f"meta.json.{os.getpid()}.tmp")
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._meta, f)
+        os.replace(tmp, self._path('meta.json'))
+
+    @contextmanager
+    def _reading(self):
+        with self._thread_lock:
+            if self.directory is None or not self.directory.exists():
+                yield
+                return
+            with file_lock(self._path('.lock'), exclusive=False):
+                self._refresh()
+            yield
+
+    @contextmanager
+    def _transaction(self):
+        """Leitura-modificação-escrita exclusiva (entre threads e processos)"""
+        with self._thread_lock:
+            if self.directory is None:
+                yield
+                return
+            with file_lock(self._path('.lock'), exclusive=True):
+                self._refresh()
+                version = self._meta['version']
+                yield
+                # Nada mudou (lote repetido, nenhuma linha nova): não regrava o store
+                if self._meta['version'] != version:
+                    self._write()
+
+    # ---- Ingestão -------------------------------------------------------
+
+    def ingest(self, batch: pd.DataFrame, metrics: Optional[Sequence[str]] = None,
+               batch_id: Optional[str] = None, experiment_col: str = 'experiment',
+               variant_col: str = 'variant') -> int:
+        """
+        Soma um lote de usuários às estatísticas e faz uma olhada sequencial
+
+        Args:
+            batch: Uma linha por usuário com o resultado final das métricas
+            metrics: Colunas a acumular (padrão: as de DEFAULT_METRICS presentes)
+            batch_id: Identificador do lote; um lote já ingerido é ignorado
+            experiment_col / variant_col: Colunas do experimento e da variante
+
+        Returns:
+            Linhas ingeridas (0 se o lote já tinha sido ingerido)
+        """
+        with self._transaction():
+            return self._ingest(batch, metrics, batch_id, experiment_col, variant_col)
+
+    def ingest_new_rows(self, table: pd.DataFrame, source: str, **options) -> int:
+        """
+        Ingere só as linhas que uma tabela só-de-acréscimo ganhou desde a última vez
+
+        O store lembra quantas linhas de `source` já viu. Se a tabela
+        encolheu (foi reescrita), as somas antigas não podem ser desfeitas:
+        o store é zerado e a tabela inteira é ingerida de novo.
+        """
+        with self._transaction():
+            offset = self._meta['offsets'].get(source, 0)
+            if len(table) < offset:
+                self.logger.warning(f"⚠️ {source} encolheu ({offset} → {len(table)} linhas): store reiniciado")
+                self._clear()
+                offset = 0
+            if len(table) == offset:
+                return 0
+            rows = self._ingest(table.iloc[offset:], batch_id=f"{source}:{offset}-{len(table)}", **options)
+            self._meta['offsets'][source] = len(table)
+            return rows
+
+    def _ingest(self, batch: pd.DataFrame, metrics: Optional[Sequence[str]] = None,
+                batch_id: Optional[str] = None, experiment_col: str = 'experiment',
+                variant_col: str = 'variant') -> int:
+        if batch_id is not None and batch_id in self._batches:
+            self.logger.info(f"⏭️ Lote {batch_id} já ingerido")
+            return 0
+        if metrics is None:
+            metrics = [metric for metric in DEFAULT_METRICS if metric in batch.columns]
+
+        start = time.perf_counter()
+        new = batch_stats(batch, metrics, experiment_col, variant_col)
+        self._stats = self._stats.add(new, fill_value=0.0) if len(self._stats) else new
+        self._look()
+
+        if batch_id is not None:
+            self._batches.add(batch_id)
+            if self.directory is not None:
+                self._new_batches.append(batch_id)
+            self._meta['batches'] += 1
+        self._meta['rows'] += len(batch)
+        self._meta['version'] += 1
+        self._meta['updated_at'] = time.time()
+        self.logger.info(f"📥 {len(batch):,} usuários ingeridos em {time.perf_counter() - start:.3f}s "
+                         f"({self._meta['rows']:,} no total)")
+        return len(batch)
+
+    def _look(self):
+        """Atualiza o p-valor sempre válido (mínimo acumulado) de cada comparação"""
+        comparisons = self._comparisons(fix_mixing=True)
+        previous = self._sequential.reindex(comparisons.index)
+        self._sequential = pd.DataFrame({
+            'p_value': np.fmin(previous['p_value'].to_numpy(), comparisons['look_p_value'].to_numpy()),
+            'looks': previous['looks'].fillna(0.0).to_numpy() + 1.0,
+        }, index=comparisons.index)
+
+    def _clear(self):
+        version = self._meta['version']
+        self._stats = _empty(STAT_COLUMNS)
+        self._sequential = _empty(SEQUENTIAL_COLUMNS)
+        self._meta = self._new_meta()
+        self._meta['version'] = version + 1
+        self._batches = set()
+        self._new_batches = []
+        self._rewrite_batches = True
+
+    def reset(self):
+        """Descarta todas as estatísticas e p-valores"""
+        with self._transaction():
+            self._clear()
+
+    # ---- Consulta -------------------------------------------------------
+
+    def _mixing_variance(self, merged: pd.DataFrame, scale: np.ndarray, fix: bool) -> np.ndarray:
+        """
+        tau² da priori do efeito por comparação
+
+        Usa o valor guardado para (experimento, métrica); sem ele, o da escala
+        atual, que com fix=True (uma olhada) passa a ser o valor guardado.
+        Valores não finitos (controle ainda sem variância) não são fixados.
+        """
+        stored = self._meta['tau2']
+        current = (self.mixing_sd * scale) ** 2
+        tau2 = current.copy()
+        for i, (experiment, metric) in enumerate(zip(merged['experiment'].astype(str), merged['metric'])):
+            fixed = stored.get(metric, {}).get(experiment)
+            if fixed is not None:
+                tau2[i] = fixed
+            elif fix and np.isfinite(current[i]) and current[i] > 0:
+                stored.setdefault(metric, {})[experiment] = float(current[i])
+        return tau2
+
+    def _comparisons(self, fix_mixing: bool = False) -> pd.DataFrame:
+        """Cada variante contra o controle do experimento, com o mSPRT desta olhada"""
+        stats = self._stats.reset_index()
+        is_control = stats['variant'] == self.control
+        merged = stats[~is_control].merge(stats[is_control].drop(columns='variant'),
+                                          on=['experiment', 'metric'], suffixes=('_t', '_c'))
+
+        arms = {}
+        for arm in ('c', 't'):
+            n, total, squares = (merged[f'{column}_{arm}'].to_numpy() for column in STAT_COLUMNS)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                mean = total / n
+                var = np.maximum(squares - n * mean * mean, 0.0) / (n - 1.0)
+            arms[arm] = (n, mean, var)
+        (n_c, mean_c, var_c), (n_t, mean_t, var_t) = arms['c'], arms['t']
+
+        diff = mean_t - mean_c
+        with np.errstate(divide='ignore', invalid='ignore'):
+            variance = var_c / n_c + var_t / n_t
+            scale = np.where(mean_c != 0, np.abs(mean_c), np.sqrt((var_c + var_t) / 2.0))
+        tau2 = self._mixing_variance(merged, scale, fix_mixing)
+        look_p, half_width = msprt(diff, variance, tau2, self.alpha)
+
+        result = pd.DataFrame({
+            'experiment': merged['experiment'],
+            'variant': merged['variant'],
+            'metric': merged['metric'],
+            'n_control': n_c.astype(np.int64),
+            'n_treatment': n_t.astype(np.int64),
+            'control_mean': mean_c,
+            'treatment_mean': mean_t,
+            'diff': diff,
+            'lift': np.divide(diff, mean_c, out=np.full_like(diff, np.nan), where=mean_c != 0),
+            'cs_low': diff - half_width,
+            'cs_high': diff + half_width,
+            'tau': np.sqrt(tau2),
+            'look_p_value': np.where(np.isfinite(look_p), look_p, 1.0),
+        })
+        return result.set_index(KEY)
+
+    def results(self) -> pd.DataFrame:
+        """
+        Estado atual de cada comparação
+
+        Returns:
+            Uma linha por (experimento, variante, métrica) com n_control,
+            n_treatment, médias, diff, lift, a sequência de confiança
+            (cs_low, cs_high), tau (desvio da priori do efeito), p_value
+            sempre válido, looks (olhadas) e significant (p_value < alpha)
+        """
+        with self._reading():
+            if not len(self._stats):
+                return pd.DataFrame(columns=KEY)
+            comparisons = self._comparisons().drop(columns='look_p_value')
+            result = comparisons.join(self._sequential)
+        result['looks'] = result['looks'].fillna(0).astype(np.int64)
+        result['significant'] = result['p_value'] < self.alpha
+        return result.reset_index()
+
+    def stats(self) -> pd.DataFrame:
+        """Estatísticas suficientes acumuladas por (experimento, variante, métrica)"""
+        with self._reading():
+            return self._stats.reset_index()
+
+    def info(self) -> Dict[str, Any]:
+        """Linhas ingeridas, lotes, posições por fonte e horário da última ingestão"""
+        with self._reading():
+            return {'rows': self._meta['rows'], 'batches': self._meta['batches'],
+                    'offsets': dict(self._meta['offsets']), 'updated_at': self._meta['updated_at']}
+
+
+# Store padrão do dashboard (persistido em DATA_DIR/experiments)
+experiment_store = ExperimentStore()
@@ -0,0 +1,130 @@
+# operational/analytics/monetization_engine.py
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Colunas da tabela plana de compras (uma linha por compra)
+PURCHASE_COLUMNS = ('player_id', 'day', 'value')
+
+# Rótulo dos jogadores sem segmento (célula vazia ou em branco na planilha)
+UNKNOWN_SEGMENT = 'unknown'
+
+
+def has_purchase_columns(df: pd.DataFrame) -> bool:
+    """Indica se o DataFrame é uma tabela plana de compras"""
+    return all(column in df.columns for column in PURCHASE_COLUMNS)
+
+
+def flatten_purchases(players: pd.DataFrame, purchases_col: str = 'purchases',
+                      player_col: str = 'player_id') -> pd.DataFrame:
+    """
+    Converte a coluna de listas de compras ({'day', 'value'}) numa tabela plana
+
+    Args:
+        players: Uma linha por jogador com a lista de compras
+        purchases_col: Coluna com as listas de compras
+        player_col: Coluna com o id do jogador
+
+    Returns:
+        DataFrame (player_id, day, value) com uma linha por compra
+    """
+    exploded = players[[player_col, purchases_col]].explode(purchases_col).dropna(subset=[purchases_col])
+    records = exploded[purchases_col].tolist()
+    return pd.DataFrame({
+        'player_id': exploded[player_col].to_numpy(),
+        'day': np.fromiter((p['day'] for p in records), dtype=np.int64, count=len(records)),
+        'value': np.fromiter((p['value'] for p in records), dtype=np.float64, count=len(records)),
+    })
+
+
+def daily_revenue(purchases: pd.DataFrame, n_days: Optional[int] = None) -> pd.Series:
+    """
+    Receita por dia com um único np.bincount ponderado pelo valor
+
+    Args:
+        purchases: Tabela plana de compras
+        n_days: Número de dias da série (padrão: até a última compra)
+
+    Returns:
+        Series indexada por dia (0..n_days-1), com zero nos dias sem compra
+    """
+    # Compras sem dia ou valor (células em branco) não entram
+    purchases = purchases[purchases['day'].notna() & purchases['value'].notna()]
+    days = purchases['day'].to_numpy(dtype=np.int64)
+    values = purchases['value'].to_numpy(dtype=np.float64)
+    if n_days is None:
+        n_days = int(days.max()) + 1 if len(days) else 0
+    in_range = (days >= 0) & (days < n_days)
+    revenue = np.bincount(days[in_range], weights=values[in_range], minlength=n_days)
+    return pd.Series(revenue, index=pd.RangeIndex(n_days, name='day'), name='revenue')
+
+
+def _spend_per_player(players: pd.DataFrame, purchases: pd.DataFrame,
+                      player_col: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Gasto total e número de compras de cada jogador, na ordem de `players`"""
+    index = pd.Index(players[player_col])
+    codes = index.get_indexer(purchases['player_id'])
+    known = (codes >= 0) & purchases['value'].notna().to_numpy()
+    spend = np.bincount(codes[known], weights=purchases['value'].to_numpy(dtype=np.float64)[known],
+                        minlength=len(index))
+    count = np.bincount(codes[known], minlength=len(index))
+    return spend, count
+
+
+def monetization_summary(players: pd.DataFrame, purchases: pd.DataFrame,
+                         player_col: str = 'player_id',
+                         active_days_col: str = 'active_days',
+                         segment_col: str = 'segment') -> Dict[str, Any]:
+    """
+    Métricas de monetização e LTV por segmento em uma única passada
+
+    Args:
+        players: Uma linha por jogador (player_id, active_days e, opcionalmente, segment)
+        purchases: Tabela plana de compras
+
+    Returns:
+        Dicionário com total_revenue, total_players, paying_players,
+        conversion_rate, arppu, arpdau, arpu e 'segments' (DataFrame por
+        segmento com players, paying_players, revenue, ltv, arppu,
+        conversion_rate e revenue_share)
+    """
+    spend, purchase_count = _spend_per_player(players, purchases, player_col)
+    paying = purchase_count > 0
+
+    total_revenue = float(spend.sum())
+    total_players = len(players)
+    paying_players = int(paying.sum())
+    player_days = float(players[active_days_col].sum()) if active_days_col in players.columns else 0.0
+
+    summary = {
+        'total_revenue': total_revenue,
+        'total_players': total_players,
+        'paying_players': paying_players,
+        'conversion_rate': paying_players / total_players if total_players else 0.0,
+        'arppu': total_revenue / paying_players if paying_players else 0.0,
+        'arpdau': total_revenue / player_days if player_days else 0.0,
+        'arpu': total_revenue / total_players if total_players else 0.0,
+    }
+
+    if segment_col in players.columns:
+        segment = players[segment_col].astype('object')
+        blank = segment.isna() | (segment.astype(str).str.strip() == '')
+        segment = segment.mask(blank, UNKNOWN_SEGMENT)
+        segment_codes, segments = pd.factorize(segment)
+        n_segments = len(segments)
+        size = np.bincount(segment_codes, minlength=n_segments)
+        revenue = np.bincount(segment_codes, weights=spend, minlength=n_segments)
+        payers = np.bincount(segment_codes, weights=paying, minlength=n_segments)
+        segment_table = pd.DataFrame({
+            'players': size,
+            'paying_players': payers.astype(np.int64),
+            'revenue': revenue,
+            'ltv': revenue / np.maximum(size, 1),
+            'arppu': np.divide(revenue, payers, out=np.zeros(n_segments), where=payers > 0),
+            'conversion_rate': payers / np.maximum(size, 1),
+            'revenue_share': revenue / total_revenue if total_revenue else np.zeros(n_segments),
+        }, index=pd.Index(segments, name=segment_col))
+        summary['segments'] = segment_table
+
+    return summary
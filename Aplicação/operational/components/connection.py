@@ -0,0 +1,44 @@
+# operational/components/connection.py
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import streamlit as st
+
+from config.settings import settings
+from operational.utils.sheets_client import sheets_client
+
+
+@st.cache_data(ttl=settings.connection_status_ttl, show_spinner=False)
+def get_connection_status() -> Dict[str, Any]:
+    """
+    Status da conexão com o Google Sheets, reaproveitado por CONNECTION_STATUS_TTL
+
+    Usa o serviço do pool (sem construir um novo a cada rerun) e os
+    metadados da planilha já em cache.
+    """
+    health = sheets_client.health_check()
+    return {
+        'ok': health['service_available'] and health['sheets_accessible'],
+        'sheets_count': health['sheets_count'],
+        'error': health['error_message'],
+        'checked_at': datetime.now(),
+    }
+
+
+def display_connection_status(warmup_state: Optional[Dict[str, Any]] = None):
+    """
+    Status da conexão na sidebar, sem mensagens a cada rerun
+    
+    Enquanto o warm-up (warmup_state) ainda está construindo o serviço, o
+    primeiro render não espera pela verificação.
+    """
+    if warmup_state is not None and not warmup_state['done']:
+        st.sidebar.info("⏳ Conectando ao Google Sheets...")
+        return
+    
+    status = get_connection_status()
+    if status['ok']:
+        st.sidebar.success(f"✅ Google Sheets OK ({status['sheets_count']} abas)")
+    else:
+        st.sidebar.error(f"❌ Google Sheets Erro{': ' + status['error'] if status['error'] else ''}")
+    st.sidebar.caption(f"Verificado às {status['checked_at']:%H:%M:%S}")
@@ -0,0 +1,43 @@
+# operational/components/debug_panel.py
+import pandas as pd
+import streamlit as st
+
+from operational.utils.sheets_client import sheets_client
+from operational.utils.telemetry import registry
+
+
+def display_debug_panel():
+    """
+    Painel de métricas do acesso às planilhas (só com settings.debug_mode)
+
+    Mostra os spans agregados (tempo médio/máximo, bytes, linhas e células),
+    os spans mais recentes, o cache por range e permite baixar o registro em
+    JSON ou no formato texto do Prometheus.
+    """
+    with st.sidebar.expander("🔬 Métricas (debug)", expanded=False):
+        summary = pd.DataFrame(registry.summary())
+        if summary.empty:
+            st.caption("Nenhuma métrica registrada ainda")
+        else:
+            st.dataframe(summary, hide_index=True, use_container_width=True)
+
+        recent = registry.recent_spans(limit=20)
+        if recent:
+            st.markdown("**Spans recentes**")
+            st.dataframe(pd.DataFrame([{
+                'span': item['name'],
+                **item['labels'],
+                'ms': round(item['seconds'] * 1000, 1),
+                **item['attributes'],
+                'erro': item['error'],
+            } for item in recent]), hide_index=True, use_container_width=True)
+
+        cache = sheets_client.cache_stats()
+        st.caption(f"Cache: {cache['entries']} entradas · hit rate {cache['hit_rate']:.0%} · "
+                   f"{cache['misses']} misses · {cache['coalesced']} coalescidas")
+
+        col1, col2 = st.columns(2)
+        col1.download_button("JSON", registry.to_json(), file_name="sheets_metrics.json",
+                             mime="application/json")
+        col2.download_button("Prometheus", registry.to_prometheus(), file_name="sheets_metrics.prom",
+                             mime="text/plain")
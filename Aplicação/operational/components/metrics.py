@@ -1,5 +1,6 @@
 # operational/components/metrics.py
 import streamlit as st
+from datetime import datetime
 from typing import Dict, Any
 
 def display_kpi_row(metrics: Dict[str, Any], cols: int = 4):
@@ -25,4 +26,16 @@ def display_data_quality_check(df):
         st.metric("📋 Colunas", len(df.columns))
     with col3:
         missing_pct = (df.isnull().sum().sum() / (len(df) * len(df.columns)) * 100)
-        st.metric("❓ Dados Faltando", f"{missing_pct:.1f}%")
\ No newline at end of file
+        st.metric("❓ Dados Faltando", f"{missing_pct:.1f}%")
+
+def display_data_freshness(df):
+    """Exibe o horário dos dados carregados ("dados de")"""
+    fetched_at = df.attrs.get('fetched_at')
+    if fetched_at is None:
+        return
+    
+    as_of = datetime.fromtimestamp(fetched_at).strftime('%d/%m/%Y %H:%M:%S')
+    if df.attrs.get('stale'):
+        st.caption(f"🕒 Dados de {as_of} · atualizando em segundo plano")
+    else:
+        st.caption(f"🕒 Dados de {as_of}")
\ No newline at end of file
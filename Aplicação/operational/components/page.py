@@ -0,0 +1,45 @@
+# operational/components/page.py
+import time
+
+import streamlit as st
+
+from config.settings import settings
+from operational.components.connection import display_connection_status
+from operational.components.debug_panel import display_debug_panel
+from operational.utils.profiling import record, timings
+from operational.utils.warmup import warm_up
+
+PAGE_START_KEY = '_page_start'
+
+
+def setup_page(page_title: str = "🎮 Game Product Dashboard"):
+    """
+    Cabeçalho comum das páginas (deve ser a primeira chamada do Streamlit)
+
+    Configura a página, dispara o warm-up do processo e mostra o status da
+    conexão (em cache) na sidebar. A navegação entre páginas é a nativa do
+    Streamlit (diretório pages/).
+    """
+    st.session_state[PAGE_START_KEY] = time.perf_counter()
+    st.set_page_config(page_title=page_title, layout="wide", initial_sidebar_state="expanded")
+
+    warmup_state = warm_up()
+
+    st.sidebar.markdown("**Status da Conexão:**")
+    try:
+        display_connection_status(warmup_state)
+    except Exception as e:
+        st.sidebar.error(f"❌ Erro: {e}")
+
+
+def page_footer():
+    """Rodapé comum, tempo de execução da página e painel de métricas (em debug)"""
+    st.markdown("---")
+    st.markdown("*Dashboard desenvolvido para estudos de Python + Streamlit*")
+
+    start = st.session_state.get(PAGE_START_KEY)
+    if start is not None:
+        record('app.script_run', time.perf_counter() - start)
+    if settings.debug_mode:
+        st.sidebar.caption(" · ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings().items()))
+        display_debug_panel()
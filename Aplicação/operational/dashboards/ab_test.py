@@ -0,0 +1,181 @@
+# operational/dashboards/ab_test.py
+import streamlit as st
+import pandas as pd
+import numpy as np
+from operational.utils.sheets_client import sheets_client
+from operational.utils.session_data import get_session_data
+from operational.utils.synthetic_data import generate_experiment_users
+from operational.components.metrics import display_data_freshness
+from operational.analytics.ab_test_engine import DEFAULT_METRICS, analyze_experiments
+from operational.analytics.experiment_store import ExperimentStore, experiment_store
+
+# Covariável pré-experimento usada pelo CUPED em cada métrica
+COVARIATES = {'revenue': 'pre_revenue'}
+
+def run():
+    """Dashboard de Testes A/B"""
+    st.header("🧪 Testes A/B")
+    st.markdown("Lift de conversão, receita e retenção de cada variante contra o controle")
+
+    # Botão para recarregar dados
+    col1, col2 = st.columns([1, 4])
+    with col1:
+        if st.button("🔄 Recarregar Dados"):
+            # Só a aba deste dashboard; as outras continuam em cache
+            sheets_client.invalidate("ABTest")
+            get_session_data().invalidate("ABTest")
+
+    # A aba é opcional: sem ela a página mostra o exemplo sintético
+    if not sheets_client.has_sheet("ABTest"):
+        st.info("ℹ️ A planilha não tem a aba 'ABTest' (uma linha por usuário, com experiment, "
+                "variant e as métricas converted, revenue, retained_d7).")
+        show_sample()
+        return
+
+    # Carrega dados da planilha
+    with st.spinner("Carregando dados da planilha..."):
+        df = load_ab_test_data()
+
+    if df.empty or not {'experiment', 'variant'} <= set(df.columns):
+        st.warning("⚠️ Não foi possível carregar os dados. Verifique:")
+        st.markdown("""
+        - Se a aba 'ABTest' tem dados (uma linha por usuário)
+        - Se a aba tem as colunas experiment, variant e as métricas (converted, revenue, retained_d7)
+        - Se as credenciais do Google Sheets estão corretas
+        """)
+        show_sample()
+        return
+
+    st.subheader("📊 Dados Carregados")
+    display_data_freshness(df)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Usuários", f"{len(df):,}")
+    with col2:
+        st.metric("Experimentos", df['experiment'].nunique())
+    with col3:
+        st.metric("Variantes", df['variant'].nunique())
+
+    show_analysis(df)
+
+    sync_store(df, df.attrs.get('fetched_at'), len(df))
+    show_sequential(experiment_store)
+
+def show_sample():
+    """Análise sobre dados sintéticos"""
+    st.subheader("📊 Exemplo com Dados Sintéticos")
+    st.info("💡 Usuários sintéticos de 5 experimentos. Configure sua planilha com estrutura similar.")
+    show_analysis(sample_data())
+    show_sequential(sample_store())
+
+def load_ab_test_data():
+    """Carrega os usuários dos experimentos (handle da sessão, compartilhado entre páginas)"""
+    return get_session_data().get("ABTest")
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def sync_store(_users: pd.DataFrame, fetched_at, rows: int) -> int:
+    """
+    Ingere no store só as linhas novas da aba (a aba é só-de-acréscimo)
+
+    Roda uma vez por carga da planilha (fetched_at, linhas), não a cada
+    rerun da página.
+    """
+    return experiment_store.ingest_new_rows(_users, source="ABTest")
+
+@st.cache_data(show_spinner=False)
+def sample_data(n_users: int = 100_000) -> pd.DataFrame:
+    """Usuários sintéticos para a demonstração (mesmo seed a cada execução)"""
+    return generate_experiment_users(n_users)
+
+@st.cache_resource(show_spinner=False)
+def sample_store(batches: int = 10) -> ExperimentStore:
+    """Store em memória alimentado com os usuários sintéticos em lotes, como um fluxo ao vivo"""
+    store = ExperimentStore(root=None)
+    users = sample_data()
+    for index, batch in enumerate(np.array_split(np.arange(len(users)), batches)):
+        store.ingest(users.iloc[batch], batch_id=f"sample:{index}")
+    return store
+
+def show_analysis(users: pd.DataFrame):
+    """Resultados dos testes com controles de nível de significância e controle"""
+    variants = sorted(users['variant'].astype(str).unique())
+    col1, col2 = st.columns(2)
+    with col1:
+        control = st.selectbox("Variante de controle", variants,
+                               index=variants.index('control') if 'control' in variants else 0)
+    with col2:
+        alpha = st.select_slider("Nível de significância", options=[0.01, 0.05, 0.10], value=0.05)
+
+    metrics = {name: kind for name, kind in DEFAULT_METRICS.items() if name in users.columns}
+    if not metrics:
+        st.warning(f"⚠️ Nenhuma métrica encontrada (esperadas: {', '.join(DEFAULT_METRICS)})")
+        return
+    covariates = {metric: column for metric, column in COVARIATES.items() if column in users.columns}
+    results = analyze_experiments(users, metrics=metrics, control=control,
+                                  covariates=covariates, alpha=alpha)
+    if results.empty:
+        st.warning(f"⚠️ Nenhum experimento tem a variante de controle '{control}'")
+        return
+
+    # Significância após correção para múltiplas comparações (FDR)
+    significant = results[results['significant']]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Comparações", results[['experiment', 'variant']].drop_duplicates().shape[0])
+    with col2:
+        st.metric("Testes", len(results))
+    with col3:
+        st.metric("Significativos (FDR)", len(significant))
+
+    metric = st.radio("Métrica", list(metrics), horizontal=True)
+    selected = results[(results['metric'] == metric) & (results['test'] != 'mann_whitney')]
+
+    st.subheader(f"📈 Lift em {metric}")
+    chart = selected.assign(comparison=selected['experiment'].astype(str) + ' / ' + selected['variant'].astype(str))
+    st.bar_chart(chart.set_index('comparison')['lift'])
+
+    st.subheader("📋 Resultados")
+    columns = ['experiment', 'variant', 'test', 'n_control', 'n_treatment', 'control_mean',
+               'treatment_mean', 'lift', 'ci_low', 'ci_high', 'p_value', 'q_value']
+    extra = [column for column in ('cuped_diff', 'cuped_p_value', 'variance_reduction', 'prob_superiority')
+             if column in results.columns and results.loc[results['metric'] == metric, column].notna().any()]
+    table = results.loc[results['metric'] == metric, columns + extra]
+    formats = {
+        'control_mean': '{:.4f}', 'treatment_mean': '{:.4f}', 'lift': '{:+.1%}',
+        'ci_low': '{:+.4f}', 'ci_high': '{:+.4f}', 'p_value': '{:.4f}', 'q_value': '{:.4f}',
+        'cuped_diff': '{:+.4f}', 'cuped_p_value': '{:.4f}', 'variance_reduction': '{:.1%}',
+        'prob_superiority': '{:.3f}',
+    }
+    st.dataframe(table.style.format({column: formats[column] for column in table.columns if column in formats},
+                                    na_rep='—'), use_container_width=True)
+
+    if 'variance_reduction' in extra:
+        reduction = table['variance_reduction'].mean()
+        st.caption(f"CUPED ({COVARIATES[metric]}) reduz a variância em {reduction:.0%} na média")
+
+def show_sequential(store: ExperimentStore):
+    """Monitoramento contínuo: p-valores sempre válidos (mSPRT) do store incremental"""
+    results = store.results()
+    if results.empty:
+        return
+
+    st.subheader("📡 Monitoramento Sequencial (mSPRT)")
+    info = store.info()
+    st.caption(f"{info['rows']:,} usuários em {info['batches']} lotes · p-valores sempre válidos: "
+               f"podem ser consultados a cada carga e o teste pode parar assim que p < {store.alpha:.0%}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Comparações Monitoradas", len(results))
+    with col2:
+        st.metric("Decididas", int(results['significant'].sum()))
+
+    columns = ['experiment', 'variant', 'metric', 'n_control', 'n_treatment', 'lift',
+               'cs_low', 'cs_high', 'p_value', 'looks', 'significant']
+    st.dataframe(results[columns].style.format({
+        'lift': '{:+.1%}', 'cs_low': '{:+.4f}', 'cs_high': '{:+.4f}', 'p_value': '{:.4f}',
+    }, na_rep='—'), use_container_width=True)
+
+if __name__ == "__main__":
+    run()
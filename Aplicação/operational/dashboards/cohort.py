@@ -2,10 +2,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from operational.utils.google_sheets import get_sheet_data
-
-# ID da sua planilha (extraído da URL)
-SPREADSHEET_ID = "15k4L7Sib0ZRTWfeo_wgR5F4YLGQkGEiPZPSPFjwZHHw"
+from operational.utils.sheets_client import sheets_client
+from operational.utils.session_data import get_session_data
+from operational.components.metrics import display_data_freshness
+from operational.analytics.cohort_engine import (
+    has_session_columns, cohort_counts, retention_matrix, retention_summary
+)
 
 def run():
     """Dashboard de Análise de Coorte"""
@@ -16,7 +18,9 @@ def run():
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("🔄 Recarregar Dados"):
-            st.cache_data.clear()
+            # Só a aba deste dashboard; as outras continuam em cache
+            sheets_client.invalidate("Cohort")
+            get_session_data().invalidate("Cohort")
     
     # Carrega dados da planilha
     with st.spinner("Carregando dados da planilha..."):
@@ -37,6 +41,7 @@ def run():
     
     # Mostra os dados carregados
     st.subheader("📊 Dados Carregados")
+    display_data_freshness(df)
     st.dataframe(df, use_container_width=True)
     
     # Métricas básicas
@@ -47,15 +52,39 @@ def run():
         st.metric("Colunas", len(df.columns))
     with col3:
         if not df.empty:
-            st.metric("Primeira Data", df.iloc[0, 0] if len(df.columns) > 0 else "N/A")
+            first = df.iloc[0, 0] if len(df.columns) > 0 else "N/A"
+            if isinstance(first, pd.Timestamp):
+                first = first.strftime('%Y-%m-%d')
+            st.metric("Primeira Data", str(first))
+    
+    # Exportação de sessões: calcula a matriz de retenção a partir das linhas
+    if has_session_columns(df):
+        show_retention_matrix(df)
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
 def load_cohort_data():
-    """Carrega dados de coorte da planilha"""
-    return get_sheet_data(
-        spreadsheet_id=SPREADSHEET_ID,
-        sheet_name="Cohort",
-        range_cells="A1:Z100"
+    """Carrega dados de coorte (handle da sessão, compartilhado entre páginas)"""
+    return get_session_data().get("Cohort")
+
+def show_retention_matrix(sessions: pd.DataFrame, max_day: int = 30):
+    """Curva e matriz de retenção coorte × dia calculadas das sessões"""
+    st.subheader("🔁 Retenção por Coorte")
+    
+    counts, sizes = cohort_counts(sessions, max_day=max_day)
+    matrix = retention_matrix(counts, sizes, observation_end=pd.to_datetime(sessions['session_date']).max())
+    summary = retention_summary(matrix, sizes)
+    
+    col1, col2, col3 = st.columns(3)
+    for col, day in zip((col1, col2, col3), (1, 7, 30)):
+        with col:
+            if day in summary.index:
+                st.metric(f"Retenção D{day}", f"{summary.loc[day, 'weighted_retention_rate']:.1%}")
+    
+    st.line_chart(summary['weighted_retention_rate'])
+    
+    matrix.index = matrix.index.strftime('%Y-%m-%d')
+    st.dataframe(
+        matrix.style.format("{:.1%}", na_rep="").background_gradient(cmap='YlOrRd', axis=None),
+        use_container_width=True
     )
 
 def show_sample_data():
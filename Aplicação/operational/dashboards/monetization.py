@@ -2,10 +2,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from operational.utils.google_sheets import get_sheet_data
-
-# ID da sua planilha (extraído da URL)
-SPREADSHEET_ID = "15k4L7Sib0ZRTWfeo_wgR5F4YLGQkGEiPZPSPFjwZHHw"
+from operational.utils.sheets_client import sheets_client
+from operational.utils.session_data import get_session_data
+from operational.components.metrics import display_data_freshness
+from operational.analytics.monetization_engine import (
+    has_purchase_columns, daily_revenue, monetization_summary
+)
 
 def run():
     """Dashboard de Monetização"""
@@ -16,7 +18,9 @@ def run():
     col1, col2 = st.columns([1, 4])
     with col1:
         if st.button("🔄 Recarregar Dados"):
-            st.cache_data.clear()
+            # Só a aba deste dashboard; as outras continuam em cache
+            sheets_client.invalidate("Monetization")
+            get_session_data().invalidate("Monetization")
     
     # Carrega dados da planilha
     with st.spinner("Carregando dados da planilha..."):
@@ -37,6 +41,7 @@ def run():
     
     # Mostra os dados carregados
     st.subheader("📊 Dados Carregados")
+    display_data_freshness(df)
     st.dataframe(df, use_container_width=True)
     
     # Métricas básicas
@@ -47,16 +52,44 @@ def run():
         st.metric("Colunas", len(df.columns))
     with col3:
         if not df.empty:
-            st.metric("Primeira Data", df.iloc[0, 0] if len(df.columns) > 0 else "N/A")
+            first = df.iloc[0, 0] if len(df.columns) > 0 else "N/A"
+            if isinstance(first, pd.Timestamp):
+                first = first.strftime('%Y-%m-%d')
+            st.metric("Primeira Data", str(first))
+    
+    # Tabela plana de compras: agrega receita e LTV a partir das linhas
+    if has_purchase_columns(df):
+        show_revenue_analysis(df)
 
-@st.cache_data(ttl=300)  # Cache por 5 minutos
 def load_monetization_data():
-    """Carrega dados de monetização da planilha"""
-    return get_sheet_data(
-        spreadsheet_id=SPREADSHEET_ID,
-        sheet_name="Monetization",
-        range_cells="A1:Z100"
-    )
+    """Carrega dados de monetização (handle da sessão, compartilhado entre páginas)"""
+    return get_session_data().get("Monetization")
+
+def show_revenue_analysis(purchases: pd.DataFrame):
+    """Receita diária, ARPPU e LTV por segmento a partir das compras"""
+    st.subheader("📈 Receita ao Longo do Tempo")
+    
+    # Jogadores presentes na aba (colunas por jogador repetem em cada compra).
+    # Só quem comprou aparece, então não há como medir conversão aqui.
+    player_columns = [c for c in ('player_id', 'segment', 'active_days') if c in purchases.columns]
+    players = purchases[player_columns].dropna(subset=['player_id']).drop_duplicates('player_id')
+    summary = monetization_summary(players, purchases)
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Receita Total", f"${summary['total_revenue']:,.0f}")
+    with col2:
+        st.metric("ARPPU", f"${summary['arppu']:.2f}")
+    with col3:
+        st.metric("ARPDAU", f"${summary['arpdau']:.3f}" if summary['arpdau'] else "N/A")
+    
+    st.line_chart(daily_revenue(purchases))
+    
+    if 'segments' in summary:
+        st.subheader("💎 LTV por Segmento")
+        segments = summary['segments'].drop(columns=['paying_players', 'conversion_rate'])
+        st.dataframe(segments, use_container_width=True)
+        st.caption("LTV sobre os jogadores pagantes: a aba de compras não lista quem não comprou")
 
 def show_sample_data():
     """Mostra dados de exemplo para teste"""
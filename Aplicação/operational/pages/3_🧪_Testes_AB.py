@@ -0,0 +1,21 @@
+# operational/pages/3_🧪_Testes_AB.py
+import streamlit as st
+import sys
+from pathlib import Path
+
+# A página pode ser aberta direto pela URL, antes do script principal
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root.parent / "Configuração"))
+
+from operational.components.page import setup_page, page_footer
+from operational.dashboards import ab_test
+
+setup_page("🧪 Testes A/B")
+
+try:
+    ab_test.run()
+except Exception as e:
+    st.error(f"Erro ao carregar dashboard de testes A/B: {e}")
+
+page_footer()
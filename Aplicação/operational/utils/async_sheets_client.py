@@ -0,0 +1,224 @@
+# operational/utils/async_sheets_client.py
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Tuple
+from urllib.parse import quote
+
+import aiohttp
+import pandas as pd
+
+from operational.utils.sheets_client import GoogleSheetsClient, quota_limiter, settings, sheets_client, RETRYABLE_STATUS
+from operational.utils.sheets_backends import GoogleBackend
+from operational.utils.sheet_cache import SheetCache
+from operational.utils.rate_limiter import TokenBucket, backoff_delay
+from operational.utils.telemetry import span
+
+
+def run_sync(coro):
+    """Executa uma corrotina a partir de código síncrono (ex.: páginas do Streamlit)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Já existe um event loop nesta thread: roda em outra para não bloqueá-lo
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class AsyncSheetsClient(GoogleSheetsClient):
+    """
+    Variante asyncio do GoogleSheetsClient para carregar abas em paralelo
+    
+    Fala direto com a API REST via aiohttp usando o token das credenciais do
+    pool do GoogleBackend (só esse backend tem API HTTP). As requisições
+    simultâneas passam pelo mesmo token bucket do cliente síncrono, então a
+    cota por minuto do Google é respeitada.
+    
+    Abas da planilha do backend passam pelas mesmas camadas do cliente
+    síncrono: cache em memória, snapshots, detecção de mudança e single-flight
+    por range. Com `cache` igual ao do sheets_client, uma aba já carregada (ou
+    em carga) por uma página não é baixada de novo.
+    """
+    
+    def __init__(self, limiter: TokenBucket = quota_limiter, max_concurrency: int = 8,
+                 backend: Optional[GoogleBackend] = None, cache: Optional[SheetCache] = None):
+        super().__init__(backend or GoogleBackend())
+        if cache is not None:
+            self._cache = cache
+        self._limiter = limiter
+        self._max_concurrency = max_concurrency
+    
+    async def _get_json(self, session: aiohttp.ClientSession, spreadsheet_id: str,
+                        range_name: str) -> Dict:
+        """GET em values/{range} respeitando a cota, com backoff em 429/5xx"""
+        url = f"{self.backend.api_url}/v4/spreadsheets/{spreadsheet_id}/values/{quote(range_name, safe='')}"
+        for attempt in range(settings.api_max_retries + 1):
+            await self._limiter.acquire_async()
+            token = await asyncio.to_thread(self.backend.pool.access_token)
+            try:
+                # Sem token quando o pool aponta para o emulador local
+                headers = {'Authorization': f'Bearer {token}'} if token else {}
+                with span('sheets_http_request', operation='values_async') as http_span:
+                    async with session.get(url, headers=headers) as response:
+                        if response.status in RETRYABLE_STATUS and attempt < settings.api_max_retries:
+                            status = response.status
+                            delay = backoff_delay(attempt, response.headers.get('Retry-After'),
+                                                  base=settings.api_backoff_base, cap=settings.api_backoff_max)
+                        else:
+                            response.raise_for_status()
+                            body = await response.read()
+                            http_span.set(bytes=len(body))
+                            with span('sheets_json_decode', operation='values_async') as decode_span:
+                                decode_span.set(bytes=len(body))
+                                return json.loads(body)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == settings.api_max_retries:
+                    raise
+                status = None
+                delay = backoff_delay(attempt, base=settings.api_backoff_base, cap=settings.api_backoff_max)
+            
+            self.logger.warning(f"⏳ Tentativa {attempt + 1} falhou ({status or 'rede'}), nova tentativa em {delay:.1f}s")
+            self.backend.record_retry(status, delay)
+            await asyncio.sleep(delay)
+    
+    async def _fetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                     spreadsheet_id: str, sheet_name: str,
+                     range_cells: Optional[str] = None) -> pd.DataFrame:
+        """Busca uma aba e converte em DataFrame"""
+        if spreadsheet_id != self.source_id:
+            range_name = f"{sheet_name}!{range_cells}" if range_cells else sheet_name
+            return await self._download(session, semaphore, spreadsheet_id, sheet_name, range_name)
+        
+        # Range dimensionado pela grade (metadados em cache do cliente síncrono)
+        range_name = await asyncio.to_thread(self._resolve_range, sheet_name, range_cells)
+        key = self._cache_key(range_name)
+        df = self._cache.get(key, ttl=settings.cache_ttl)
+        if df is not None:
+            return df.copy(deep=False)
+        
+        # Snapshot dentro do TTL ou planilha sem mudanças: nada a baixar
+        revision = None
+        df = await asyncio.to_thread(self._load_snapshot, range_name, settings.cache_ttl)
+        if df is None:
+            revision = await asyncio.to_thread(self._current_revision)
+            df = await asyncio.to_thread(self._unchanged, range_name, revision)
+        if df is not None:
+            self._cache.set(key, df)
+            return df.copy(deep=False)
+        
+        # Range já em busca por outra sessão (ou pelo cliente síncrono): espera por ela
+        leading, following = self._cache.flights.begin([key])
+        if key in following:
+            df = await asyncio.to_thread(following[key].result)
+            return df.copy(deep=False)
+        try:
+            df = await self._download(session, semaphore, spreadsheet_id, sheet_name, range_name)
+            self._remember(range_name, df, revision=revision)
+            self._save_snapshot(range_name, df, revision)
+            if not df.empty:
+                self._cache.set(key, df)
+        except Exception as e:
+            self._cache.flights.finish(key, error=e)
+            raise
+        self._cache.flights.finish(key, df)
+        with self._lock:
+            self._stats['fetches'] += 1
+        return df.copy(deep=False)
+    
+    async def _download(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore,
+                        spreadsheet_id: str, sheet_name: str, range_name: str) -> pd.DataFrame:
+        """GET de um range (limitado pelo semáforo) convertido em DataFrame"""
+        async with semaphore:
+            self.logger.info(f"📊 Carregando dados (async): {spreadsheet_id} {range_name}")
+            result = await self._get_json(session, spreadsheet_id, range_name)
+        return self._values_to_dataframe(sheet_name, result.get('values', []))
+    
+    async def _gather(self, targets: List[Tuple[str, str]]) -> Dict[Tuple[str, str], pd.DataFrame]:
+        """Carrega todos os pares (planilha, aba) concorrentemente numa única sessão HTTP"""
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        timeout = aiohttp.ClientTimeout(total=30)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            results = await asyncio.gather(
+                *(self._fetch(session, semaphore, spreadsheet_id, sheet_name)
+                  for spreadsheet_id, sheet_name in targets),
+                return_exceptions=True
+            )
+        
+        frames = {}
+        for target, result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"❌ Erro ao carregar {target[1]} ({target[0]}): {result}")
+                result = pd.DataFrame()
+            frames[target] = result
+        return frames
+    
+    async def get_sheets_data_async(self, sheet_names: Optional[List[str]] = None,
+                                    spreadsheet_id: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Carrega várias abas de uma planilha ao mesmo tempo
+        
+        Args:
+            sheet_names: Abas a carregar (padrão: settings.available_sheets)
+            spreadsheet_id: Planilha (padrão: a do backend)
+            
+        Returns:
+            Dicionário {aba: DataFrame}; abas com erro voltam como DataFrame vazio
+        """
+        spreadsheet_id = spreadsheet_id or self.source_id
+        names = list(sheet_names or settings.available_sheets)
+        frames = await self._gather([(spreadsheet_id, name) for name in names])
+        return {name: frames[(spreadsheet_id, name)] for name in names}
+    
+    async def get_spreadsheets_data_async(self, sheets_by_spreadsheet: Dict[str, List[str]]
+                                          ) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Carrega abas de várias planilhas ao mesmo tempo
+        
+        Args:
+            sheets_by_spreadsheet: {spreadsheet_id: [abas]}
+            
+        Returns:
+            {spreadsheet_id: {aba: DataFrame}}
+        """
+        targets = [(spreadsheet_id, name)
+                   for spreadsheet_id, names in sheets_by_spreadsheet.items()
+                   for name in names]
+        frames = await self._gather(targets)
+        result: Dict[str, Dict[str, pd.DataFrame]] = {}
+        for (spreadsheet_id, name), df in frames.items():
+            result.setdefault(spreadsheet_id, {})[name] = df
+        return result
+    
+    def load_sheets(self, sheet_names: Optional[List[str]] = None,
+                    spreadsheet_id: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+        """Fachada síncrona de get_sheets_data_async (para páginas do Streamlit)"""
+        return run_sync(self.get_sheets_data_async(sheet_names, spreadsheet_id))
+    
+    def load_spreadsheets(self, sheets_by_spreadsheet: Dict[str, List[str]]
+                          ) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """Fachada síncrona de get_spreadsheets_data_async"""
+        return run_sync(self.get_spreadsheets_data_async(sheets_by_spreadsheet))
+
+
+_async_client: Optional[AsyncSheetsClient] = None
+_async_client_lock = threading.Lock()
+
+
+def get_async_sheets_client() -> AsyncSheetsClient:
+    """
+    Instância global do cliente assíncrono, criada no primeiro uso
+    
+    Com DATA_BACKEND=google, reaproveita o backend e o cache do sheets_client
+    (mesmo pool de serviços e single-flight); nos demais backends usa um
+    GoogleBackend próprio.
+    """
+    global _async_client
+    with _async_client_lock:
+        if _async_client is None:
+            if isinstance(sheets_client.backend, GoogleBackend):
+                _async_client = AsyncSheetsClient(backend=sheets_client.backend, cache=sheets_client._cache)
+            else:
+                _async_client = AsyncSheetsClient()
+        return _async_client
@@ -0,0 +1,101 @@
+# operational/utils/coercion.py
+import logging
+from typing import Dict, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Separadores (decimal, milhar) por locale da planilha
+LOCALE_SEPARATORS = {
+    'pt_BR': (',', '.'),
+    'en_US': ('.', ','),
+}
+
+SUPPORTED_DTYPES = ('date', 'int', 'float', 'percent', 'currency', 'category', 'string')
+
+
+def parse_numbers(series: pd.Series, decimal: str = ',', thousands: str = '.') -> pd.Series:
+    """
+    Converte textos numéricos formatados em float64, de forma vetorizada
+    
+    Aceita símbolos de moeda, espaços e '%' (dividido por 100). Valores com
+    grupos de milhar bem formados (1.234.567,89) usam o locale; um único
+    separador sem grupos de 3 dígitos (0.8 ou 0,8) é tratado como decimal,
+    então planilhas com locale diferente do configurado ainda funcionam.
+    
+    Args:
+        series: Coluna com textos (ou números) vindos da planilha
+        decimal: Separador decimal do locale
+        thousands: Separador de milhar do locale
+        
+    Returns:
+        Série float64 (NaN onde não foi possível converter)
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype('float64')
+    
+    text = series.astype('string').str.strip()
+    is_percent = text.str.endswith('%').fillna(False)
+    text = text.str.replace(r'[^\d,.\-]', '', regex=True)
+    
+    t, d = '\\' + thousands, '\\' + decimal
+    grouped = text.str.fullmatch(rf'-?[1-9]\d{{0,2}}(?:{t}\d{{3}})+(?:{d}\d*)?').fillna(False)
+    text = text.mask(grouped, text.str.replace(thousands, '', regex=False))
+    text = text.str.replace(thousands, '.', regex=False).str.replace(decimal, '.', regex=False)
+    
+    numbers = pd.to_numeric(text, errors='coerce').astype('float64')
+    return numbers.mask(is_percent, numbers / 100)
+
+
+def _to_compact_int(numbers: pd.Series) -> pd.Series:
+    """Menor inteiro que comporta os valores (nullable se houver faltantes)"""
+    if numbers.notna().all():
+        return pd.to_numeric(numbers.round(), downcast='integer')
+    return numbers.round().astype('Int64')
+
+
+def coerce_dataframe(df: pd.DataFrame, dtypes: Dict[str, str],
+                     locale: str = 'pt_BR') -> pd.DataFrame:
+    """
+    Aplica o schema da aba convertendo as colunas uma única vez no carregamento
+    
+    Args:
+        df: DataFrame com colunas texto (como vêm da API)
+        dtypes: {coluna: tipo}, tipos em SUPPORTED_DTYPES
+        locale: Locale da planilha (define separadores de números e datas)
+        
+    Returns:
+        Novo DataFrame convertido; df.attrs['memory'] traz o uso de memória
+        (bytes) antes e depois da conversão
+    """
+    decimal, thousands = LOCALE_SEPARATORS.get(locale, LOCALE_SEPARATORS['pt_BR'])
+    memory_before = int(df.memory_usage(deep=True).sum())
+    
+    df = df.copy()
+    for column, dtype in dtypes.items():
+        if column not in df.columns:
+            continue
+        
+        series = df[column]
+        if dtype == 'date':
+            df[column] = pd.to_datetime(series, errors='coerce', format='mixed',
+                                        dayfirst=(decimal == ','))
+        elif dtype == 'int':
+            df[column] = _to_compact_int(parse_numbers(series, decimal, thousands))
+        elif dtype in ('float', 'percent'):
+            df[column] = parse_numbers(series, decimal, thousands).astype('float32')
+        elif dtype == 'currency':
+            # Moeda fica em float64 para não perder centavos em somas grandes
+            df[column] = parse_numbers(series, decimal, thousands)
+        elif dtype == 'category':
+            df[column] = series.astype('category')
+        elif dtype == 'string':
+            df[column] = series.astype('string')
+        else:
+            logger.warning(f"⚠️ Tipo '{dtype}' desconhecido para a coluna {column}")
+    
+    memory_after = int(df.memory_usage(deep=True).sum())
+    df.attrs['memory'] = {'before': memory_before, 'after': memory_after}
+    logger.info(f"🧮 Tipos aplicados: memória {memory_before / 1024:.1f} KB → {memory_after / 1024:.1f} KB")
+    return df
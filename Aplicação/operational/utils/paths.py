@@ -7,6 +7,12 @@ ROOT_DIR = Path(__file__).parent.parent.parent.resolve()
 
 CONFIG_DIR = ROOT_DIR / "config"
 DATA_DIR = ROOT_DIR / "data"
+SNAPSHOT_DIR = DATA_DIR / "snapshots"
+RAW_DATA_DIR = DATA_DIR / "raw"
+SHEETS_DATA_DIR = DATA_DIR / "sheets"
+EXPERIMENTS_DIR = DATA_DIR / "experiments"
+AGGREGATES_DIR = DATA_DIR / "aggregates"
+REPORTS_DIR = DATA_DIR / "reports"
 CREDENTIALS_PATH = CONFIG_DIR / "credentials.json"
 
 def get_root():
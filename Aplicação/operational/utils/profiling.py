@@ -0,0 +1,92 @@
+# operational/utils/profiling.py
+"""
+Medição de tempo de startup e de cada execução do script do Streamlit
+
+Uso (perfil de imports do ponto de entrada):
+    python -m operational.utils.profiling operational.streamlit_app --top 20
+"""
+import argparse
+import logging
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tempos (segundos) das etapas medidas neste processo, pela última execução
+_timings: Dict[str, float] = {}
+_lock = threading.Lock()
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+@contextmanager
+def timed(name: str):
+    """Mede a duração do bloco e guarda em timings()[name]"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            _timings[name] = elapsed
+        logger.debug(f"⏱️ {name}: {elapsed * 1000:.1f} ms")
+
+
+def record(name: str, seconds: float):
+    """Guarda um tempo medido fora de timed()"""
+    with _lock:
+        _timings[name] = seconds
+
+
+def timings() -> Dict[str, float]:
+    """Cópia dos tempos medidos no processo"""
+    with _lock:
+        return dict(_timings)
+
+
+def import_profile(module: str, top: Optional[int] = 15) -> List[Tuple[str, float, float]]:
+    """
+    Perfil de importação de um módulo com `python -X importtime` num processo novo
+
+    Args:
+        module: Módulo a importar (ex.: operational.streamlit_app)
+        top: Quantos módulos devolver, do mais lento para o mais rápido (None = todos)
+
+    Returns:
+        Lista de (módulo, tempo próprio em s, tempo acumulado em s)
+    """
+    app_dir = Path(__file__).parent.parent.parent
+    env_path = [str(app_dir), str(app_dir.parent / "Configuração")]
+    code = f"import sys; sys.path[:0] = {env_path!r}; import {module}"
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True)
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            entries.append((name, int(self_us) / 1e6, int(cumulative_us) / 1e6))
+    entries.sort(key=lambda entry: entry[2], reverse=True)
+    return entries[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perfil de importação de um módulo do app")
+    parser.add_argument('module', nargs='?', default='operational.streamlit_app')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args(argv)
+
+    print(f"📦 Imports mais lentos de {args.module} (acumulado):")
+    for name, own, cumulative in import_profile(args.module, args.top):
+        print(f"   {cumulative * 1000:8.1f} ms  (próprio {own * 1000:6.1f} ms)  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# operational/utils/rate_limiter.py
+import asyncio
+import random
+import threading
+import time
+from typing import Dict, Any, Optional, Union
+
+
+def backoff_delay(attempt: int, retry_after: Optional[Union[str, float]] = None,
+                  base: float = 0.5, cap: float = 32.0) -> float:
+    """
+    Espera antes da próxima tentativa: backoff exponencial com jitter
+    
+    Usa "full jitter" (valor aleatório entre base e o teto exponencial) para
+    que sessões que falharam juntas não tentem de novo todas ao mesmo tempo.
+    Um Retry-After enviado pela API tem prioridade.
+    """
+    if retry_after is not None:
+        try:
+            return min(cap, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+    ceiling = min(cap, base * (2 ** attempt))
+    return random.uniform(base, max(base, ceiling))
+
+
+class TokenBucket:
+    """
+    Token bucket thread-safe, usável tanto por threads quanto por corrotinas
+
+    Os tokens são repostos continuamente a `rate` por segundo até `capacity`
+    (tamanho da rajada). Cada requisição consome um token; sem token
+    disponível, quem chamou espera o tempo exato até o próximo.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate e capacity precisam ser positivos")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._stats = {'acquired': 0, 'throttled': 0, 'throttled_seconds': 0.0}
+
+    @classmethod
+    def per_minute(cls, requests_per_minute: int, burst: int = 10) -> 'TokenBucket':
+        """Bucket dimensionado por uma cota de requisições por minuto"""
+        return cls(rate=requests_per_minute / 60.0, capacity=min(burst, requests_per_minute))
+
+    def _reserve(self, tokens: float = 1) -> float:
+        """Consome os tokens e devolve quantos segundos esperar por eles"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self._stats['acquired'] += 1
+            if wait > 0:
+                self._stats['throttled'] += 1
+                self._stats['throttled_seconds'] += wait
+            return wait
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Bloqueia a thread até haver token; devolve o tempo esperado"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """Versão assíncrona de acquire(), sem bloquear o event loop"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        """Requisições liberadas, quantas esperaram e o tempo total de espera"""
+        with self._lock:
+            return dict(self._stats)
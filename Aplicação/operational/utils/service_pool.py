@@ -0,0 +1,203 @@
+# operational/utils/service_pool.py
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from queue import LifoQueue, Empty, Full
+from typing import Callable, Dict, Any, Optional, List, Tuple
+
+import httplib2
+import google_auth_httplib2
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from googleapiclient.discovery_cache import get_static_doc
+
+from operational.utils.telemetry import span
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets.readonly',
+    # Leitura da versão do arquivo no Drive (detecção de mudanças na planilha)
+    'https://www.googleapis.com/auth/drive.metadata.readonly',
+]
+
+# Mesmo arquivo usado por google_sheets.py e config/settings.py em desenvolvimento
+CREDENTIALS_PATH = Path(__file__).parent.parent.parent.parent / "Configuração" / "config" / "credentials.json"
+
+
+def load_credentials_file(path: Path = CREDENTIALS_PATH) -> Dict[str, Any]:
+    """Lê o credentials.json local"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class SheetsServicePool:
+    """
+    Pool de serviços Google (Sheets e Drive) compartilhado pelo processo inteiro
+
+    As credenciais são carregadas uma única vez e compartilhadas por todos os
+    serviços, então um token renovado por uma sessão é reaproveitado pelas
+    demais. Cada serviço tem seu próprio httplib2.Http (que não é thread-safe),
+    mantendo as conexões keep-alive abertas entre requisições.
+    
+    Com um emulador configurado (set_emulator) os serviços apontam para o
+    servidor local, sem credenciais nem token.
+    """
+
+    def __init__(self,
+                 credentials_loader: Callable[[], Dict[str, Any]] = load_credentials_file,
+                 scopes: Optional[List[str]] = None,
+                 max_idle: int = 8,
+                 timeout: int = 30):
+        self.logger = logging.getLogger(__name__)
+        self._credentials_loader = credentials_loader
+        self._scopes = list(scopes or SCOPES)
+        self._max_idle = max_idle
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._credentials = None
+        self._emulator_url: Optional[str] = None
+        self._idle: Dict[Tuple[str, str], LifoQueue] = {}
+        self._stats = {
+            'hits': 0,
+            'builds': 0,
+            'credential_loads': 0,
+            'token_refreshes': 0,
+            'discarded': 0,
+        }
+
+    def set_credentials_loader(self, loader: Callable[[], Dict[str, Any]]):
+        """Troca a origem das credenciais, descartando o que já estava no pool"""
+        with self._lock:
+            if loader is self._credentials_loader:
+                return
+            self._credentials_loader = loader
+        self.reset()
+
+    def set_emulator(self, url: Optional[str]):
+        """Aponta os serviços para um servidor local (None volta para o Google)"""
+        url = url.rstrip('/') if url else None
+        with self._lock:
+            if url == self._emulator_url:
+                return
+            self._emulator_url = url
+        self.reset()
+        if url:
+            self.logger.info(f"🧪 Usando emulador da API do Sheets em {url}")
+    
+    @property
+    def emulator_url(self) -> Optional[str]:
+        """URL do emulador em uso (None quando fala com o Google)"""
+        return self._emulator_url
+    
+    @property
+    def credentials(self):
+        """Credenciais compartilhadas (carregadas uma única vez)"""
+        with self._lock:
+            if self._credentials is None:
+                with span('sheets_credentials_load'):
+                    credentials_info = self._credentials_loader()
+                    self._credentials = service_account.Credentials.from_service_account_info(
+                        credentials_info,
+                        scopes=self._scopes
+                    )
+                self._stats['credential_loads'] += 1
+            return self._credentials
+
+    def _ensure_token(self):
+        """Renova o token uma única vez mesmo com várias threads concorrentes"""
+        if self._emulator_url:
+            return
+        creds = self.credentials
+        if creds.valid:
+            return
+        with self._refresh_lock:
+            if creds.valid:
+                return
+            with span('sheets_token_refresh'):
+                creds.refresh(google_auth_httplib2.Request(httplib2.Http(timeout=self._timeout)))
+            with self._lock:
+                self._stats['token_refreshes'] += 1
+            self.logger.debug("🔑 Token do Google Sheets renovado")
+
+    def access_token(self) -> str:
+        """Token de acesso válido das credenciais compartilhadas (para clientes HTTP próprios)"""
+        if self._emulator_url:
+            return ''
+        self._ensure_token()
+        return self.credentials.token
+
+    def _idle_queue(self, api: str, version: str) -> LifoQueue:
+        """Fila de serviços ociosos de uma API"""
+        with self._lock:
+            return self._idle.setdefault((api, version), LifoQueue(maxsize=self._max_idle))
+
+    def _build(self, api: str, version: str):
+        """Constrói um novo serviço sobre as credenciais compartilhadas"""
+        with span('sheets_service_build', api=api):
+            if self._emulator_url:
+                # O documento de discovery traz o servicePath ('' no Sheets, 'drive/v3/' no Drive)
+                service_path = json.loads(get_static_doc(api, version))['servicePath']
+                service = build(api, version, http=httplib2.Http(timeout=self._timeout), cache_discovery=False,
+                                static_discovery=True,
+                                client_options={'api_endpoint': f"{self._emulator_url}/{service_path}"})
+            else:
+                http = google_auth_httplib2.AuthorizedHttp(
+                    self.credentials,
+                    http=httplib2.Http(timeout=self._timeout)
+                )
+                service = build(api, version, http=http, cache_discovery=False)
+        with self._lock:
+            self._stats['builds'] += 1
+        self.logger.info(f"🔧 Novo serviço Google {api} {version} construído")
+        return service
+
+    def checkout(self, api: str = 'sheets', version: str = 'v4'):
+        """Retira um serviço do pool (ou constrói um novo se não houver livre)"""
+        # Token antes de retirar o serviço: se a renovação falhar, nada fica emprestado
+        self._ensure_token()
+        try:
+            service = self._idle_queue(api, version).get_nowait()
+            with self._lock:
+                self._stats['hits'] += 1
+        except Empty:
+            service = self._build(api, version)
+        return service
+
+    def release(self, service, api: str = 'sheets', version: str = 'v4'):
+        """Devolve um serviço ao pool para reutilização"""
+        try:
+            self._idle_queue(api, version).put_nowait(service)
+        except Full:
+            with self._lock:
+                self._stats['discarded'] += 1
+
+    @contextmanager
+    def acquire(self, api: str = 'sheets', version: str = 'v4'):
+        """Empresta um serviço do pool durante o bloco with"""
+        service = self.checkout(api, version)
+        try:
+            yield service
+        finally:
+            self.release(service, api, version)
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores do pool (reutilizações vs. construções)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['idle'] = sum(queue.qsize() for queue in self._idle.values())
+        total = stats['hits'] + stats['builds']
+        stats['hit_rate'] = stats['hits'] / total if total else 0.0
+        return stats
+
+    def reset(self):
+        """Descarta credenciais e serviços ociosos"""
+        with self._lock:
+            self._credentials = None
+            self._idle = {}
+        self.logger.info("🧹 Pool de serviços reiniciado")
+
+
+# Pool global do processo, compartilhado por todas as sessões do Streamlit
+service_pool = SheetsServicePool()
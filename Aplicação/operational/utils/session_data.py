@@ -0,0 +1,59 @@
+# operational/utils/session_data.py
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+import streamlit as st
+
+from config.settings import settings
+from operational.utils.sheets_client import sheets_client
+
+SESSION_KEY = 'session_data'
+
+
+class SessionData:
+    """
+    Abas já carregadas pela sessão do usuário, compartilhadas entre as páginas
+
+    Cada página pede só as abas que usa; a primeira página que pedir uma aba
+    carrega via sheets_client.load_sheet e as demais reaproveitam o mesmo
+    DataFrame enquanto ele estiver dentro do TTL. Dados vencidos ou em
+    refresh (attrs['stale']) são pedidos de novo ao cliente, que decide entre
+    cache, snapshot e API.
+    """
+
+    def __init__(self):
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def _fresh(self, df: pd.DataFrame) -> bool:
+        fetched_at = df.attrs.get('fetched_at')
+        if fetched_at is None or df.attrs.get('stale'):
+            return False
+        return time.time() - fetched_at <= settings.cache_ttl
+
+    def get(self, sheet_name: str) -> pd.DataFrame:
+        """DataFrame da aba (carregado só na primeira vez ou quando vence)"""
+        df = self._frames.get(sheet_name)
+        if df is None or not self._fresh(df):
+            df = sheets_client.load_sheet(sheet_name)
+            if not df.empty:
+                self._frames[sheet_name] = df
+        return df
+
+    def loaded(self) -> list:
+        """Abas já carregadas nesta sessão"""
+        return list(self._frames)
+
+    def invalidate(self, sheet_name: Optional[str] = None):
+        """Esquece uma aba (ou todas) para forçar nova carga na próxima leitura"""
+        if sheet_name is None:
+            self._frames.clear()
+        else:
+            self._frames.pop(sheet_name, None)
+
+
+def get_session_data() -> SessionData:
+    """Handle de dados da sessão atual (criado na primeira página visitada)"""
+    if SESSION_KEY not in st.session_state:
+        st.session_state[SESSION_KEY] = SessionData()
+    return st.session_state[SESSION_KEY]
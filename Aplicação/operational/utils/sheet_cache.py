@@ -0,0 +1,165 @@
+# operational/utils/sheet_cache.py
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from operational.utils.single_flight import SingleFlight
+from operational.utils.telemetry import registry
+
+# Chave de cache: (spreadsheet_id, range completo, ex. 'Cohort!A1:E100')
+CacheKey = Tuple[str, str]
+
+
+def sheet_of(range_name: str) -> str:
+    """Aba de um range ("'Minha Aba'!A1:B2" → 'Minha Aba')"""
+    sheet = range_name.rsplit('!', 1)[0] if '!' in range_name else range_name
+    if len(sheet) > 1 and sheet[0] == sheet[-1] == "'":
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet
+
+
+class SheetCache:
+    """
+    Cache em memória por (planilha, range), com invalidação por aba
+
+    Substitui o st.cache_data nos dados das abas: st.cache_data.clear()
+    apaga tudo de todos os usuários, enquanto aqui o botão de recarregar
+    invalida só a aba pedida. Leituras simultâneas de uma chave vencida são
+    coalescidas: a primeira carrega e as demais esperam pelo mesmo resultado.
+    Hits, misses e esperas são contados por chave.
+
+    `flights` é a única camada de coalescência por chave: quem carrega por
+    fora do cache (lotes batchGet) reserva as chaves nele com begin/finish.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.logger = logging.getLogger(__name__)
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self.flights = SingleFlight()
+        self._stats: Dict[Hashable, Counter] = {}
+
+    def _count(self, key: Hashable, event: str):
+        with self._lock:
+            self._stats.setdefault(key, Counter())[event] += 1
+        registry.inc('sheets_cache_lookups_total', event=event)
+
+    def _fresh(self, key: Hashable, ttl: Optional[float]) -> Optional[Any]:
+        """Valor da chave se ainda estiver dentro do TTL"""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if ttl is not None and time.time() - stored_at > ttl:
+            return None
+        return value
+
+    def get(self, key: Hashable, ttl: Optional[float] = None) -> Optional[Any]:
+        """Valor em cache (None se ausente ou vencido), sem carregar"""
+        return self._fresh(key, ttl if ttl is not None else self._ttl)
+
+    def set(self, key: Hashable, value: Any):
+        """Guarda um valor carregado por fora (ex.: lote batchGet)"""
+        with self._lock:
+            self._entries[key] = (value, time.time())
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    ttl: Optional[float] = None,
+                    cache_if: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Valor da chave, carregando com `loader` se ausente ou vencido
+
+        Só uma chamada de `loader` por chave roda de cada vez (SingleFlight);
+        quem chega durante a carga espera e recebe o mesmo valor.
+
+        Args:
+            key: Chave do cache
+            loader: Função sem argumentos que produz o valor
+            ttl: Validade em segundos (padrão: o do cache; None = sem validade)
+            cache_if: Decide se o valor carregado vai para o cache (ex.: não
+                guardar DataFrame vazio de uma falha)
+        """
+        ttl = ttl if ttl is not None else self._ttl
+        value = self._fresh(key, ttl)
+        if value is not None:
+            self._count(key, 'hits')
+            return value
+
+        def load():
+            # A carga de outra sessão pode ter terminado entre a consulta e aqui
+            value = self._fresh(key, ttl)
+            if value is not None:
+                return value
+            value = loader()
+            if cache_if(value):
+                self.set(key, value)
+            return value
+
+        value, shared = self.flights.do(key, load)
+        # Quem esperou a carga de outra sessão conta como coalescido, não como miss
+        self._count(key, 'coalesced' if shared else 'misses')
+        return value
+
+    def reload(self, key: Hashable, loader: Callable[[], Any],
+               cache_if: Callable[[Any], bool] = lambda value: True) -> Any:
+        """
+        Carrega a chave de novo mesmo com valor válido (refresh em segundo plano)
+
+        Também passa por `flights`: se a chave já está sendo carregada, espera
+        essa carga em vez de disparar outra.
+        """
+        def load():
+            value = loader()
+            if cache_if(value):
+                self.set(key, value)
+            return value
+
+        value, _ = self.flights.do(key, load)
+        return value
+
+    def invalidate(self, sheet_name: Optional[str] = None, spreadsheet_id: Optional[str] = None) -> int:
+        """
+        Remove as entradas de uma aba (todas as faixas dela) ou de uma planilha
+
+        Returns:
+            Quantidade de entradas removidas
+        """
+        with self._lock:
+            keys = [key for key in self._entries
+                    if (spreadsheet_id is None or key[0] == spreadsheet_id)
+                    and (sheet_name is None or sheet_of(key[1]) == sheet_name)]
+            for key in keys:
+                del self._entries[key]
+                self._stats.setdefault(key, Counter())['invalidations'] += 1
+        if keys:
+            self.logger.info(f"🧹 Cache invalidado: {[key[1] for key in keys]}")
+        return len(keys)
+
+    def clear(self):
+        """Remove todas as entradas (mantém as métricas)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hits, misses, esperas coalescidas e invalidações por chave, e totais"""
+        with self._lock:
+            per_key = {f"{key[1]}" if isinstance(key, tuple) else str(key): dict(counter)
+                       for key, counter in self._stats.items()}
+            entries = len(self._entries)
+        totals = Counter()
+        for counter in per_key.values():
+            totals.update(counter)
+        lookups = totals['hits'] + totals['coalesced'] + totals['misses']
+        return {
+            'entries': entries,
+            'keys': per_key,
+            'hits': totals['hits'],
+            'coalesced': totals['coalesced'],
+            'misses': totals['misses'],
+            'invalidations': totals['invalidations'],
+            'hit_rate': (totals['hits'] + totals['coalesced']) / lookups if lookups else 0.0,
+        }
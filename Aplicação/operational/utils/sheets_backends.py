@@ -0,0 +1,447 @@
+# operational/utils/sheets_backends.py
+"""
+Origens de dados das abas usadas pelo GoogleSheetsClient
+
+    GoogleBackend      API do Google (Sheets + Drive) via service_pool, com
+                       cota e novas tentativas; também atende o servidor local
+                       que imita a API (SHEETS_API_EMULATOR_URL ou emulator())
+    LocalFilesBackend  Pasta com um CSV por aba ({aba}.csv), sem rede
+
+Todas devolvem as respostas no formato da API (listas de linhas de strings),
+para que cache, snapshots, coerção de tipos e detecção de mudanças fiquem num
+único lugar: o cliente. Cada operação vira um span (telemetry) com linhas e
+células devolvidas e é contada em stats(); no GoogleBackend a ida e volta HTTP
+e a decodificação do JSON são medidas à parte, com o tamanho da resposta.
+"""
+import csv
+import logging
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from googleapiclient.errors import HttpError
+
+from config.settings import settings
+from operational.utils.paths import SHEETS_DATA_DIR
+from operational.utils.rate_limiter import TokenBucket, backoff_delay
+from operational.utils.service_pool import SheetsServicePool, service_pool
+from operational.utils.telemetry import span
+
+# O pool compartilhado passa a usar as credenciais do ambiente (arquivo local ou st.secrets)
+service_pool.set_credentials_loader(settings.get_google_credentials)
+# ...ou o emulador local, quando SHEETS_API_EMULATOR_URL estiver definido
+service_pool.set_emulator(settings.sheets_api_emulator)
+
+# Cota de leituras da API, compartilhada pelos clientes síncrono e assíncrono
+quota_limiter = TokenBucket.per_minute(settings.quota_per_minute, burst=settings.quota_burst)
+
+# Respostas que valem nova tentativa: cota estourada e erros temporários do Google
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+CELL_PATTERN = re.compile(r'^([A-Za-z]*)(\d*)$')
+
+
+def column_index(letters: str) -> int:
+    """'A' → 0, 'Z' → 25, 'AA' → 26"""
+    index = 0
+    for letter in letters.upper():
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+
+def split_range(range_name: str) -> Tuple[str, str]:
+    """Separa "'Aba'!A1:B2" em ('Aba', 'A1:B2')"""
+    sheet, _, cells = range_name.rpartition('!')
+    if not sheet:
+        sheet, cells = cells, ''
+    if len(sheet) > 1 and sheet[0] == sheet[-1] == "'":
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, cells
+
+
+def slice_values(values: List[List[str]], cells: str) -> List[List[str]]:
+    """Recorta a grade pelo range A1 e remove linhas/células vazias do fim, como o Google"""
+    row_start, row_end, col_start, col_end = 0, None, 0, None
+    if cells:
+        start, _, end = cells.partition(':')
+        start_match, end_match = CELL_PATTERN.match(start), CELL_PATTERN.match(end or start)
+        if not start_match or not end_match:
+            raise ValueError(f"Range inválido: {cells}")
+        if start_match.group(1):
+            col_start = column_index(start_match.group(1))
+        if start_match.group(2):
+            row_start = int(start_match.group(2)) - 1
+        if end_match.group(1):
+            col_end = column_index(end_match.group(1)) + 1
+        if end_match.group(2):
+            row_end = int(end_match.group(2))
+
+    result = []
+    for row in values[row_start:row_end]:
+        row = row[col_start:col_end]
+        while row and row[-1] == '':
+            row = row[:-1]
+        result.append(row)
+    while result and not result[-1]:
+        result.pop()
+    return result
+
+
+def payload_size(values: List[List[Any]]) -> Dict[str, int]:
+    """Linhas e células de uma resposta de values (atributos dos spans)"""
+    return {'rows': len(values), 'cells': sum(len(row) for row in values)}
+
+
+class SheetsBackend:
+    """
+    Interface das origens de dados
+
+    As subclasses implementam _get_metadata, _get_values, _get_revision e
+    _check; os métodos públicos acrescentam a medição de tempo e de volume.
+    """
+
+    name = 'base'
+    # Vale gravar snapshots em disco? (não para dados que já são arquivos locais)
+    snapshots = True
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._calls: Counter = Counter()
+        self._seconds: Counter = Counter()
+        self._retries = {'retries': 0, 'quota_errors': 0, 'backoff_seconds': 0.0}
+
+    @property
+    def source_id(self) -> str:
+        """Identificador da planilha (chave de cache e pasta dos snapshots)"""
+        raise NotImplementedError
+
+    @contextmanager
+    def _timed(self, operation: str):
+        start = time.perf_counter()
+        try:
+            with span('sheets_backend_call', backend=self.name, operation=operation) as call:
+                yield call
+        finally:
+            with self._lock:
+                self._calls[operation] += 1
+                self._seconds[operation] += time.perf_counter() - start
+
+    def metadata(self) -> Dict[str, Any]:
+        """Metadados no formato de spreadsheets().get ({'sheets': [{'properties': ...}]})"""
+        with self._timed('metadata'):
+            return self._get_metadata()
+
+    def values(self, range_name: str) -> List[List[str]]:
+        """Linhas de um range A1 ('Aba!A1:E100' ou só 'Aba')"""
+        with self._timed('values') as call:
+            values = self._get_values(range_name)
+            call.set(**payload_size(values))
+            return values
+
+    def batch_values(self, ranges: List[str]) -> List[List[List[str]]]:
+        """Linhas de vários ranges, na mesma ordem"""
+        with self._timed('batch_values') as call:
+            batch = self._batch_get_values(ranges)
+            call.set(**payload_size([row for values in batch for row in values]))
+            return batch
+
+    def revision(self) -> Optional[str]:
+        """Versão atual dos dados (muda a cada edição); erros são propagados"""
+        with self._timed('revision'):
+            return self._get_revision()
+
+    def check(self):
+        """Levanta exceção se a origem não estiver acessível"""
+        with self._timed('check'):
+            self._check()
+
+    def record_retry(self, status: Optional[int], delay: float):
+        """Contabiliza uma nova tentativa e o tempo de espera"""
+        with self._lock:
+            self._retries['retries'] += 1
+            self._retries['backoff_seconds'] += delay
+            if status == 429:
+                self._retries['quota_errors'] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Chamadas e segundos por operação, novas tentativas e tempo em backoff"""
+        with self._lock:
+            return {
+                'backend': self.name,
+                **self._retries,
+                'calls': dict(self._calls),
+                'seconds': dict(self._seconds),
+            }
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def _get_values(self, range_name: str) -> List[List[str]]:
+        raise NotImplementedError
+
+    def _batch_get_values(self, ranges: List[str]) -> List[List[List[str]]]:
+        return [self._get_values(range_name) for range_name in ranges]
+
+    def _get_revision(self) -> Optional[str]:
+        return None
+
+    def _check(self):
+        pass
+
+
+class GoogleBackend(SheetsBackend):
+    """
+    API do Google Sheets (valores e metadados) e do Drive (versão do arquivo)
+
+    Args:
+        pool: Pool de serviços (padrão: o compartilhado pelo processo)
+        limiter: Cota de requisições (padrão: a compartilhada pelo processo)
+        spreadsheet_id: Planilha (padrão: settings.spreadsheet_id, lido a cada uso)
+    """
+
+    name = 'google'
+
+    def __init__(self, pool: Optional[SheetsServicePool] = None,
+                 limiter: Optional[TokenBucket] = None,
+                 spreadsheet_id: Optional[str] = None):
+        super().__init__()
+        self.pool = pool or service_pool
+        self.limiter = limiter or quota_limiter
+        self._spreadsheet_id = spreadsheet_id
+
+    @classmethod
+    def emulator(cls, url: str, **kwargs) -> 'GoogleBackend':
+        """Backend apontado para o servidor local que imita a API (fake_sheets_server)"""
+        pool = SheetsServicePool()
+        pool.set_emulator(url)
+        return cls(pool=pool, **kwargs)
+
+    @property
+    def source_id(self) -> str:
+        return self._spreadsheet_id or settings.spreadsheet_id
+
+    @property
+    def api_url(self) -> str:
+        """URL base da API REST (usada pelo cliente assíncrono)"""
+        return getattr(self.pool, 'emulator_url', None) or settings.sheets_api_url
+
+    @contextmanager
+    def _service(self, api: str = 'sheets', version: str = 'v4'):
+        """Empresta um serviço do pool com tratamento de erro"""
+        try:
+            service = self.pool.checkout(api, version)
+        except Exception as e:
+            self.logger.error(f"❌ Erro ao criar serviço Google Sheets: {e}")
+            raise ConnectionError(f"Falha na conexão com Google Sheets: {e}")
+        try:
+            yield service
+        finally:
+            self.pool.release(service, api, version)
+
+    @staticmethod
+    def _measure_decode(request, operation: str) -> List[int]:
+        """
+        Mede a decodificação do JSON da resposta (sheets_json_decode)
+
+        O googleapiclient decodifica dentro de execute(), no postproc da
+        requisição; ele é embrulhado para separar esse tempo da ida e volta
+        HTTP. Devolve a lista que recebe o tamanho em bytes de cada resposta.
+        """
+        sizes: List[int] = []
+        postproc = getattr(request, 'postproc', None)
+        if callable(postproc):
+            def decode(resp, content):
+                sizes.append(len(content or b''))
+                with span('sheets_json_decode', operation=operation) as decode_span:
+                    decode_span.set(bytes=sizes[-1])
+                    return postproc(resp, content)
+            request.postproc = decode
+        return sizes
+
+    def _execute(self, request, operation: str = 'request'):
+        """
+        Executa uma requisição da API com cota e novas tentativas
+
+        Erros 429 e 5xx (e falhas de rede) são repetidos com backoff
+        exponencial + jitter, respeitando o Retry-After quando o Google manda.
+        Depois de settings.api_max_retries tentativas o erro é propagado.
+        Cada tentativa é um span sheets_http_request (inclui a decodificação,
+        medida também à parte em sheets_json_decode) com os bytes recebidos.
+        """
+        sizes = self._measure_decode(request, operation)
+        for attempt in range(settings.api_max_retries + 1):
+            self.limiter.acquire()
+            try:
+                with span('sheets_http_request', operation=operation) as http_span:
+                    result = request.execute()
+                    if sizes:
+                        http_span.set(bytes=sizes[-1])
+                    return result
+            except HttpError as e:
+                status = e.resp.status
+                if status not in RETRYABLE_STATUS or attempt == settings.api_max_retries:
+                    raise
+                delay = backoff_delay(attempt, e.resp.get('retry-after'),
+                                      base=settings.api_backoff_base, cap=settings.api_backoff_max)
+            except (socket.timeout, ConnectionError) as e:
+                if attempt == settings.api_max_retries:
+                    raise
+                status = None
+                delay = backoff_delay(attempt, base=settings.api_backoff_base, cap=settings.api_backoff_max)
+
+            self.logger.warning(f"⏳ Tentativa {attempt + 1} falhou ({status or 'rede'}), nova tentativa em {delay:.1f}s")
+            self.record_retry(status, delay)
+            time.sleep(delay)
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        with self._service() as service:
+            return self._execute(service.spreadsheets().get(spreadsheetId=self.source_id), 'metadata')
+
+    def _get_values(self, range_name: str) -> List[List[str]]:
+        with self._service() as service:
+            result = self._execute(service.spreadsheets().values().get(
+                spreadsheetId=self.source_id,
+                range=range_name
+            ), 'values')
+        return result.get('values', [])
+
+    def _batch_get_values(self, ranges: List[str]) -> List[List[List[str]]]:
+        # Uma única requisição (um token da cota) para todos os ranges
+        with self._service() as service:
+            result = self._execute(service.spreadsheets().values().batchGet(
+                spreadsheetId=self.source_id,
+                ranges=ranges
+            ), 'batch_values')
+        # A API devolve os valueRanges na mesma ordem dos ranges pedidos
+        value_ranges = result.get('valueRanges', [])
+        value_ranges += [{}] * (len(ranges) - len(value_ranges))
+        return [value_range.get('values', []) for value_range in value_ranges]
+
+    def _get_revision(self) -> Optional[str]:
+        with self._service('drive', 'v3') as drive:
+            metadata = self._execute(drive.files().get(
+                fileId=self.source_id,
+                fields='version,modifiedTime',
+                supportsAllDrives=True
+            ), 'revision')
+        return str(metadata['version'])
+
+    def _check(self):
+        with self._service():
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats['pool'] = self.pool.stats()
+        stats['quota'] = self.limiter.stats()
+        return stats
+
+
+class LocalFilesBackend(SheetsBackend):
+    """
+    Abas lidas de uma pasta local, um CSV por aba (primeira linha = cabeçalho)
+
+    Serve para desenvolver e testar sem credenciais e é a mesma estrutura
+    que o servidor local de testes expõe pela API. A versão dos dados é
+    derivada da data de modificação dos arquivos, então a detecção de
+    mudanças do cliente funciona igual à do Drive.
+
+    Args:
+        folder: Pasta com {aba}.csv
+    """
+
+    name = 'local'
+    snapshots = False
+
+    def __init__(self, folder: Path):
+        super().__init__()
+        self.folder = Path(folder)
+        self._parsed: Dict[Path, Tuple[int, List[List[str]]]] = {}
+
+    @property
+    def source_id(self) -> str:
+        return f"local-{self.folder.name}"
+
+    def tab_path(self, sheet_name: str) -> Path:
+        return self.folder / f"{sheet_name}.csv"
+
+    def tabs(self) -> List[Path]:
+        return sorted(self.folder.glob('*.csv'))
+
+    def set_tab(self, sheet_name: str, values: List[List[Any]]):
+        """Grava (ou substitui) uma aba"""
+        path = self.tab_path(sheet_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerows([['' if v is None else v for v in row] for row in values])
+
+    def read_tab(self, path: Path) -> List[List[str]]:
+        """Conteúdo da aba, relido só quando o arquivo muda"""
+        mtime = path.stat().st_mtime_ns
+        with self._lock:
+            cached = self._parsed.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(path, newline='', encoding='utf-8') as f:
+            values = list(csv.reader(f))
+        with self._lock:
+            self._parsed[path] = (mtime, values)
+        return values
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        tabs = self.tabs()
+        if not tabs:
+            raise FileNotFoundError(f"Nenhuma aba (.csv) em {self.folder}")
+        sheets = []
+        for index, path in enumerate(tabs):
+            values = self.read_tab(path)
+            sheets.append({'properties': {
+                'sheetId': index,
+                'title': path.stem,
+                'index': index,
+                'sheetType': 'GRID',
+                'gridProperties': {
+                    'rowCount': max(len(values), 1),
+                    'columnCount': max((len(row) for row in values), default=1),
+                },
+            }})
+        return {'spreadsheetId': self.source_id, 'properties': {'title': self.folder.name}, 'sheets': sheets}
+
+    def _get_values(self, range_name: str) -> List[List[str]]:
+        sheet_name, cells = split_range(range_name)
+        path = self.tab_path(sheet_name)
+        if not path.exists():
+            raise ValueError(f"Unable to parse range: {range_name}")
+        return slice_values(self.read_tab(path), cells)
+
+    def _get_revision(self) -> Optional[str]:
+        tabs = self.tabs()
+        if not tabs:
+            raise FileNotFoundError(f"Nenhuma aba (.csv) em {self.folder}")
+        # Muda sempre que alguma aba é regravada, como a versão do Drive a cada edição
+        return str(max(path.stat().st_mtime_ns for path in tabs) // 1000 + len(tabs))
+
+    def _check(self):
+        if not self.folder.is_dir():
+            raise FileNotFoundError(f"Pasta de dados não encontrada: {self.folder}")
+
+
+def create_backend(name: Optional[str] = None) -> SheetsBackend:
+    """
+    Backend configurado no ambiente (DATA_BACKEND)
+
+    'google' usa a API (ou o emulador de SHEETS_API_EMULATOR_URL); 'local'
+    lê os CSVs de LOCAL_SHEETS_DIR (padrão: data/sheets).
+    """
+    name = name or settings.data_backend
+    if name == 'google':
+        return GoogleBackend()
+    if name == 'local':
+        return LocalFilesBackend(Path(settings.local_sheets_dir or SHEETS_DATA_DIR))
+    raise ValueError(f"DATA_BACKEND inválido: {name} (use 'google' ou 'local')")
@@ -2,10 +2,10 @@
 import streamlit as st
 import pandas as pd
 import logging
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from googleapiclient.errors import HttpError
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
 import time
 
@@ -13,131 +13,583 @@ import time
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent.parent / "Configuração"))
 from config.settings import settings
+from operational.utils.sheets_backends import (
+    SheetsBackend, GoogleBackend, LocalFilesBackend, create_backend, quota_limiter, RETRYABLE_STATUS
+)
+from operational.utils.snapshot_cache import snapshot_cache
+from operational.utils.sheet_cache import SheetCache, sheet_of
+from operational.utils.single_flight import freeze_frame
+from operational.utils.coercion import coerce_dataframe
+from operational.utils.telemetry import span
+
+def column_letter(index: int) -> str:
+    """Converte o número da coluna (1 = A) na letra usada em ranges A1"""
+    letters = ''
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+# Metadados da planilha (abas e tamanho da grade) ficam no mesmo cache dos dados
+METADATA_KEY = '#metadata'
+METADATA_TTL = 600
+
+def _access_denied(error: Exception) -> bool:
+    """403/404 por falta de acesso (o Drive também responde 403 a limites de taxa, que passam)"""
+    if not isinstance(error, HttpError) or error.resp.status not in (403, 404):
+        return False
+    return b'ratelimitexceeded' not in (error.content or b'').lower()
 
 class GoogleSheetsClient:
-    """Cliente profissional para Google Sheets com cache, retry e logging"""
+    """
+    Camada única de acesso às abas: cache, snapshots, tipos e detecção de mudanças
+    
+    A origem dos dados é plugável (operational.utils.sheets_backends): API do
+    Google, servidor local que imita a API ou CSVs locais. Dashboards e testes
+    usam sempre este cliente, então otimizações de I/O valem para todos.
+    
+    Args:
+        backend: Origem dos dados (padrão: create_backend(), via DATA_BACKEND)
+    """
     
-    def __init__(self):
-        self._service = None
+    def __init__(self, backend: Optional[SheetsBackend] = None):
         self.logger = logging.getLogger(__name__)
-        self._last_request_time = 0
-        self._min_request_interval = 0.1  # Rate limiting: 100ms entre requests
+        self.backend = backend or create_backend()
         
-    @property
-    def service(self):
-        """Lazy loading do serviço Google Sheets com rate limiting"""
-        if self._service is None:
-            self._service = self._create_service()
-        return self._service
-    
-    def _create_service(self):
-        """Cria o serviço Google Sheets com tratamento de erro"""
-        try:
-            credentials_info = settings.get_google_credentials()
-            creds = service_account.Credentials.from_service_account_info(
-                credentials_info,
-                scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
-            )
-            service = build('sheets', 'v4', credentials=creds)
-            self.logger.info("✅ Serviço Google Sheets criado com sucesso")
-            return service
-            
-        except Exception as e:
-            self.logger.error(f"❌ Erro ao criar serviço Google Sheets: {e}")
-            raise ConnectionError(f"Falha na conexão com Google Sheets: {e}")
+        # Último DataFrame bom por range, usado no modo stale-while-revalidate
+        self._lock = threading.Lock()
+        self._last_good: Dict[str, pd.DataFrame] = {}
+        self._refreshing = set()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="sheets-refresh")
+        
+        # Cache em memória por (planilha, range): invalidação por aba e uma
+        # única busca em andamento por range (leitura da página, refresh em
+        # segundo plano e lotes batchGet), compartilhada entre sessões
+        self._cache = SheetCache()
+        
+        # Detecção de mudanças: versão dos dados (Drive ou arquivos), consultada
+        # no máximo uma vez por settings.revision_check_interval para todas as abas
+        self._revision: Optional[str] = None
+        self._revision_checked_at = 0.0
+        # Desligada no processo quando a conta não tem acesso ao Drive (403/404)
+        self._revision_denied = False
+        self._stats = {
+            'fetches': 0,
+            'skipped_fetches': 0,
+            'revision_checks': 0,
+        }
     
-    def _rate_limit(self):
-        """Implementa rate limiting simples"""
-        current_time = time.time()
-        time_since_last = current_time - self._last_request_time
-        if time_since_last < self._min_request_interval:
-            time.sleep(self._min_request_interval - time_since_last)
-        self._last_request_time = time.time()
+    @property
+    def source_id(self) -> str:
+        """Planilha atendida pelo backend (chave de cache e de snapshot)"""
+        return self.backend.source_id
     
-    @st.cache_data(ttl=settings.cache_ttl, show_spinner="Carregando dados...")
-    def get_sheet_data(_self, sheet_name: str, range_cells: Optional[str] = None) -> pd.DataFrame:
+    def _values_to_dataframe(self, sheet_name: str, values: List[List[Any]]) -> pd.DataFrame:
         """
-        Carrega dados de uma aba específica com cache e validação
+        Converte a resposta de values().get em DataFrame com limpeza, tipos e validação
         
         Args:
-            sheet_name: Nome da aba
-            range_cells: Range específico (ex: A1:E100)
+            sheet_name: Nome da aba (usado para validação e logs)
+            values: Linhas retornadas pela API, a primeira é o cabeçalho
             
         Returns:
             DataFrame com os dados
         """
-        try:
-            # Rate limiting
-            _self._rate_limit()
-            
-            # Usa range da configuração se não especificado
-            if range_cells is None:
-                sheet_config = settings.get_sheet_config(sheet_name)
-                range_cells = sheet_config['range'] if sheet_config else 'A1:Z1000'
-            
-            range_name = f"{sheet_name}!{range_cells}"
-            
-            _self.logger.info(f"📊 Carregando dados: {range_name}")
-            
-            result = _self.service.spreadsheets().values().get(
-                spreadsheetId=settings.spreadsheet_id,
-                range=range_name
-            ).execute()
-            
-            values = result.get('values', [])
-            
-            if not values:
-                _self.logger.warning(f"⚠️ Nenhum dado encontrado em {sheet_name}")
-                return pd.DataFrame()
-            
-            if len(values) == 1:
-                _self.logger.warning(f"⚠️ Apenas cabeçalho encontrado em {sheet_name}")
-                return pd.DataFrame(columns=values[0])
-            
-            # Cria DataFrame
+        df = self._build_dataframe(sheet_name, values)
+        return self._apply_schema(sheet_name, df) if len(values) > 1 else df
+    
+    def _build_dataframe(self, sheet_name: str, values: List[List[Any]]) -> pd.DataFrame:
+        """DataFrame em texto (sem tipos) com limpeza básica"""
+        if not values:
+            self.logger.warning(f"⚠️ Nenhum dado encontrado em {sheet_name}")
+            return pd.DataFrame()
+        
+        if len(values) == 1:
+            self.logger.warning(f"⚠️ Apenas cabeçalho encontrado em {sheet_name}")
+            return pd.DataFrame(columns=values[0])
+        
+        # Cria DataFrame
+        with span('sheets_dataframe_build', sheet=sheet_name) as build_span:
             df = pd.DataFrame(values[1:], columns=values[0])
             
             # Limpeza básica
             df = df.dropna(how='all')  # Remove linhas completamente vazias
             df.columns = df.columns.str.strip()  # Remove espaços dos nomes das colunas
-            
-            # Validação das colunas obrigatórias
-            sheet_config = settings.get_sheet_config(sheet_name)
-            if sheet_config and sheet_config['required_columns']:
+            build_span.set(rows=len(df), cells=df.size)
+        return df
+    
+    def _apply_schema(self, sheet_name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Tipos da aba e validação das colunas obrigatórias"""
+        # Tipos por coluna (datas, inteiros, percentuais, moeda) aplicados uma vez aqui
+        sheet_config = settings.get_sheet_config(sheet_name)
+        if sheet_config and sheet_config.get('dtypes'):
+            with span('sheets_coercion', sheet=sheet_name):
+                df = coerce_dataframe(df, sheet_config['dtypes'], locale=settings.sheet_locale)
+        
+        # Validação das colunas obrigatórias
+        if sheet_config and sheet_config['required_columns']:
+            with span('sheets_validation', sheet=sheet_name) as validation_span:
                 missing_cols = set(sheet_config['required_columns']) - set(df.columns)
-                if missing_cols:
-                    _self.logger.warning(f"⚠️ Colunas faltando em {sheet_name}: {missing_cols}")
+                validation_span.set(missing_columns=len(missing_cols))
+            if missing_cols:
+                self.logger.warning(f"⚠️ Colunas faltando em {sheet_name}: {missing_cols}")
+        
+        self.logger.info(f"✅ Dados carregados: {len(df)} linhas, {len(df.columns)} colunas")
+        return df
+    
+    def _grid_size(self, sheet_name: str) -> Optional[Tuple[int, int]]:
+        """Linhas e colunas da aba segundo gridProperties (via get_all_sheets)"""
+        for sheet in self.get_all_sheets():
+            if sheet['name'] == sheet_name and sheet['rows'] and sheet['columns']:
+                return sheet['rows'], sheet['columns']
+        return None
+    
+    def _auto_range(self, sheet_name: str) -> str:
+        """Range que cobre a grade inteira da aba, sem truncar nem chutar tamanho"""
+        grid = self._grid_size(sheet_name)
+        if grid is None:
+            # Só o nome da aba: a API devolve toda a área com dados
+            return sheet_name
+        rows, columns = grid
+        return f"{sheet_name}!A1:{column_letter(columns)}{rows}"
+    
+    def _resolve_range(self, sheet_name: str, range_cells: Optional[str] = None) -> str:
+        """
+        Monta o range completo (Aba!A1:E100)
+        
+        Sem range explícito usa o da configuração da aba e, se ela não fixar
+        um, dimensiona pelo tamanho real da grade (gridProperties).
+        """
+        if range_cells is None:
+            sheet_config = settings.get_sheet_config(sheet_name)
+            range_cells = sheet_config.get('range') if sheet_config else None
+        if range_cells is None:
+            return self._auto_range(sheet_name)
+        return f"{sheet_name}!{range_cells}"
+    
+    def _snapshots_enabled(self) -> bool:
+        return settings.snapshot_enabled and self.backend.snapshots
+    
+    def _load_snapshot(self, range_name: str, max_age: Optional[float] = None) -> Optional[pd.DataFrame]:
+        """Consulta o snapshot em disco antes de ir à rede"""
+        if not self._snapshots_enabled():
+            return None
+        snapshot = snapshot_cache.load(self.source_id, range_name, max_age=max_age)
+        if not snapshot:
+            return None
+        df, meta = snapshot
+        return self._remember(range_name, df, fetched_at=meta['fetched_at'],
+                              revision=meta.get('revision'))
+    
+    def _remember(self, range_name: str, df: pd.DataFrame,
+                  fetched_at: Optional[float] = None,
+                  revision: Optional[str] = None) -> pd.DataFrame:
+        """
+        Marca o horário dos dados e guarda como último DataFrame bom do range
+        
+        O DataFrame passa a ser compartilhado entre sessões e fica somente
+        leitura (freeze_frame); quem precisa alterar trabalha numa cópia.
+        """
+        freeze_frame(df)
+        df.attrs['fetched_at'] = fetched_at if fetched_at is not None else time.time()
+        df.attrs['revision'] = revision
+        df.attrs['stale'] = False
+        with self._lock:
+            current = self._last_good.get(range_name)
+            if current is None or current.attrs['fetched_at'] <= df.attrs['fetched_at']:
+                self._last_good[range_name] = df
+        return df
+    
+    def _current_revision(self) -> Optional[str]:
+        """
+        Versão atual da planilha segundo o backend (muda a cada edição)
+        
+        Returns:
+            Versão como string, ou None se a detecção estiver desligada ou
+            o Drive não responder (nesse caso tudo é rebaixado normalmente)
+        """
+        if not settings.change_detection or self._revision_denied:
+            return None
+        
+        with self._lock:
+            if time.time() - self._revision_checked_at < settings.revision_check_interval:
+                return self._revision
+        
+        try:
+            revision = self.backend.revision()
+        except Exception as e:
+            if _access_denied(e):
+                # Sem escopo drive.metadata.readonly ou sem acesso ao arquivo: não adianta repetir
+                self.logger.warning(f"⚠️ Sem acesso à versão da planilha no Drive (HTTP {e.resp.status}): "
+                                    f"detecção de mudanças desligada até reiniciar o processo")
+                self._revision_denied = True
+                return None
+            self.logger.warning(f"⚠️ Não foi possível consultar a versão da planilha: {e}")
+            revision = None
+        
+        with self._lock:
+            self._revision = revision
+            self._revision_checked_at = time.time()
+            self._stats['revision_checks'] += 1
+        return revision
+    
+    def _unchanged(self, range_name: str, revision: Optional[str]) -> Optional[pd.DataFrame]:
+        """
+        Último DataFrame do range se a planilha não mudou desde que foi baixado
+        
+        O dado (memória ou snapshot em disco) ganha um novo horário e a busca
+        dos valores é pulada.
+        """
+        if revision is None:
+            return None
+        
+        with self._lock:
+            df = self._last_good.get(range_name)
+        if df is None:
+            df = self._load_snapshot(range_name)
+        if df is None or df.attrs.get('revision') != revision:
+            return None
+        
+        if self._snapshots_enabled():
+            snapshot_cache.touch(self.source_id, range_name)
+        with self._lock:
+            self._stats['skipped_fetches'] += 1
+        self.logger.info(f"⏭️ Planilha sem mudanças (versão {revision}), reaproveitando {range_name}")
+        return self._remember(range_name, df.copy(deep=False), revision=revision)
+    
+    def _download_sheet(self, sheet_name: str, range_name: str) -> pd.DataFrame:
+        """
+        Baixa uma aba da API (a coalescência fica no SheetCache de quem chama)
+        
+        Antes de baixar os valores consulta a versão da planilha e, se nada
+        mudou, reaproveita o último dado. Seguro para rodar na thread de
+        refresh em segundo plano; erros são propagados para quem chamou.
+        """
+        revision = self._current_revision()
+        df = self._unchanged(range_name, revision)
+        if df is not None:
+            return df
+        
+        grid = self._grid_size(sheet_name)
+        if (grid and grid[0] > settings.chunk_threshold_rows
+                and range_name == self._auto_range(sheet_name)):
+            # Aba grande: baixa em blocos de linhas em vez de uma lista gigante.
+            # Os tipos vêm depois da junção: categorias tipadas por bloco
+            # teriam categorias diferentes e voltariam como object no concat.
+            chunks = list(self.iter_sheet_chunks(sheet_name, typed=False))
+            df = self._apply_schema(sheet_name, pd.concat(chunks, ignore_index=True)) if chunks else pd.DataFrame()
+        else:
+            df = self._values_to_dataframe(sheet_name, self._fetch_values(range_name))
+        self._remember(range_name, df, revision=revision)
+        self._save_snapshot(range_name, df, revision)
+        with self._lock:
+            self._stats['fetches'] += 1
+        return df
+    
+    def _fetch_values(self, range_name: str) -> List[List[Any]]:
+        """Linhas de um range, direto do backend"""
+        self.logger.info(f"📊 Carregando dados: {range_name}")
+        return self.backend.values(range_name)
+    
+    def iter_sheet_chunks(self, sheet_name: str, chunk_rows: Optional[int] = None,
+                          typed: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Lê uma aba em blocos de linhas, um DataFrame por bloco
+        
+        Permite processar exportações com centenas de milhares de linhas sem
+        materializar a resposta inteira de uma vez. O cabeçalho (linha 1) é
+        lido uma vez e aplicado a todos os blocos. A leitura vai até o número
+        de linhas da grade (gridProperties); blocos vazios no meio da aba são
+        pulados, não encerram a leitura.
+        
+        Args:
+            sheet_name: Nome da aba
+            chunk_rows: Linhas por bloco (padrão: settings.chunk_rows)
+            typed: Aplica os tipos da aba em cada bloco; com False os blocos
+                vêm em texto, para tipar uma vez só depois de juntá-los
             
-            _self.logger.info(f"✅ Dados carregados: {len(df)} linhas, {len(df.columns)} colunas")
+        Yields:
+            DataFrame de cada bloco não vazio
+        """
+        to_dataframe = self._values_to_dataframe if typed else self._build_dataframe
+        chunk_rows = chunk_rows or settings.chunk_rows
+        grid = self._grid_size(sheet_name)
+        if grid is None:
+            yield to_dataframe(sheet_name, self._fetch_values(sheet_name))
+            return
+        
+        rows, columns = grid
+        last_column = column_letter(columns)
+        header = self._fetch_values(f"{sheet_name}!A1:{last_column}1")
+        if not header:
+            return
+        
+        for start in range(2, rows + 1, chunk_rows):
+            end = min(start + chunk_rows - 1, rows)
+            values = self._fetch_values(f"{sheet_name}!A{start}:{last_column}{end}")
+            if values:
+                yield to_dataframe(sheet_name, header + values)
+    
+    def _save_snapshot(self, range_name: str, df: pd.DataFrame, revision: Optional[str] = None):
+        """Grava o DataFrame no snapshot em disco"""
+        if self._snapshots_enabled() and not df.empty:
+            snapshot_cache.save(self.source_id, range_name, df, revision=revision)
+    
+    def _cache_key(self, range_name: str) -> Tuple[str, str]:
+        return (self.source_id, range_name)
+    
+    def get_sheet_data(self, sheet_name: str, range_cells: Optional[str] = None) -> pd.DataFrame:
+        """
+        Carrega dados de uma aba específica com cache e validação
+        
+        O cache é por (planilha, range) e vale settings.cache_ttl; sessões que
+        pedem o mesmo range ao mesmo tempo esperam a mesma busca.
+        
+        Args:
+            sheet_name: Nome da aba
+            range_cells: Range específico (ex: A1:E100)
+            
+        Returns:
+            DataFrame com os dados
+        """
+        # Usa range da configuração se não especificado
+        range_name = self._resolve_range(sheet_name, range_cells)
+        
+        def load() -> pd.DataFrame:
+            with st.spinner("Carregando dados..."):
+                return self._load_sheet_uncached(sheet_name, range_name)
+        
+        df = self._cache.get_or_load(self._cache_key(range_name), load, ttl=settings.cache_ttl,
+                                     cache_if=lambda df: not df.empty)
+        # Cópia rasa: quem chamou pode trocar colunas sem afetar o cache
+        return df.copy(deep=False)
+    
+    def _load_sheet_uncached(self, sheet_name: str, range_name: str) -> pd.DataFrame:
+        """Snapshot dentro do TTL, API ou, em caso de erro, o último snapshot salvo"""
+        # Snapshot em disco ainda dentro do TTL evita a chamada à API
+        df = self._load_snapshot(range_name, max_age=settings.cache_ttl)
+        if df is not None:
             return df
+        
+        try:
+            return self._download_sheet(sheet_name, range_name)
             
         except HttpError as e:
             error_msg = f"Erro HTTP ao acessar {sheet_name}: {e}"
-            _self.logger.error(error_msg)
-            st.error(f"❌ {error_msg}")
-            return pd.DataFrame()
             
         except Exception as e:
             error_msg = f"Erro inesperado ao carregar {sheet_name}: {e}"
-            _self.logger.error(error_msg)
-            st.error(f"❌ {error_msg}")
-            return pd.DataFrame()
+        
+        self.logger.error(error_msg)
+        
+        # Sem rede, um snapshot antigo é melhor que um dashboard vazio
+        df = self._load_snapshot(range_name)
+        if df is not None:
+            st.warning(f"⚠️ {error_msg} (exibindo último snapshot salvo)")
+            return df
+        
+        st.error(f"❌ {error_msg}")
+        return pd.DataFrame()
     
-    @st.cache_data(ttl=600)  # Cache por 10 minutos
-    def get_all_sheets(_self) -> List[Dict[str, Any]]:
+    def get_sheets_data(self, sheet_names: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
         """
-        Lista todas as abas da planilha com metadados
+        Carrega várias abas em uma única chamada values().batchGet
+        
+        Args:
+            sheet_names: Abas a carregar (padrão: settings.available_sheets)
+            
+        Returns:
+            Dicionário {aba: DataFrame}; abas com erro voltam como DataFrame vazio
+        """
+        if sheet_names is None:
+            sheet_names = settings.available_sheets
+        sheet_names = list(sheet_names)
+        if not sheet_names:
+            return {}
+        
+        ranges = {name: self._resolve_range(name) for name in sheet_names}
+        frames, error_msg = self._collect_sheets(sheet_names, ranges)
+        failed = [name for name in sheet_names if name not in frames]
+        if not failed:
+            return frames
+        
+        self.logger.error(error_msg)
+        st.error(f"❌ {error_msg}")
+        
+        for name in failed:
+            df = self._load_snapshot(ranges[name])
+            frames[name] = df if df is not None else pd.DataFrame()
+        return frames
+    
+    def prefetch(self, sheet_names: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Pré-carrega abas em lote sem tocar na interface
+        
+        Mesmo caminho de get_sheets_data (cache, snapshots, detecção de mudança
+        e single-flight), mas sem st.spinner/st.error: pode rodar em threads
+        sem sessão do Streamlit, como a do warm-up.
+        
+        Raises:
+            RuntimeError: Se alguma aba não pôde ser carregada
+        """
+        sheet_names = list(sheet_names)
+        ranges = {name: self._resolve_range(name) for name in sheet_names}
+        frames, error_msg = self._collect_sheets(sheet_names, ranges)
+        if len(frames) < len(sheet_names):
+            raise RuntimeError(error_msg)
+        return frames
+    
+    def _collect_sheets(self, sheet_names: List[str],
+                        ranges: Dict[str, str]) -> Tuple[Dict[str, pd.DataFrame], Optional[str]]:
+        """Abas do cache, dos snapshots e de um único batchGet; devolve (frames, erro) sem exibir nada"""
+        # Abas em cache ou com snapshot em disco dentro do TTL não entram no lote
+        frames = {}
+        for name, range_name in ranges.items():
+            df = self._cache.get_or_load(
+                self._cache_key(range_name),
+                lambda range_name=range_name: self._load_snapshot(range_name, max_age=settings.cache_ttl),
+                ttl=settings.cache_ttl, cache_if=lambda df: df is not None)
+            if df is not None:
+                frames[name] = df.copy(deep=False)
+        missing = [name for name in sheet_names if name not in frames]
+        if not missing:
+            return frames, None
+        
+        # Abas que não mudaram desde o último download também ficam de fora
+        revision = self._current_revision()
+        for name in missing:
+            df = self._unchanged(ranges[name], revision)
+            if df is not None:
+                self._cache.set(self._cache_key(ranges[name]), df)
+                frames[name] = df.copy(deep=False)
+        missing = [name for name in sheet_names if name not in frames]
+        if not missing:
+            return frames, None
+        
+        # Ranges já em busca por outra sessão não entram no lote: esperam por ela
+        flights = self._cache.flights
+        leading, following = flights.begin([self._cache_key(ranges[name]) for name in missing])
+        batch = [name for name in missing if self._cache_key(ranges[name]) in leading]
+        error_msg = None
+        
+        if batch:
+            try:
+                frames.update(self._batch_download(batch, ranges, revision))
+                for name in batch:
+                    flights.finish(self._cache_key(ranges[name]), frames[name])
+                    frames[name] = frames[name].copy(deep=False)
+                    
+            except Exception as e:
+                kind = "HTTP" if isinstance(e, HttpError) else "inesperado"
+                error_msg = f"Erro {kind} ao carregar abas {batch}: {e}"
+                for name in batch:
+                    flights.finish(self._cache_key(ranges[name]), error=e)
+        
+        for name in missing:
+            flight = following.get(self._cache_key(ranges[name]))
+            if flight is None:
+                continue
+            try:
+                frames[name] = flight.result().copy(deep=False)
+            except Exception as e:
+                error_msg = error_msg or f"Erro ao carregar aba {name}: {e}"
+        return frames, error_msg
+    
+    def _batch_download(self, names: List[str], ranges: Dict[str, str],
+                        revision: Optional[str]) -> Dict[str, pd.DataFrame]:
+        """Baixa várias abas num único pedido ao backend e guarda cada uma (memória, disco, cache)"""
+        self.logger.info(f"📊 Carregando {len(names)} abas em lote: {names}")
+        
+        frames = {}
+        batch = self.backend.batch_values([ranges[name] for name in names])
+        for name, values in zip(names, batch):
+            df = self._values_to_dataframe(name, values)
+            self._remember(ranges[name], df, revision=revision)
+            self._save_snapshot(ranges[name], df, revision)
+            if not df.empty:
+                self._cache.set(self._cache_key(ranges[name]), df)
+            frames[name] = df
+        with self._lock:
+            self._stats['fetches'] += len(names)
+        return frames
+    
+    def load_sheet(self, sheet_name: str, range_cells: Optional[str] = None) -> pd.DataFrame:
+        """
+        Carrega uma aba respeitando settings.refresh_mode
+        
+        No modo 'stale_while_revalidate', o último DataFrame bom é devolvido na
+        hora, mesmo com o TTL vencido, e uma thread em segundo plano busca a
+        versão nova. Só bloqueia na API quando não há dado ou quando ele passou
+        de settings.max_staleness. O horário dos dados fica em df.attrs
+        ('fetched_at') e df.attrs['stale'] indica que um refresh está em curso.
+        
+        Args:
+            sheet_name: Nome da aba
+            range_cells: Range específico (ex: A1:E100)
+            
+        Returns:
+            DataFrame com os dados
+        """
+        if settings.refresh_mode != 'stale_while_revalidate':
+            return self.get_sheet_data(sheet_name, range_cells)
+        
+        range_name = self._resolve_range(sheet_name, range_cells)
+        
+        with self._lock:
+            df = self._last_good.get(range_name)
+        if df is None:
+            # Processo novo: o snapshot em disco vale como último dado bom
+            df = self._load_snapshot(range_name)
+        
+        if df is not None:
+            age = time.time() - df.attrs['fetched_at']
+            if age <= settings.max_staleness:
+                df = df.copy(deep=False)
+                if age > settings.cache_ttl:
+                    self._refresh_in_background(sheet_name, range_name)
+                    df.attrs['stale'] = True
+                return df
+        
+        # Sem dado aceitável: busca bloqueante
+        return self.get_sheet_data(sheet_name, range_cells)
+    
+    def _refresh_in_background(self, sheet_name: str, range_name: str):
+        """Agenda a busca de um range na thread de refresh (uma por range)"""
+        with self._lock:
+            if range_name in self._refreshing:
+                return
+            self._refreshing.add(range_name)
+        self._refresh_executor.submit(self._background_refresh, sheet_name, range_name)
+    
+    def _background_refresh(self, sheet_name: str, range_name: str):
+        """Executa o refresh em segundo plano mantendo o dado antigo em caso de erro"""
+        try:
+            self._cache.reload(self._cache_key(range_name),
+                               lambda: self._download_sheet(sheet_name, range_name),
+                               cache_if=lambda df: not df.empty)
+            self.logger.info(f"🔄 Refresh em segundo plano concluído: {range_name}")
+        except Exception as e:
+            self.logger.warning(f"⚠️ Refresh em segundo plano falhou para {range_name}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(range_name)
+    
+    def load_metadata(self) -> Dict[str, Any]:
+        """Metadados da planilha (em cache por 10 minutos); erros sobem sem tocar na interface"""
+        return self._cache.get_or_load((self.source_id, METADATA_KEY), self.backend.metadata,
+                                       ttl=METADATA_TTL)
+    
+    def get_all_sheets(self) -> List[Dict[str, Any]]:
+        """
+        Lista todas as abas da planilha com metadados (em cache por 10 minutos)
         
         Returns:
             Lista com informações das abas
         """
         try:
-            _self._rate_limit()
-            
-            metadata = _self.service.spreadsheets().get(
-                spreadsheetId=settings.spreadsheet_id
-            ).execute()
+            metadata = self.load_metadata()
             
             sheets_info = []
             for sheet in metadata.get('sheets', []):
@@ -157,13 +609,30 @@ class GoogleSheetsClient:
             
         except Exception as e:
             error_msg = f"Erro ao listar abas: {e}"
-            _self.logger.error(error_msg)
+            self.logger.error(error_msg)
             st.error(f"❌ {error_msg}")
             return []
     
+    def has_sheet(self, sheet_name: str) -> bool:
+        """Indica se a planilha tem a aba (pelos metadados em cache)"""
+        return any(sheet['name'] == sheet_name for sheet in self.get_all_sheets())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de buscas (feitas, puladas, repetidas) e tempo em backoff"""
+        backend = self.backend.stats()
+        with self._lock:
+            stats = dict(self._stats)
+        for key in ('retries', 'quota_errors', 'backoff_seconds'):
+            stats[key] = backend[key]
+        return stats
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hits, misses e esperas coalescidas do cache, por range e no total"""
+        return self._cache.stats()
+    
     def health_check(self) -> Dict[str, Any]:
         """
-        Verifica a saúde da conexão com Google Sheets
+        Verifica a saúde da conexão com a origem dos dados
         
         Returns:
             Dicionário com status da conexão
@@ -173,12 +642,15 @@ class GoogleSheetsClient:
             'service_available': False,
             'sheets_accessible': False,
             'sheets_count': 0,
-            'error_message': None
+            'error_message': None,
+            'backend': self.backend.stats(),
+            'client': self.stats(),
+            'cache': self.cache_stats(),
         }
         
         try:
-            # Testa criação do serviço
-            _ = self.service
+            # Testa o serviço (pool do Google) ou a pasta dos arquivos
+            self.backend.check()
             health_status['service_available'] = True
             
             # Testa acesso às planilhas
@@ -187,6 +659,7 @@ class GoogleSheetsClient:
                 health_status['sheets_accessible'] = True
                 health_status['sheets_count'] = len(sheets)
             
+            health_status['backend'] = self.backend.stats()
             self.logger.info("✅ Health check passou")
             
         except Exception as e:
@@ -195,16 +668,46 @@ class GoogleSheetsClient:
         
         return health_status
     
+    def invalidate(self, sheet_name: str) -> int:
+        """
+        Descarta os dados de uma aba (todas as faixas) em memória e em disco
+        
+        As demais abas continuam em cache; a próxima leitura da aba vai à API.
+        A versão da planilha e os metadados (tamanho da grade) são consultados
+        de novo para não reaproveitar o mesmo dado por "não mudou".
+        
+        Returns:
+            Quantidade de entradas de cache removidas
+        """
+        removed = self._cache.invalidate(sheet_name, self.source_id)
+        # O tamanho da grade pode ter mudado junto com os dados
+        self._cache.invalidate(METADATA_KEY, self.source_id)
+        with self._lock:
+            ranges = [range_name for range_name in self._last_good if sheet_of(range_name) == sheet_name]
+            for range_name in ranges:
+                del self._last_good[range_name]
+            self._revision_checked_at = 0.0
+        if self._snapshots_enabled():
+            for range_name in set(ranges) | {self._resolve_range(sheet_name)}:
+                snapshot_cache.invalidate(self.source_id, range_name)
+        self.logger.info(f"🧹 Aba invalidada: {sheet_name}")
+        return removed
+    
     def clear_cache(self):
-        """Limpa todo o cache do cliente"""
-        st.cache_data.clear()
+        """Limpa todo o cache do cliente (memória e snapshots em disco)"""
+        self._cache.clear()
+        with self._lock:
+            self._last_good.clear()
+            self._revision_checked_at = 0.0
+        if self._snapshots_enabled():
+            snapshot_cache.clear(self.source_id)
         self.logger.info("🧹 Cache limpo")
 
 # Instância global do cliente
 sheets_client = GoogleSheetsClient()
 
 # Função de conveniência para compatibilidade com código existente
-def get_sheet_data(spreadsheet_id: str, sheet_name: str, range_cells: str = "A1:Z1000") -> pd.DataFrame:
+def get_sheet_data(spreadsheet_id: str, sheet_name: str, range_cells: Optional[str] = None) -> pd.DataFrame:
     """Função de compatibilidade - use sheets_client.get_sheet_data() diretamente"""
     return sheets_client.get_sheet_data(sheet_name, range_cells)
 
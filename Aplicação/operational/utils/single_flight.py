@@ -0,0 +1,128 @@
+# operational/utils/single_flight.py
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class Flight:
+    """Uma busca em andamento; quem chega depois espera o mesmo resultado"""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self._value: Any = None
+        self._error: Optional[BaseException] = None
+        self.waiters = 0
+
+    def resolve(self, value: Any):
+        self._value = value
+        self._done.set()
+
+    def fail(self, error: BaseException):
+        self._error = error
+        self._done.set()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """Resultado da busca (repropaga o erro do líder, se houve)"""
+        if not self._done.wait(timeout):
+            raise TimeoutError("Busca em andamento não terminou a tempo")
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class SingleFlight:
+    """
+    Coalescência de chamadas idênticas simultâneas (padrão "single flight")
+
+    A primeira chamada de uma chave vira líder e executa a busca; as que
+    chegam enquanto ela roda esperam e recebem o mesmo objeto (ou o mesmo
+    erro). Terminada a busca a chave é liberada: não é um cache, só evita
+    trabalho repetido em paralelo.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, Flight] = {}
+        self._stats = {'leaders': 0, 'shared': 0}
+
+    def begin(self, keys: Iterable[Hashable]) -> Tuple[Dict[Hashable, Flight], Dict[Hashable, Flight]]:
+        """
+        Reserva várias chaves de uma vez (ex.: ranges de um batchGet)
+
+        Returns:
+            (lideradas, seguidas): as chaves lideradas devem ser concluídas com
+            finish(); as seguidas já estão em andamento em outra thread
+        """
+        leading, following = {}, {}
+        with self._lock:
+            for key in keys:
+                flight = self._flights.get(key)
+                if flight is None:
+                    flight = self._flights[key] = Flight()
+                    leading[key] = flight
+                    self._stats['leaders'] += 1
+                else:
+                    flight.waiters += 1
+                    following[key] = flight
+                    self._stats['shared'] += 1
+        return leading, following
+
+    def finish(self, key: Hashable, value: Any = None, error: Optional[BaseException] = None):
+        """Publica o resultado de uma chave liderada e libera a chave"""
+        with self._lock:
+            flight = self._flights.pop(key)
+        if error is not None:
+            flight.fail(error)
+        else:
+            flight.resolve(value)
+        if flight.waiters:
+            self.logger.info(f"🤝 {flight.waiters} chamada(s) reaproveitaram a busca de {key}")
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Executa func() uma vez por chave entre chamadas simultâneas
+
+        Returns:
+            (resultado, compartilhado): compartilhado é True para quem só esperou
+        """
+        leading, following = self.begin([key])
+        if following:
+            return following[key].result(), True
+        try:
+            value = func()
+        except BaseException as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, value)
+        return value, False
+
+    def in_flight(self) -> list:
+        """Chaves com busca em andamento"""
+        with self._lock:
+            return list(self._flights)
+
+    def stats(self) -> Dict[str, int]:
+        """Buscas executadas (líderes) e chamadas que só esperaram (compartilhadas)"""
+        with self._lock:
+            return dict(self._stats)
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Marca os arrays do DataFrame como somente leitura
+
+    Um resultado compartilhado entre sessões não pode ser alterado no lugar:
+    df.loc[...] = ... passa a levantar ValueError. Trocar ou criar colunas
+    (df['x'] = ...) numa cópia rasa continua permitido. O pandas não tem API
+    pública para isso, então os blocos internos são percorridos diretamente.
+    Colunas de extensão (datas, categorias) ficam de fora: o pandas 2.0 entra
+    em recursão ao tentar escrever num DatetimeArray somente leitura.
+    """
+    for block in df._mgr.blocks:
+        if isinstance(block.values, np.ndarray):
+            block.values.flags.writeable = False
+    return df
@@ -0,0 +1,194 @@
+# operational/utils/snapshot_cache.py
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+import pandas as pd
+
+from operational.utils.paths import SNAPSHOT_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(lock_path: Path, exclusive: bool):
+    """Lock entre processos sobre um arquivo .lock (compartilhado ou exclusivo)"""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SnapshotCache:
+    """
+    Cache em disco (Parquet) dos dados das abas, compartilhado entre processos
+
+    Cada range vira um arquivo .parquet com um .json de metadados ao lado
+    (horário da busca, revisão da planilha, tamanho). Leitores e escritores
+    se coordenam por um arquivo .lock, e a escrita é atômica (tmp + replace),
+    então vários workers do Streamlit podem usar o mesmo diretório.
+    """
+
+    def __init__(self, root: Path = SNAPSHOT_DIR):
+        self.root = Path(root)
+        self.logger = logging.getLogger(__name__)
+
+    def _paths(self, spreadsheet_id: str, range_name: str) -> Tuple[Path, Path, Path]:
+        """
+        Arquivos de dados, metadados e lock de um range
+
+        O nome legível troca acentos e símbolos por '_'; o hash curto do range
+        original separa ranges que ficariam iguais ('Análise' e 'Anßlise').
+        """
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]+', '_', range_name)
+        digest = hashlib.sha1(range_name.encode('utf-8')).hexdigest()[:8]
+        folder = self.root / spreadsheet_id
+        base = f"{safe_name}_{digest}"
+        return (folder / f"{base}.parquet",
+                folder / f"{base}.json",
+                folder / f"{base}.lock")
+
+    def _lock(self, lock_path: Path, exclusive: bool):
+        """Lock entre processos (compartilhado para leitura, exclusivo para escrita)"""
+        return file_lock(lock_path, exclusive)
+
+    def read_metadata(self, spreadsheet_id: str, range_name: str) -> Optional[Dict[str, Any]]:
+        """Metadados do snapshot, sem ler os dados"""
+        _, meta_path, _ = self._paths(spreadsheet_id, range_name)
+        return self._read_json(meta_path)
+
+    @staticmethod
+    def _read_json(meta_path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def load(self, spreadsheet_id: str, range_name: str,
+             max_age: Optional[float] = None) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Lê o snapshot de um range
+        
+        Args:
+            spreadsheet_id: ID da planilha
+            range_name: Range completo (ex: Cohort!A1:E100)
+            max_age: Idade máxima em segundos (None aceita qualquer idade)
+            
+        Returns:
+            (DataFrame, metadados) ou None se não existir ou estiver velho
+        """
+        data_path, meta_path, lock_path = self._paths(spreadsheet_id, range_name)
+        if not meta_path.exists():
+            return None
+
+        try:
+            with self._lock(lock_path, exclusive=False):
+                meta = self.read_metadata(spreadsheet_id, range_name)
+                if meta is None:
+                    return None
+                if max_age is not None and time.time() - meta['fetched_at'] > max_age:
+                    return None
+                df = pd.read_parquet(data_path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Snapshot ilegível para {range_name}: {e}")
+            return None
+
+        self.logger.info(f"💾 Snapshot em disco usado: {range_name} ({len(df)} linhas)")
+        return df, meta
+
+    def save(self, spreadsheet_id: str, range_name: str, df: pd.DataFrame,
+             revision: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Grava o snapshot de um range de forma atômica
+        
+        Returns:
+            Metadados gravados ou None se o DataFrame não puder ser salvo
+        """
+        data_path, meta_path, lock_path = self._paths(spreadsheet_id, range_name)
+        meta = {
+            'spreadsheet_id': spreadsheet_id,
+            'range': range_name,
+            'fetched_at': time.time(),
+            'revision': revision,
+            'rows': len(df),
+            'columns': len(df.columns),
+        }
+
+        try:
+            with self._lock(lock_path, exclusive=True):
+                tmp_data = data_path.with_name(f"{data_path.name}.{os.getpid()}.tmp")
+                tmp_meta = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+                df.to_parquet(tmp_data, index=False)
+                with open(tmp_meta, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+                os.replace(tmp_data, data_path)
+                os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Não foi possível gravar snapshot de {range_name}: {e}")
+            return None
+
+        return meta
+
+    def touch(self, spreadsheet_id: str, range_name: str) -> Optional[Dict[str, Any]]:
+        """Renova o horário do snapshot sem regravar os dados (planilha não mudou)"""
+        _, meta_path, lock_path = self._paths(spreadsheet_id, range_name)
+        try:
+            with self._lock(lock_path, exclusive=True):
+                meta = self.read_metadata(spreadsheet_id, range_name)
+                if meta is None:
+                    return None
+                meta['fetched_at'] = time.time()
+                tmp_meta = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.tmp")
+                with open(tmp_meta, 'w', encoding='utf-8') as f:
+                    json.dump(meta, f)
+                os.replace(tmp_meta, meta_path)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Não foi possível renovar snapshot de {range_name}: {e}")
+            return None
+        return meta
+
+    def invalidate(self, spreadsheet_id: str, range_name: str):
+        """Remove o snapshot de um range"""
+        data_path, meta_path, lock_path = self._paths(spreadsheet_id, range_name)
+        with self._lock(lock_path, exclusive=True):
+            for path in (meta_path, data_path):
+                path.unlink(missing_ok=True)
+
+    def clear(self, spreadsheet_id: str):
+        """Remove todos os snapshots de uma planilha"""
+        folder = self.root / spreadsheet_id
+        if not folder.exists():
+            return
+        for meta_path in folder.glob('*.json'):
+            meta = self._read_json(meta_path)
+            if meta:
+                self.invalidate(spreadsheet_id, meta['range'])
+            # Metadados ilegíveis ou arquivos do formato antigo (sem hash no nome)
+            for path in (meta_path, meta_path.with_suffix('.parquet')):
+                path.unlink(missing_ok=True)
+
+
+# Instância global do cache em disco
+snapshot_cache = SnapshotCache()
@@ -0,0 +1,277 @@
+# operational/utils/synthetic_data.py
+"""
+Gerador de dados sintéticos de jogadores, sessões e compras
+
+Substitui os laços por jogador do notebook Board_Analysis: cada bloco de
+jogadores é gerado com operações vetorizadas do NumPy, então milhões de
+jogadores cabem em memória constante. O mesmo seed produz sempre os mesmos
+dados (para o mesmo chunk_size).
+
+Uso:
+    python -m operational.utils.synthetic_data --players 1000000 --format parquet
+"""
+import argparse
+import logging
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from operational.utils.paths import RAW_DATA_DIR
+
+# Mix de segmentos do notebook; 'engagement' multiplica a curva de retenção,
+# 'frequency' é a chance de compra por sessão e 'purchase_value' o ticket médio
+SEGMENTS = {
+    'whale': {'prob': 0.01, 'engagement': 1.6, 'frequency': 0.3, 'purchase_value': 19.99},
+    'dolphin': {'prob': 0.05, 'engagement': 1.35, 'frequency': 0.15, 'purchase_value': 9.99},
+    'minnow': {'prob': 0.15, 'engagement': 1.15, 'frequency': 0.08, 'purchase_value': 2.99},
+    'free': {'prob': 0.79, 'engagement': 0.9, 'frequency': 0.0, 'purchase_value': 0.0},
+}
+
+# Curva base de retenção (lei de potência): D1 ≈ 60%, D7 ≈ 30%, D30 ≈ 18%
+D1_RETENTION = 0.6
+RETENTION_DECAY = 0.35
+
+TABLES = ('players', 'sessions', 'purchases')
+DATE_COLUMNS = {'players': ['install_date'], 'sessions': ['install_date', 'session_date'],
+                'purchases': ['purchase_date']}
+
+
+def _segment_arrays(segments: Dict[str, Dict[str, float]]):
+    """Parâmetros dos segmentos como arrays alinhados aos códigos"""
+    names = list(segments)
+    params = {key: np.array([segments[name][key] for name in names], dtype=np.float64)
+              for key in ('prob', 'engagement', 'frequency', 'purchase_value')}
+    params['prob'] = params['prob'] / params['prob'].sum()
+    return names, params
+
+
+def generate_chunk(n_players: int, rng: np.random.Generator,
+                   first_player_id: int = 0,
+                   start_date: str = '2024-01-01',
+                   n_days: int = 90,
+                   install_days: int = 60,
+                   segments: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Gera um bloco de jogadores com suas sessões e compras
+
+    Args:
+        n_players: Jogadores no bloco
+        rng: Gerador do NumPy (define a reprodutibilidade)
+        first_player_id: Id do primeiro jogador do bloco
+        start_date: Primeiro dia da janela de observação
+        n_days: Tamanho da janela de observação
+        install_days: Installs acontecem nos primeiros `install_days` dias
+        segments: Mix de segmentos (padrão: SEGMENTS)
+
+    Returns:
+        {'players': (player_id, segment, install_date, active_days, total_spent),
+         'sessions': (player_id, install_date, session_date),
+         'purchases': (player_id, segment, day, purchase_date, value)}
+    """
+    names, params = _segment_arrays(segments or SEGMENTS)
+    start = np.datetime64(pd.Timestamp(start_date).date(), 'D')
+
+    player_ids = np.arange(first_player_id, first_player_id + n_players, dtype=np.int64)
+    segment_codes = rng.choice(len(names), size=n_players, p=params['prob'])
+    install_offset = rng.integers(0, min(install_days, n_days), size=n_players)
+
+    # Sessões: matriz jogador × dia desde o install com a curva de retenção do segmento
+    days = np.arange(n_days)
+    curve = np.empty(n_days)
+    curve[0] = 1.0
+    curve[1:] = D1_RETENTION * days[1:] ** -RETENTION_DECAY
+    probability = np.minimum(curve[None, :] * params['engagement'][segment_codes][:, None], 1.0)
+    observed = days[None, :] < (n_days - install_offset)[:, None]
+    active = (rng.random((n_players, n_days), dtype=np.float32) < probability) & observed
+    active[:, 0] = True
+    session_rows, session_days = np.nonzero(active)
+
+    # Compras: cada sessão compra com a frequência do segmento
+    session_segments = segment_codes[session_rows]
+    buys = rng.random(len(session_rows)) < params['frequency'][session_segments]
+    purchase_rows = session_rows[buys]
+    purchase_segments = session_segments[buys]
+    mean_value = params['purchase_value'][purchase_segments]
+    values = np.maximum(0.99, rng.normal(mean_value, mean_value * 0.3)).round(2)
+
+    install_dates = start + install_offset.astype('timedelta64[D]')
+    segment_labels = pd.Categorical.from_codes(segment_codes, categories=names)
+    purchase_dates = install_dates[purchase_rows] + session_days[buys].astype('timedelta64[D]')
+
+    players = pd.DataFrame({
+        'player_id': player_ids,
+        'segment': segment_labels,
+        'install_date': install_dates.astype('datetime64[ns]'),
+        'active_days': active.sum(axis=1),
+        'total_spent': np.bincount(purchase_rows, weights=values, minlength=n_players).round(2),
+    })
+    sessions = pd.DataFrame({
+        'player_id': player_ids[session_rows],
+        'install_date': install_dates[session_rows].astype('datetime64[ns]'),
+        'session_date': (install_dates[session_rows] + session_days.astype('timedelta64[D]')).astype('datetime64[ns]'),
+    })
+    purchases = pd.DataFrame({
+        'player_id': player_ids[purchase_rows],
+        'segment': pd.Categorical.from_codes(purchase_segments, categories=names),
+        # Dia da compra na janela de observação (como no gráfico de receita diária)
+        'day': install_offset[purchase_rows] + session_days[buys],
+        'purchase_date': purchase_dates.astype('datetime64[ns]'),
+        'value': values,
+    })
+    return {'players': players, 'sessions': sessions, 'purchases': purchases}
+
+
+def iter_chunks(n_players: int, seed: int = 42, chunk_size: int = 100_000,
+                **options) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Gera os dados em blocos de `chunk_size` jogadores
+
+    Cada bloco tem seu próprio gerador derivado do seed (SeedSequence.spawn),
+    então o resultado não depende de quantos blocos já foram consumidos.
+    """
+    n_chunks = -(-n_players // chunk_size) if n_players else 0
+    seeds = np.random.SeedSequence(seed).spawn(n_chunks)
+    for index, chunk_seed in enumerate(seeds):
+        first = index * chunk_size
+        size = min(chunk_size, n_players - first)
+        yield generate_chunk(size, np.random.default_rng(chunk_seed), first_player_id=first, **options)
+
+
+def generate(n_players: int, seed: int = 42, chunk_size: int = 100_000, **options) -> Dict[str, pd.DataFrame]:
+    """Gera todos os dados em memória (concatenando os blocos)"""
+    parts = {table: [] for table in TABLES}
+    for chunk in iter_chunks(n_players, seed=seed, chunk_size=chunk_size, **options):
+        for table in TABLES:
+            parts[table].append(chunk[table])
+    return {table: pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+            for table, frames in parts.items()}
+
+
+def write_dataset(output_dir: Path, n_players: int, seed: int = 42,
+                  chunk_size: int = 100_000, file_format: str = 'parquet',
+                  **options) -> Dict[str, int]:
+    """
+    Grava os dados em disco, um arquivo por bloco e por tabela
+
+    Estrutura: output_dir/{players,sessions,purchases}/part-00000.{parquet,csv}
+
+    Returns:
+        Total de linhas gravadas por tabela
+    """
+    if file_format not in ('parquet', 'csv'):
+        raise ValueError(f"Formato não suportado: {file_format}")
+
+    logger = logging.getLogger(__name__)
+    output_dir = Path(output_dir)
+    for table in TABLES:
+        (output_dir / table).mkdir(parents=True, exist_ok=True)
+
+    rows = {table: 0 for table in TABLES}
+    for index, chunk in enumerate(iter_chunks(n_players, seed=seed, chunk_size=chunk_size, **options)):
+        for table in TABLES:
+            path = output_dir / table / f"part-{index:05d}.{file_format}"
+            if file_format == 'parquet':
+                chunk[table].to_parquet(path, index=False)
+            else:
+                chunk[table].to_csv(path, index=False)
+            rows[table] += len(chunk[table])
+        logger.info(f"🎲 Bloco {index} gravado ({len(chunk['players'])} jogadores)")
+    return rows
+
+
+def read_table(dataset_dir: Path, table: str) -> pd.DataFrame:
+    """Lê uma tabela gravada por write_dataset (Parquet ou CSV)"""
+    table_dir = Path(dataset_dir) / table
+    parts = sorted(table_dir.glob('part-*.parquet'))
+    if parts:
+        return pd.concat([pd.read_parquet(path) for path in parts], ignore_index=True)
+    parts = sorted(table_dir.glob('part-*.csv'))
+    if not parts:
+        raise FileNotFoundError(f"Nenhum arquivo em {table_dir}")
+    return pd.concat([pd.read_csv(path, parse_dates=DATE_COLUMNS.get(table, [])) for path in parts],
+                     ignore_index=True)
+
+
+def generate_experiment_users(n_users: int, n_experiments: int = 5,
+                              variants: Sequence[str] = ('control', 'a', 'b'),
+                              max_lift: float = 0.15, seed: int = 42) -> pd.DataFrame:
+    """
+    Usuários de testes A/B simultâneos (entrada de ab_test_engine)
+
+    Cada usuário cai num experimento e numa variante; cada variante que não
+    é a primeira recebe um efeito sorteado em [-max_lift, max_lift] (metade
+    delas sem efeito) sobre conversão, receita e retenção D7. A receita tem
+    cauda pesada (lognormal) e se correlaciona com pre_revenue, o gasto
+    antes do teste usado pelo CUPED.
+    """
+    rng = np.random.default_rng(seed)
+    experiment = rng.integers(0, n_experiments, n_users)
+    variant = rng.integers(0, len(variants), n_users)
+
+    lifts = rng.uniform(-max_lift, max_lift, (n_experiments, len(variants), 3))
+    lifts[:, 0] = 0.0
+    lifts[rng.random((n_experiments, len(variants))) < 0.5] = 0.0
+    conversion_lift, revenue_lift, retention_lift = np.moveaxis(lifts[experiment, variant], -1, 0)
+
+    # Pagadores em potencial e ticket do usuário: os mesmos antes e durante o teste
+    payer = rng.random(n_users) < 0.08
+    spend = rng.lognormal(1.0, 1.0, n_users)
+    converted = payer & (rng.random(n_users) < 0.6 * (1.0 + conversion_lift))
+    revenue = np.where(converted, spend * (1.0 + revenue_lift) * rng.lognormal(0.0, 0.5, n_users), 0.0)
+    pre_revenue = np.where(payer & (rng.random(n_users) < 0.6), spend * rng.lognormal(0.0, 0.5, n_users), 0.0)
+
+    return pd.DataFrame({
+        'user_id': np.arange(n_users, dtype=np.int64),
+        'experiment': np.char.add('exp_', np.arange(1, n_experiments + 1).astype(str))[experiment],
+        'variant': np.asarray(variants)[variant],
+        'converted': converted.astype(np.int8),
+        'revenue': revenue.round(2),
+        'retained_d7': (rng.random(n_users) < 0.25 * (1.0 + retention_lift)).astype(np.int8),
+        'pre_revenue': pre_revenue.round(2),
+    })
+
+
+def iter_parts(dataset_dir: Path) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Lê um dataset de write_dataset bloco a bloco
+
+    Cada bloco traz players, sessions e purchases do mesmo grupo de
+    jogadores (os blocos não compartilham jogadores).
+    """
+    dataset_dir = Path(dataset_dir)
+    parts = sorted((dataset_dir / 'players').glob('part-*.*'))
+    if not parts:
+        raise FileNotFoundError(f"Nenhum arquivo em {dataset_dir / 'players'}")
+    for path in parts:
+        chunk = {}
+        for table in TABLES:
+            table_path = dataset_dir / table / path.name
+            if table_path.suffix == '.parquet':
+                chunk[table] = pd.read_parquet(table_path)
+            else:
+                chunk[table] = pd.read_csv(table_path, parse_dates=DATE_COLUMNS.get(table, []))
+        yield chunk
+
+
+def main(argv=None):
+    """Linha de comando para gerar datasets de carga"""
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de jogadores, sessões e compras")
+    parser.add_argument('--players', type=int, default=100_000, help="Número de jogadores")
+    parser.add_argument('--seed', type=int, default=42, help="Seed do gerador")
+    parser.add_argument('--chunk-size', type=int, default=100_000, help="Jogadores por bloco")
+    parser.add_argument('--days', type=int, default=90, help="Dias da janela de observação")
+    parser.add_argument('--format', choices=('parquet', 'csv'), default='parquet')
+    parser.add_argument('--output', type=Path, default=RAW_DATA_DIR / 'synthetic')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    rows = write_dataset(args.output, args.players, seed=args.seed, chunk_size=args.chunk_size,
+                         file_format=args.format, n_days=args.days)
+    for table, count in rows.items():
+        print(f"✅ {table}: {count:,} linhas em {args.output / table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+# operational/utils/telemetry.py
+"""
+Métricas do acesso às planilhas: spans de tempo, contadores e histogramas
+
+    with span('sheets_http_request', operation='values') as s:
+        ...
+        s.set(bytes=len(content))
+
+Cada span alimenta o histograma {nome}_seconds (e {nome}_{atributo} para os
+atributos numéricos, ex. bytes/linhas/células), conta erros em
+{nome}_errors_total e entra na lista dos spans recentes. O registro é exposto
+em texto do Prometheus (to_prometheus, servidor opcional em METRICS_PORT), em
+JSON (to_dict / dump) e no painel de debug das páginas.
+"""
+import json
+import logging
+import numbers
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Limites dos histogramas: tempos (s) e tamanhos (bytes, linhas, células)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+class Histogram:
+    """Contagem, soma, mínimo/máximo e buckets cumulativos de um valor observado"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'min': self.min,
+            'max': self.max,
+            'buckets': dict(zip(map(str, self.buckets), self.cumulative())),
+        }
+
+
+class Span:
+    """Trecho medido; set() anexa atributos (bytes, linhas, células...)"""
+
+    def __init__(self, name: str, labels: Dict[str, Any]):
+        self.name = name
+        self.labels = labels
+        self.attributes: Dict[str, Any] = {}
+        self.started_at = time.time()
+        self.seconds = 0.0
+        self.error: Optional[str] = None
+
+    def set(self, **attributes):
+        for key, value in attributes.items():
+            # Escalares do numpy (ex.: df.size) viram int/float para o JSON
+            if isinstance(value, bool):
+                pass
+            elif isinstance(value, numbers.Integral):
+                value = int(value)
+            elif isinstance(value, numbers.Real):
+                value = float(value)
+            self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'labels': dict(self.labels),
+            'started_at': self.started_at,
+            'seconds': self.seconds,
+            'attributes': dict(self.attributes),
+            'error': self.error,
+        }
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas do processo (seguro entre threads)
+
+    Args:
+        recent: Quantos spans recentes manter para inspeção
+    """
+
+    def __init__(self, recent: int = 200):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._recent: deque = deque(maxlen=recent)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Soma `value` ao contador `name`"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """Registra um valor no histograma `name` (buckets de tempo se terminar em _seconds)"""
+        key = _labels(labels)
+        buckets = LATENCY_BUCKETS if name.endswith('_seconds') else SIZE_BUCKETS
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, name: str, **labels) -> Iterator[Span]:
+        """Mede o bloco em {name}_seconds; atributos numéricos viram {name}_{atributo}"""
+        current = Span(name, labels)
+        start = time.perf_counter()
+        try:
+            yield current
+        except BaseException as e:
+            current.error = type(e).__name__
+            self.inc(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            current.seconds = time.perf_counter() - start
+            self.observe(f"{name}_seconds", current.seconds, **labels)
+            for attribute, value in current.attributes.items():
+                if isinstance(value, numbers.Real) and not isinstance(value, bool):
+                    self.observe(f"{name}_{attribute}", value, **labels)
+            with self._lock:
+                self._recent.append(current)
+
+    def recent_spans(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Spans mais recentes primeiro"""
+        with self._lock:
+            spans = list(self._recent)[::-1]
+        return [span.to_dict() for span in spans[:limit]]
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Uma linha por série de histograma (nome, rótulos, contagem, média, máximo, total)"""
+        with self._lock:
+            rows = [{'metric': name, **dict(labels), 'count': histogram.count,
+                     'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                     'max': histogram.max, 'sum': histogram.sum}
+                    for name, series in sorted(self._histograms.items())
+                    for labels, histogram in series.items()]
+        return rows
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Contadores, histogramas e spans recentes serializáveis em JSON"""
+        with self._lock:
+            counters = {name: [{'labels': dict(labels), 'value': value} for labels, value in series.items()]
+                        for name, series in sorted(self._counters.items())}
+            histograms = {name: [{'labels': dict(labels), **histogram.to_dict()}
+                                 for labels, histogram in series.items()]
+                          for name, series in sorted(self._histograms.items())}
+        return {'generated_at': time.time(), 'counters': counters,
+                'histograms': histograms, 'recent_spans': self.recent_spans()}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def dump(self, path: Path) -> Path:
+        """Grava o JSON do registro em `path`"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.to_json(), encoding='utf-8')
+        return path
+
+    def to_prometheus(self) -> str:
+        """Formato texto de exposição do Prometheus (0.0.4)"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines += [f"{name}{_format_labels(labels)} {value}" for labels, value in series.items()]
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in series.items():
+                    for bound, count in zip(histogram.buckets, histogram.cumulative()):
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', str(bound)))} {count}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Zera todas as métricas"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self._recent.clear()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self):
+        if self.path.startswith('/metrics.json'):
+            body, content_type = self.registry.to_json(), 'application/json'
+        elif self.path.startswith('/metrics'):
+            body, content_type = self.registry.to_prometheus(), 'text/plain; version=0.0.4'
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = '0.0.0.0',
+                         metrics: Optional[MetricsRegistry] = None) -> ThreadingHTTPServer:
+    """
+    Servidor HTTP em segundo plano com /metrics (Prometheus) e /metrics.json
+
+    O Streamlit não permite rotas próprias, então as métricas saem numa porta
+    separada (settings.metrics_port).
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': metrics or registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    logger.info(f"📈 Métricas em http://{host}:{server.server_port}/metrics")
+    return server
+
+
+# Registro global do processo
+registry = MetricsRegistry()
+span = registry.span
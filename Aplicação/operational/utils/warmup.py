@@ -0,0 +1,61 @@
+# operational/utils/warmup.py
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+import streamlit as st
+
+from config.settings import settings
+from operational.utils.profiling import timed, timings
+from operational.utils.sheets_client import sheets_client
+from operational.utils.telemetry import start_metrics_server
+
+logger = logging.getLogger(__name__)
+
+
+def _preload(state: Dict[str, Any]):
+    """
+    Prepara o backend (serviços do Google) e baixa as abas principais (roda numa thread)
+
+    A thread não tem contexto de sessão do Streamlit: só usa os métodos do
+    cliente que não chamam st.spinner/st.error.
+    """
+    try:
+        with timed('warmup.service'):
+            sheets_client.backend.check()
+        with timed('warmup.metadata'):
+            sheets_client.load_metadata()
+        with timed('warmup.sheets'):
+            # Um único batchGet: popula o último dado bom e os snapshots em disco
+            sheets_client.prefetch(settings.warmup_sheets)
+        logger.info(f"🔥 Warm-up concluído em {time.time() - state['started_at']:.2f}s")
+    except Exception as e:
+        state['error'] = str(e)
+        logger.warning(f"⚠️ Warm-up falhou: {e}")
+    finally:
+        state['timings'] = {k: v for k, v in timings().items() if k.startswith('warmup.')}
+        state['done'] = True
+
+
+@st.cache_resource(show_spinner=False)
+def warm_up() -> Dict[str, Any]:
+    """
+    Pré-carrega o serviço do Sheets e as abas de settings.warmup_sheets
+
+    cache_resource garante uma única execução por processo do servidor (na
+    primeira sessão); o trabalho roda em segundo plano para não atrasar o
+    primeiro render. O estado devolvido é atualizado pela thread. Com
+    METRICS_PORT definido, sobe também o servidor de métricas.
+    """
+    state = {'started_at': time.time(), 'done': False, 'error': None, 'timings': {}}
+    if settings.metrics_port:
+        try:
+            start_metrics_server(settings.metrics_port)
+        except OSError as e:
+            logger.warning(f"⚠️ Servidor de métricas não iniciado na porta {settings.metrics_port}: {e}")
+    if not settings.warmup_enabled:
+        state['done'] = True
+        return state
+    threading.Thread(target=_preload, args=(state,), name='sheets-warmup', daemon=True).start()
+    return state
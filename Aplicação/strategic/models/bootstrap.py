@@ -0,0 +1,235 @@
+# strategic/models/bootstrap.py
+"""
+Intervalos de confiança por bootstrap para LTV, retenção D1/D7/D30 e ARPDAU
+
+Cada réplica reamostra os jogadores com reposição dentro do seu grupo
+(bootstrap estratificado) e recalcula retenção, ARPDAU e a previsão de LTV
+(ltv_forecast). A reamostragem vira um vetor de contagens por jogador, então
+uma réplica é um punhado de produtos matriz-vetor e bincounts, sem laços por
+jogador.
+
+As réplicas rodam num pool de processos. Os arrays por jogador vão uma
+única vez para multiprocessing.shared_memory e cada worker só os anexa (sem
+pickle do conjunto de dados por tarefa); as tarefas levam apenas a semente e
+o número de réplicas, e devolvem retenção e ARPDAU por grupo. Os ajustes da
+curva de todas as réplicas são feitos de uma vez no processo principal.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from strategic.models.ltv_forecast import (
+    DEFAULT_HORIZONS, ParameterCache, aggregate, forecast_ltv, player_arrays
+)
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = (1, 7, 30)
+# Réplicas por tarefa do pool (fixo: o resultado de um seed não depende do número de workers)
+REPLICATES_PER_TASK = 25
+# Especificação de um array compartilhado: (nome do bloco, forma, dtype)
+ArraySpec = Tuple[str, Tuple[int, ...], str]
+
+
+class SharedArrays:
+    """
+    Cópia de arrays numpy em blocos de memória compartilhada
+
+    Usado como context manager: os blocos são liberados (unlink) na saída.
+    `spec` é o que vai para os workers, que anexam com attach_arrays().
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self._blocks: List[SharedMemory] = []
+        self.spec: Dict[str, ArraySpec] = {}
+        try:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                block = SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+                self.spec[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self) -> 'SharedArrays':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def attach_arrays(spec: Dict[str, ArraySpec]) -> Tuple[Dict[str, np.ndarray], List[SharedMemory]]:
+    """
+    Views somente leitura sobre os blocos criados por SharedArrays
+
+    Os blocos devolvidos precisam continuar referenciados enquanto os
+    arrays forem usados. Quem libera (unlink) é sempre quem criou: os
+    workers do pool compartilham o resource_tracker do processo principal.
+    """
+    arrays, blocks = {}, []
+    for name, (block_name, shape, dtype) in spec.items():
+        block = SharedMemory(name=block_name)
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+        blocks.append(block)
+    return arrays, blocks
+
+
+def group_slices(bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Início e tamanho da fatia do grupo de cada jogador"""
+    sizes = np.diff(bounds)
+    return np.repeat(bounds[:-1], sizes), np.repeat(sizes, sizes)
+
+
+def resample_weights(starts: np.ndarray, sizes: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Contagens de uma reamostragem com reposição dentro de cada grupo
+
+    Um sorteio por jogador, restrito à fatia do seu grupo (group_slices);
+    as contagens somam o tamanho de cada grupo.
+    """
+    draws = starts + (rng.random(len(starts)) * sizes).astype(np.int64)
+    return np.bincount(draws, minlength=len(starts)).astype(np.float32)
+
+
+def run_replicates(arrays: Dict[str, np.ndarray], n_replicates: int,
+                   seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Réplicas de retenção e ARPDAU
+
+    Returns:
+        (retenção réplicas × grupos × dias, ARPDAU réplicas × grupos)
+    """
+    rng = np.random.default_rng(seed)
+    starts, sizes = group_slices(arrays['bounds'])
+    n_groups, width = len(arrays['bounds']) - 1, arrays['activity'].shape[1]
+    rates = np.empty((n_replicates, n_groups, width))
+    arpdau = np.empty((n_replicates, n_groups))
+    for replicate in range(n_replicates):
+        rates[replicate], arpdau[replicate] = aggregate(arrays, resample_weights(starts, sizes, rng))
+    return rates, arpdau
+
+
+# Arrays anexados por cada worker no início (inicializador do pool)
+_worker_arrays: Dict[str, np.ndarray] = {}
+_worker_blocks: List[SharedMemory] = []
+
+
+def _init_worker(spec: Dict[str, ArraySpec]):
+    global _worker_arrays, _worker_blocks
+    _worker_arrays, _worker_blocks = attach_arrays(spec)
+
+
+def _worker_replicates(n_replicates: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    return run_replicates(_worker_arrays, n_replicates, seed)
+
+
+def _batches(n_replicates: int) -> List[int]:
+    """Divide as réplicas em tarefas de REPLICATES_PER_TASK (a última pode ser menor)"""
+    full, rest = divmod(n_replicates, REPLICATES_PER_TASK)
+    return [REPLICATES_PER_TASK] * full + ([rest] if rest else [])
+
+
+def bootstrap_replicates(arrays: Dict[str, np.ndarray], n_replicates: int = 1000,
+                         seed: Optional[int] = None,
+                         workers: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Executa as réplicas em paralelo sobre arrays em memória compartilhada
+
+    Args:
+        arrays: Saída de ltv_forecast.player_arrays
+        n_replicates: Número de réplicas
+        seed: Semente (o mesmo seed dá o mesmo resultado com qualquer número de workers)
+        workers: Processos (padrão: os.cpu_count(); 1 roda no próprio processo)
+
+    Returns:
+        (retenção réplicas × grupos × dias, ARPDAU réplicas × grupos)
+    """
+    workers = workers or os.cpu_count() or 1
+    # Uma semente independente por tarefa; várias tarefas por worker equilibram a carga
+    sizes = _batches(n_replicates)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    workers = min(workers, len(sizes))
+    start = time.perf_counter()
+
+    if workers == 1:
+        results = [run_replicates(arrays, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]
+    else:
+        with SharedArrays(arrays) as shared, \
+                ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                    initargs=(shared.spec,)) as pool:
+            results = list(pool.map(_worker_replicates, sizes, seeds))
+
+    rates = np.concatenate([result[0] for result in results])
+    arpdau = np.concatenate([result[1] for result in results])
+    logger.info(f"🎲 {n_replicates} réplicas de bootstrap em {time.perf_counter() - start:.2f}s "
+                f"({workers} processo(s))")
+    return rates, arpdau
+
+
+def bootstrap_intervals(players: pd.DataFrame, sessions: pd.DataFrame, purchases: pd.DataFrame,
+                        by: Sequence[str] = ('segment',), n_replicates: int = 1000,
+                        confidence: float = 0.95, horizons: Sequence[int] = DEFAULT_HORIZONS,
+                        retention_days: Sequence[int] = RETENTION_DAYS, max_day: int = 30,
+                        seed: Optional[int] = None, workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Intervalos percentis de LTV, retenção e ARPDAU por grupo
+
+    Args:
+        players / sessions / purchases: Dados brutos (ver ltv_forecast.player_arrays)
+        by: Colunas de players que definem os grupos
+        n_replicates: Número de réplicas
+        confidence: Nível do intervalo (0.95 = percentis 2,5 e 97,5)
+        horizons: Horizontes do LTV
+        retention_days: Dias de retenção reportados (até max_day)
+        seed / workers: Ver bootstrap_replicates
+
+    Returns:
+        DataFrame por grupo com colunas (métrica, estatística), em que a
+        estatística é 'estimate' (dados completos), 'lower' ou 'upper'
+    """
+    arrays, groups = player_arrays(players, sessions, purchases, by=by, max_day=max_day)
+    days = pd.RangeIndex(max_day + 1, name='day')
+
+    rates, arpdau = aggregate(arrays)
+    estimate = _metrics(rates[None], arpdau[None], days, horizons, retention_days)
+    replicate_rates, replicate_arpdau = bootstrap_replicates(arrays, n_replicates, seed=seed, workers=workers)
+    replicates = _metrics(replicate_rates, replicate_arpdau, days, horizons, retention_days)
+
+    alpha = (1.0 - confidence) / 2.0
+    columns = {}
+    for metric, values in replicates.items():
+        lower, upper = np.nanpercentile(values, [100 * alpha, 100 * (1 - alpha)], axis=0)
+        columns[(metric, 'estimate')] = estimate[metric][0]
+        columns[(metric, 'lower')] = lower
+        columns[(metric, 'upper')] = upper
+    return pd.DataFrame(columns, index=groups)
+
+
+def _metrics(rates: np.ndarray, arpdau: np.ndarray, days: pd.RangeIndex,
+             horizons: Sequence[int], retention_days: Sequence[int]) -> Dict[str, np.ndarray]:
+    """LTV, retenção e ARPDAU de um lote de réplicas (réplicas × grupos cada)"""
+    n_replicates, n_groups, width = rates.shape
+    # Todas as réplicas de todos os grupos num único ajuste vetorizado
+    retention = pd.DataFrame(rates.reshape(-1, width), columns=days)
+    forecast = forecast_ltv(retention, pd.Series(arpdau.reshape(-1)), horizons=horizons,
+                            cache=ParameterCache(maxsize=1))
+    metrics = {f'ltv_d{h}': forecast[f'ltv_d{h}'].to_numpy().reshape(n_replicates, n_groups) for h in horizons}
+    metrics.update({f'retention_d{d}': rates[:, :, d] for d in retention_days})
+    metrics['arpdau'] = arpdau
+    return metrics
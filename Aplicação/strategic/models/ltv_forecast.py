@@ -0,0 +1,347 @@
+# strategic/models/ltv_forecast.py
+"""
+Previsão de LTV por coorte/segmento: curva de retenção × ARPDAU
+
+Para cada linha (coorte, segmento ou coorte × segmento) a retenção observada
+é ajustada por uma lei de potência r(t) = a · t^(-b) (t >= 1, r(0) = 1) e o
+LTV até o dia D é o ARPDAU vezes os dias ativos esperados nesse período:
+
+    LTV(D) = ARPDAU · (1 + a · Σ_{t=1}^{D-1} t^(-b))
+
+Tudo é vetorizado: os ajustes de todas as linhas saem de uma regressão
+log-log em forma fechada (somas por linha, sem laços em Python nem SciPy) e
+as somas da curva até D90/D180/D365 usam os primeiros dias exatos mais a
+fórmula de Euler–Maclaurin para a cauda, sem materializar linhas × 365 dias.
+Os parâmetros ajustados ficam em cache pelo hash dos dados de entrada.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HORIZONS = (90, 180, 365)
+# Dias da curva somados termo a termo antes da aproximação da cauda
+EXACT_HEAD_DAYS = 30
+
+
+def data_hash(retention: pd.DataFrame) -> str:
+    """Hash do conteúdo da matriz de retenção (valores, dias e índice)"""
+    # sha1 por ser o mais rápido do hashlib aqui; a chave não tem uso de segurança
+    digest = hashlib.sha1(usedforsecurity=False)
+    digest.update(memoryview(np.ascontiguousarray(retention.to_numpy(dtype=np.float64))))
+    digest.update(np.asarray(retention.columns, dtype=np.float64).tobytes())
+    digest.update(pd.util.hash_pandas_object(retention.index).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ParameterCache:
+    """
+    Parâmetros ajustados (a, b por linha) guardados pelo hash dos dados
+
+    LRU em memória: recalcular a previsão para outros horizontes ou outro
+    ARPDAU reaproveita o ajuste enquanto a retenção não mudar.
+
+    Args:
+        maxsize: Quantos conjuntos de parâmetros manter
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            params = self._entries.get(key)
+            if params is None:
+                self._stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return params
+
+    def set(self, key: str, params: pd.DataFrame):
+        with self._lock:
+            self._entries[key] = params
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, 'entries': len(self._entries)}
+
+
+def _least_squares(x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reta y = c + m·x por linha usando só as células de `mask` (forma fechada)"""
+    w = mask.astype(np.float64)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+    n = w.sum(axis=1)
+    sx, sy = (w * x).sum(axis=1), (w * y).sum(axis=1)
+    sxx, sxy = (w * x * x).sum(axis=1), (w * x * y).sum(axis=1)
+    denominator = n * sxx - sx * sx
+    solvable = (n >= 2) & (denominator > 1e-12)
+    slope = np.divide(n * sxy - sx * sy, denominator, out=np.zeros_like(n), where=solvable)
+    intercept = np.divide(sy - slope * sx, n, out=np.zeros_like(n), where=n > 0)
+    return intercept, slope, n.astype(np.int64) * solvable
+
+
+def fit_power_law(retention: pd.DataFrame, min_points: int = 2) -> pd.DataFrame:
+    """
+    Ajusta r(t) = a · t^(-b) em todas as linhas de uma vez
+
+    Dias < 1, NaN (dias ainda não vividos) e retenção zero ficam fora do
+    ajuste. Linhas com menos de `min_points` pontos válidos recebem o ajuste
+    da curva média de todas as linhas (fallback=True). `a` é limitado a
+    [0, 1] e `b` a >= 0 (curva nunca crescente).
+
+    Args:
+        retention: Linhas × dias desde o install (colunas numéricas), taxas de 0 a 1
+
+    Returns:
+        DataFrame com o mesmo índice e as colunas a, b, fit_points e fallback
+    """
+    days = np.asarray(retention.columns, dtype=np.float64)
+    rates = retention.to_numpy(dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_days = np.log(days)
+        log_rates = np.log(rates)
+    valid = (days >= 1)[None, :] & np.isfinite(log_rates)
+
+    intercept, slope, points = _least_squares(np.broadcast_to(log_days, rates.shape), log_rates, valid)
+    fallback = points < min_points
+
+    if fallback.any():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pooled = np.where(valid, rates, 0.0).sum(axis=0) / valid.sum(axis=0)
+            pooled_log = np.log(pooled)
+        pooled_valid = (days >= 1) & np.isfinite(pooled_log)
+        p_intercept, p_slope, _ = _least_squares(log_days[None, :], pooled_log[None, :], pooled_valid[None, :])
+        intercept = np.where(fallback, p_intercept[0], intercept)
+        slope = np.where(fallback, p_slope[0], slope)
+
+    return pd.DataFrame({
+        'a': np.clip(np.exp(intercept), 0.0, 1.0),
+        'b': np.maximum(-slope, 0.0),
+        'fit_points': points,
+        'fallback': fallback,
+    }, index=retention.index)
+
+
+def fitted_parameters(retention: pd.DataFrame, min_points: int = 2,
+                      cache: Optional[ParameterCache] = None) -> pd.DataFrame:
+    """fit_power_law com cache pelo hash da matriz (padrão: fit_cache do módulo)"""
+    cache = cache if cache is not None else fit_cache
+    key = f"{data_hash(retention)}:{min_points}"
+    params = cache.get(key)
+    if params is None:
+        params = fit_power_law(retention, min_points=min_points)
+        cache.set(key, params)
+        logger.info(f"📐 Curvas de retenção ajustadas: {len(params)} linhas")
+    return params
+
+
+def power_sums(b: np.ndarray, last_days: Iterable[int], head: int = EXACT_HEAD_DAYS) -> Dict[int, np.ndarray]:
+    """
+    Σ_{t=1}^{último dia} t^(-b) para cada b e cada último dia
+
+    Os primeiros `head` termos são somados exatamente (uma vez para todos os
+    horizontes); o resto usa Euler–Maclaurin (integral + média das pontas +
+    correção da derivada), com erro desprezível a partir do dia 30 para
+    qualquer b >= 0.
+    """
+    b = np.atleast_1d(np.asarray(b, dtype=np.float64))
+    last_days = list(last_days)
+    head = max(0, min(head, max(last_days, default=0)))
+    t = np.arange(1, head + 1, dtype=np.float64)
+    head_sums = np.exp(-b[:, None] * np.log(t)[None, :]).cumsum(axis=1)
+
+    sums = {}
+    for last_day in last_days:
+        if last_day < 1:
+            sums[last_day] = np.zeros_like(b)
+        elif last_day <= head:
+            sums[last_day] = head_sums[:, last_day - 1]
+        else:
+            m, n = float(head + 1), float(last_day)
+            one_minus_b = 1.0 - b
+            near_one = np.abs(one_minus_b) < 1e-9
+            safe = np.where(near_one, 1.0, one_minus_b)
+            integral = np.where(near_one, np.log(n / m), (n ** safe - m ** safe) / safe)
+            ends = (m ** -b + n ** -b) / 2.0
+            derivative = (b * m ** (-b - 1.0) - b * n ** (-b - 1.0)) / 12.0
+            sums[last_day] = (head_sums[:, -1] if head else 0.0) + integral + ends + derivative
+    return sums
+
+
+def expected_active_days(params: pd.DataFrame, horizons: Iterable[int]) -> Dict[int, np.ndarray]:
+    """Dias ativos esperados nos primeiros `horizonte` dias (dia 0 conta como 1), por horizonte"""
+    a = params['a'].to_numpy(dtype=np.float64)
+    horizons = list(horizons)
+    sums = power_sums(params['b'].to_numpy(dtype=np.float64), [h - 1 for h in horizons])
+    return {h: (1.0 + a * sums[h - 1]) if h > 0 else np.zeros_like(a) for h in horizons}
+
+
+def forecast_ltv(retention: pd.DataFrame, arpdau: Union[pd.Series, float],
+                 horizons: Sequence[int] = DEFAULT_HORIZONS, min_points: int = 2,
+                 cache: Optional[ParameterCache] = None) -> pd.DataFrame:
+    """
+    LTV previsto por linha para cada horizonte
+
+    Args:
+        retention: Linhas × dias (ex.: build_retention_matrix do cohort_engine,
+            ou ltv_inputs para coorte × segmento), NaN nos dias não observados
+        arpdau: Receita por dia ativo, por linha (Series alinhada ao índice) ou única
+        horizons: Dias do LTV (90 = receita esperada nos dias 0..89)
+        min_points: Pontos mínimos para um ajuste próprio da linha
+        cache: Cache dos parâmetros (padrão: fit_cache do módulo)
+
+    Returns:
+        DataFrame com a, b, fit_points, fallback, arpdau e ltv_d{horizonte}
+    """
+    params = fitted_parameters(retention, min_points=min_points, cache=cache)
+    if isinstance(arpdau, pd.Series):
+        arpdau_values = arpdau.reindex(retention.index).to_numpy(dtype=np.float64)
+    else:
+        arpdau_values = np.full(len(retention), float(arpdau))
+
+    forecast = params.copy()
+    forecast['arpdau'] = arpdau_values
+    for horizon, active_days in expected_active_days(params, horizons).items():
+        forecast[f'ltv_d{horizon}'] = arpdau_values * active_days
+    return forecast
+
+
+def player_arrays(players: pd.DataFrame, sessions: pd.DataFrame, purchases: pd.DataFrame,
+                  by: Iterable[str] = ('install_date',), max_day: int = 30,
+                  observation_end: Optional[pd.Timestamp] = None) -> Tuple[Dict[str, np.ndarray], pd.Index]:
+    """
+    Arrays por jogador, ordenados por grupo, de onde saem retenção e ARPDAU
+
+    É a forma compartilhada com o bootstrap (reamostragem = pesos por
+    jogador sobre estes mesmos arrays).
+
+    Args:
+        players: player_id, install_date e as colunas de `by`
+        sessions: player_id, session_date (uma linha por sessão)
+        purchases: player_id, value
+        by: Colunas de players que definem os grupos
+        max_day: Último dia desde o install na matriz
+        observation_end: Último dia com dados (padrão: última sessão)
+
+    Returns:
+        ({'group': grupo de cada jogador, 'bounds': início/fim de cada grupo,
+          'activity': jogador × dia 0..max_day (1 = ativo), 'age': último dia
+          vivido até o fim da observação (-1 se nenhum), 'revenue': receita,
+          'active_days': dias ativos no total}, grupos)
+    """
+    by = list(by)
+    width = max_day + 1
+    grouped = players.groupby(by, sort=True, observed=True, dropna=False)
+    group_codes = grouped.ngroup().to_numpy(dtype=np.int64)
+    groups = grouped.size().index
+    order = np.argsort(group_codes, kind='stable')
+    group_codes = group_codes[order]
+    index = pd.Index(players['player_id'].to_numpy()[order])
+    install = pd.to_datetime(players['install_date']).dt.normalize().to_numpy()[order]
+    n_players = len(index)
+
+    session_player = index.get_indexer(sessions['player_id'])
+    known = session_player >= 0
+    session_player = session_player[known]
+    session_day = pd.to_datetime(sessions['session_date']).dt.normalize().to_numpy()[known]
+    if observation_end is None:
+        observation_end = session_day.max() if len(session_day) else pd.Timestamp.now()
+    days = ((session_day - install[session_player]) // np.timedelta64(1, 'D')).astype(np.int64)
+
+    # Pares (jogador, dia) únicos: atividade na janela e dias ativos no total
+    after_install = days >= 0
+    stride = int(days[after_install].max()) + 1 if after_install.any() else 1
+    active = np.unique(session_player[after_install].astype(np.int64) * stride + days[after_install])
+    active_players, active_days = np.divmod(active, stride)
+    activity = np.zeros((n_players, width), dtype=np.float32)
+    in_window = active_days <= max_day
+    activity[active_players[in_window], active_days[in_window]] = 1.0
+
+    age = (np.datetime64(pd.Timestamp(observation_end).normalize()) - install) // np.timedelta64(1, 'D')
+    purchase_player = index.get_indexer(purchases['player_id'])
+    paid = purchase_player >= 0
+
+    arrays = {
+        'group': group_codes,
+        'bounds': np.concatenate([[0], np.cumsum(np.bincount(group_codes, minlength=len(groups)))]),
+        'activity': activity,
+        'age': np.clip(age.astype(np.int64), -1, max_day),
+        'revenue': np.bincount(purchase_player[paid], weights=purchases['value'].to_numpy(dtype=np.float64)[paid],
+                               minlength=n_players),
+        'active_days': np.bincount(active_players, minlength=n_players).astype(np.float64),
+    }
+    return arrays, groups
+
+
+def aggregate(arrays: Dict[str, np.ndarray], weights: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Retenção (grupos × dias) e ARPDAU por grupo, com pesos opcionais por jogador
+
+    Cada jogador conta no denominador do dia d só se já viveu d dias até o
+    fim da observação, então grupos que misturam coortes de idades
+    diferentes (ex.: só segmento) não tratam dias futuros como churn.
+
+    Args:
+        arrays: Saída de player_arrays
+        weights: Peso de cada jogador (ex.: contagens de uma reamostragem); padrão 1
+    """
+    activity, group, bounds, age = arrays['activity'], arrays['group'], arrays['bounds'], arrays['age']
+    n_groups, width = len(bounds) - 1, activity.shape[1]
+    weights = np.ones(len(group), dtype=np.float32) if weights is None else weights.astype(np.float32, copy=False)
+
+    # Grupos são fatias contíguas: um produto matriz-vetor (BLAS) por grupo
+    retained = np.zeros((n_groups, width))
+    for g, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        retained[g] = weights[start:end] @ activity[start:end]
+
+    lived = age >= 0
+    by_age = np.bincount(group[lived] * width + age[lived], weights=weights[lived],
+                         minlength=n_groups * width).reshape(n_groups, width)
+    eligible = by_age[:, ::-1].cumsum(axis=1)[:, ::-1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rates = np.where(eligible > 0, retained / eligible, np.nan)
+
+    revenue = np.bincount(group, weights=weights * arrays['revenue'], minlength=n_groups)
+    player_days = np.bincount(group, weights=weights * arrays['active_days'], minlength=n_groups)
+    arpdau = np.divide(revenue, player_days, out=np.zeros(n_groups), where=player_days > 0)
+    return rates, arpdau
+
+
+def ltv_inputs(players: pd.DataFrame, sessions: pd.DataFrame, purchases: pd.DataFrame,
+               by: Iterable[str] = ('install_date',), max_day: int = 30,
+               observation_end: Optional[pd.Timestamp] = None) -> Tuple[pd.DataFrame, pd.Series]:
+    """
+    Retenção e ARPDAU por grupo (coorte, segmento ou ambos) a partir dos dados brutos
+
+    Args: ver player_arrays
+
+    Returns:
+        (retenção grupos × dias 0..max_day, ARPDAU por grupo)
+    """
+    arrays, groups = player_arrays(players, sessions, purchases, by=by, max_day=max_day,
+                                   observation_end=observation_end)
+    rates, arpdau = aggregate(arrays)
+    retention = pd.DataFrame(rates, index=groups, columns=pd.RangeIndex(max_day + 1, name='day'))
+    return retention, pd.Series(arpdau, index=groups, name='arpdau')
+
+
+# Cache global do processo para os ajustes
+fit_cache = ParameterCache()
@@ -0,0 +1,284 @@
+# strategic/reports/daily_aggregates.py
+"""
+Agregados diários materializados para os relatórios de negócio
+
+Uma única varredura das linhas brutas (jogadores, sessões, compras) gera três
+tabelas pequenas, gravadas em Parquet particionado por mês:
+
+    daily     (date, segment)          dau, installs, revenue, transactions, payers
+    monthly   (month, segment)         mau, payers (únicos no mês)
+    cohorts   (install_date, segment)  players, active_d1/d7/d30,
+                                       converted_d7/d30, revenue_d30
+
+Contagens de únicos não se somam entre dias, por isso MAU e pagantes do mês
+têm a tabela própria. As coortes ficam no grão diário para que cada relatório
+aplique a sua data de corte (só entram no D30 as coortes com 30 dias vividos).
+
+Os dados brutos podem vir em blocos com jogadores disjuntos (como os de
+synthetic_data.write_dataset): todas as contagens, inclusive de únicos, se
+somam entre blocos, então a materialização roda em memória limitada.
+"""
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from operational.utils.paths import AGGREGATES_DIR
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = (1, 7, 30)
+CONVERSION_DAYS = (7, 30)
+# Janela da receita por coorte (revenue_d30)
+REVENUE_DAYS = 30
+
+TABLES = ('daily', 'monthly', 'cohorts')
+KEYS = {'daily': ['date', 'segment'], 'monthly': ['month', 'segment'], 'cohorts': ['install_date', 'segment']}
+
+
+def _days(values: pd.Series) -> np.ndarray:
+    """Datas como número de dias desde 1970-01-01"""
+    return pd.to_datetime(values).to_numpy().astype('datetime64[D]').astype(np.int64)
+
+
+def _months(days: np.ndarray) -> np.ndarray:
+    """Dias (desde 1970) → meses (desde 1970-01)"""
+    return days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+
+
+def _count(keys: Dict[str, np.ndarray], name: str, weights: Optional[np.ndarray] = None) -> pd.Series:
+    """Contagem (ou soma de weights) por combinação das chaves"""
+    frame = pd.DataFrame(keys)
+    if weights is None:
+        return frame.groupby(list(keys), sort=False).size().rename(name)
+    return frame.assign(**{name: weights}).groupby(list(keys), sort=False)[name].sum()
+
+
+def _table(series: List[pd.Series], table: str, segments: np.ndarray) -> pd.DataFrame:
+    """Junta as contagens de uma tabela com chaves legíveis (datas e nomes de segmento)"""
+    frame = pd.concat(series, axis=1).fillna(0)
+    frame.index.names = ['key', 'segment']
+    frame = frame.reset_index()
+    key = KEYS[table][0]
+    if table == 'monthly':
+        frame[key] = frame.pop('key').to_numpy().astype('datetime64[M]').astype('datetime64[ns]')
+    else:
+        frame[key] = frame.pop('key').to_numpy().astype('datetime64[D]').astype('datetime64[ns]')
+    frame['segment'] = segments[frame['segment'].to_numpy()]
+    return frame.set_index(KEYS[table])
+
+
+def aggregate_chunk(players: pd.DataFrame, sessions: pd.DataFrame, purchases: pd.DataFrame,
+                    start_date: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Agregados de um bloco de jogadores
+
+    Args:
+        players: player_id, install_date e segment (opcional)
+        sessions: player_id, session_date
+        purchases: player_id, value e purchase_date (ou day, dias desde start_date)
+        start_date: Início da janela de observação, para compras só com 'day'
+
+    Returns:
+        {'daily', 'monthly', 'cohorts'} indexados pelas chaves de KEYS
+    """
+    # Datas em branco (NaT) virariam dias absurdos: as linhas ficam de fora,
+    # e sessões e compras de jogadores sem install não são reconhecidas
+    blank = {
+        'players': pd.to_datetime(players['install_date']).isna(),
+        'sessions': pd.to_datetime(sessions['session_date']).isna(),
+        'purchases': (pd.to_datetime(purchases['purchase_date']) if 'purchase_date' in purchases
+                      else purchases['day']).isna(),
+    }
+    dropped = {name: int(mask.sum()) for name, mask in blank.items() if mask.any()}
+    if dropped:
+        logger.warning(f"⚠️ Linhas sem data ignoradas: {dropped}")
+        players, sessions, purchases = (players[~blank['players']], sessions[~blank['sessions']],
+                                        purchases[~blank['purchases']])
+
+    index = pd.Index(players['player_id'].to_numpy())
+    segment = players['segment'].astype(str).to_numpy() if 'segment' in players else np.full(len(players), 'all')
+    segments, player_segment = np.unique(segment, return_inverse=True)
+    install = _days(players['install_date'])
+
+    # Dias ativos únicos por jogador
+    session_player = index.get_indexer(sessions['player_id'])
+    known = session_player >= 0
+    active = pd.DataFrame({'player': session_player[known],
+                           'day': _days(sessions['session_date'])[known]}).drop_duplicates()
+    player, day = active['player'].to_numpy(), active['day'].to_numpy()
+    seg = player_segment[player]
+    since = day - install[player]
+
+    # Compras com data e dias desde o install
+    purchase_player = index.get_indexer(purchases['player_id'])
+    paid = purchase_player >= 0
+    if 'purchase_date' in purchases:
+        purchase_day = _days(purchases['purchase_date'])[paid]
+    else:
+        if start_date is None:
+            raise ValueError("Compras sem purchase_date precisam de start_date (início da coluna 'day')")
+        purchase_day = _days(pd.Series(pd.Timestamp(start_date))).item() + purchases['day'].to_numpy(dtype=np.int64)[paid]
+    purchase_player = purchase_player[paid]
+    value = purchases['value'].to_numpy(dtype=np.float64)[paid]
+    purchase_seg = player_segment[purchase_player]
+    purchase_since = purchase_day - install[purchase_player]
+    payer_days = pd.DataFrame({'player': purchase_player, 'day': purchase_day}).drop_duplicates()
+    payer_seg = player_segment[payer_days['player'].to_numpy()]
+
+    daily = _table([
+        _count({'key': day, 'segment': seg}, 'dau'),
+        _count({'key': install, 'segment': player_segment}, 'installs'),
+        _count({'key': purchase_day, 'segment': purchase_seg}, 'revenue', value),
+        _count({'key': purchase_day, 'segment': purchase_seg}, 'transactions'),
+        _count({'key': payer_days['day'].to_numpy(), 'segment': payer_seg}, 'payers'),
+    ], 'daily', segments)
+
+    active_months = pd.DataFrame({'player': player, 'month': _months(day)}).drop_duplicates()
+    payer_months = pd.DataFrame({'player': purchase_player, 'month': _months(purchase_day)}).drop_duplicates()
+    monthly = _table([
+        _count({'key': active_months['month'].to_numpy(),
+                'segment': player_segment[active_months['player'].to_numpy()]}, 'mau'),
+        _count({'key': payer_months['month'].to_numpy(),
+                'segment': player_segment[payer_months['player'].to_numpy()]}, 'payers'),
+    ], 'monthly', segments)
+
+    # Primeira compra de cada jogador (dias desde o install)
+    first_purchase = np.full(len(index), np.iinfo(np.int64).max)
+    after = purchase_since >= 0
+    np.minimum.at(first_purchase, purchase_player[after], purchase_since[after])
+    cohort_series = [_count({'key': install, 'segment': player_segment}, 'players')]
+    for d in RETENTION_DAYS:
+        on_day = since == d
+        cohort_series.append(_count({'key': install[player[on_day]], 'segment': seg[on_day]}, f'active_d{d}'))
+    for d in CONVERSION_DAYS:
+        converted = first_purchase <= d
+        cohort_series.append(_count({'key': install[converted], 'segment': player_segment[converted]},
+                                    f'converted_d{d}'))
+    early = after & (purchase_since <= REVENUE_DAYS)
+    cohort_series.append(_count({'key': install[purchase_player[early]], 'segment': purchase_seg[early]},
+                                f'revenue_d{REVENUE_DAYS}', value[early]))
+    cohorts = _table(cohort_series, 'cohorts', segments)
+
+    return {'daily': daily, 'monthly': monthly, 'cohorts': cohorts,
+            'observation': (int(day.min()) if len(day) else None, int(day.max()) if len(day) else None)}
+
+
+def combine(chunks: Iterable[Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    """Soma os agregados de blocos com jogadores disjuntos"""
+    parts = {table: [] for table in TABLES}
+    first, last = [], []
+    for chunk in chunks:
+        for table in TABLES:
+            parts[table].append(chunk[table])
+        start, end = chunk['observation']
+        if start is not None:
+            first.append(start)
+            last.append(end)
+    combined = {}
+    for table, frames in parts.items():
+        frame = pd.concat(frames).groupby(level=KEYS[table]).sum() if frames else pd.DataFrame()
+        # Contagens voltam a inteiros (a soma de blocos passa por float com os NaN das junções)
+        counts = [column for column in frame.columns if not column.startswith('revenue')]
+        combined[table] = frame.astype({column: np.int64 for column in counts}).sort_index()
+    combined['observation'] = (min(first) if first else None, max(last) if last else None)
+    return combined
+
+
+def _partition_months(frame: pd.DataFrame, table: str) -> pd.Series:
+    return frame.index.get_level_values(KEYS[table][0]).to_period('M').astype(str)
+
+
+def _swap(staging: Path, target: Path):
+    """Troca o diretório target pelo staging já completo"""
+    old = target.with_name(f".{target.name}.{os.getpid()}.old")
+    if target.exists():
+        os.replace(target, old)
+    os.replace(staging, target)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def materialize(chunks: Iterable[Dict[str, pd.DataFrame]], directory: Path = AGGREGATES_DIR,
+                start_date: Optional[str] = None) -> Dict[str, object]:
+    """
+    Agrega os blocos brutos e grava as tabelas particionadas por mês
+
+    Estrutura: directory/{daily,monthly,cohorts}/YYYY-MM.parquet e meta.json
+    (janela de observação e meses disponíveis). Cada tabela é gravada num
+    diretório temporário que substitui o anterior inteiro, então não sobram
+    partições de uma materialização antiga; o meta.json vai por último.
+
+    Args:
+        chunks: Blocos {'players', 'sessions', 'purchases'} com jogadores disjuntos
+        directory: Destino dos agregados
+        start_date: Ver aggregate_chunk
+
+    Returns:
+        Metadados gravados
+    """
+    start = time.perf_counter()
+    directory = Path(directory)
+    n_chunks = 0
+
+    def aggregated():
+        nonlocal n_chunks
+        for chunk in chunks:
+            n_chunks += 1
+            yield aggregate_chunk(chunk['players'], chunk['sessions'], chunk['purchases'], start_date=start_date)
+
+    combined = combine(aggregated())
+    months = set()
+    for table in TABLES:
+        frame = combined[table]
+        staging = directory / f".{table}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        for month, part in frame.groupby(_partition_months(frame, table).to_numpy()):
+            part.reset_index().to_parquet(staging / f"{month}.parquet", index=False)
+            months.add(month)
+        _swap(staging, directory / table)
+
+    first, last = combined['observation']
+    meta = {
+        'observation_start': str(np.datetime64(first, 'D')) if first is not None else None,
+        'observation_end': str(np.datetime64(last, 'D')) if last is not None else None,
+        'months': sorted(months),
+        'rows': {table: len(combined[table]) for table in TABLES},
+        'created_at': time.time(),
+    }
+    tmp = directory / f"meta.json.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp, directory / 'meta.json')
+    logger.info(f"🧱 Agregados de {n_chunks} bloco(s) materializados em {time.perf_counter() - start:.2f}s "
+                f"({len(meta['months'])} meses em {directory})")
+    return meta
+
+
+def read_meta(directory: Path = AGGREGATES_DIR) -> Dict[str, object]:
+    """Metadados da última materialização"""
+    path = Path(directory) / 'meta.json'
+    if not path.exists():
+        raise FileNotFoundError(f"Agregados não materializados em {directory}")
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load(table: str, months: Sequence[str], directory: Path = AGGREGATES_DIR) -> pd.DataFrame:
+    """
+    Lê só as partições de `months` (YYYY-MM) de uma tabela
+
+    Meses sem partição (sem dados) são ignorados.
+    """
+    paths = [Path(directory) / table / f"{month}.parquet" for month in months]
+    frames = [pd.read_parquet(path) for path in paths if path.exists()]
+    if not frames:
+        columns = KEYS[table]
+        return pd.DataFrame(columns=columns).set_index(columns)
+    return pd.concat(frames, ignore_index=True).set_index(KEYS[table]).sort_index()
@@ -0,0 +1,482 @@
+# strategic/reports/monthly_business_report.py
+"""
+Relatório mensal de negócio: pacote de KPIs em HTML, PDF e XLSX
+
+O relatório de um mês lê só as partições materializadas por daily_aggregates
+(o mês, o anterior para a variação e os meses das coortes exibidas), nunca as
+linhas brutas:
+
+    Resumo      receita, DAU médio, MAU, DAU/MAU, ARPDAU, pagantes, conversão
+                e ARPPU por segmento e no total, com variação da receita
+    Diário      DAU, receita e ARPDAU de cada dia
+    Coortes     retenção D1/D7/D30, conversão D7/D30 e ARPU D30 das coortes
+                mensais (últimos COHORT_MONTHS meses), por segmento
+
+Só entram numa métrica de coorte os installs que já viveram os dias dela na
+data de corte do relatório (fim do mês ou fim dos dados). Os gráficos usam a
+API orientada a objetos do matplotlib (sem pyplot), então vários relatórios
+podem ser gerados em paralelo, um processo por mês.
+
+Uso:
+    python -m strategic.reports.monthly_business_report --dataset data/raw/synthetic --months 24
+"""
+import argparse
+import base64
+import io
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.dates import MO, DateFormatter, WeekdayLocator
+from matplotlib.figure import Figure
+
+from operational.utils.paths import AGGREGATES_DIR, REPORTS_DIR
+from strategic.reports.daily_aggregates import (
+    CONVERSION_DAYS, RETENTION_DAYS, REVENUE_DAYS, load, materialize, read_meta
+)
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('html', 'pdf', 'xlsx')
+# Coortes mensais exibidas (o mês do relatório e os anteriores)
+COHORT_MONTHS = 6
+TOTAL = 'Total'
+
+LABELS = {
+    'revenue': 'Receita', 'transactions': 'Transações', 'installs': 'Installs', 'avg_dau': 'DAU médio',
+    'mau': 'MAU', 'stickiness': 'DAU/MAU', 'arpdau': 'ARPDAU', 'payers': 'Pagantes',
+    'payer_conversion': 'Conversão', 'arppu': 'ARPPU', 'dau': 'DAU', 'players': 'Jogadores',
+    'revenue_mom': 'Receita vs. mês anterior',
+    **{f'retention_d{d}': f'Retenção D{d}' for d in RETENTION_DAYS},
+    **{f'conversion_d{d}': f'Conversão D{d}' for d in CONVERSION_DAYS},
+    f'arpu_d{REVENUE_DAYS}': f'ARPU D{REVENUE_DAYS}',
+}
+INDEX_LABELS = {'segment': 'Segmento', 'cohort': 'Coorte', 'date': 'Data'}
+MONEY = {'revenue', 'arpdau', 'arppu', f'arpu_d{REVENUE_DAYS}'}
+PERCENT = {'stickiness', 'payer_conversion', 'revenue_mom',
+           *(f'retention_d{d}' for d in RETENTION_DAYS), *(f'conversion_d{d}' for d in CONVERSION_DAYS)}
+
+
+def _ratio(numerator, denominator):
+    """Divisão com NaN onde o denominador é zero"""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.full(np.broadcast(numerator, denominator).shape, np.nan),
+                     where=denominator != 0)
+
+
+# ---- KPIs -----------------------------------------------------------------
+
+def _segment_summary(current: pd.DataFrame, monthly: pd.DataFrame) -> pd.DataFrame:
+    """KPIs do mês por segmento e no total"""
+    n_days = current.index.get_level_values('date').nunique()
+    daily = current.groupby(level='segment').sum()
+    uniques = monthly.groupby(level='segment').sum()
+    frame = daily.drop(columns='payers').join(uniques, how='outer').fillna(0)
+    frame.loc[TOTAL] = frame.sum()
+    return pd.DataFrame({
+        'revenue': frame['revenue'],
+        'transactions': frame['transactions'],
+        'installs': frame['installs'],
+        'avg_dau': frame['dau'] / max(n_days, 1),
+        'mau': frame['mau'],
+        'stickiness': _ratio(frame['dau'] / max(n_days, 1), frame['mau']),
+        'arpdau': _ratio(frame['revenue'], frame['dau']),
+        'payers': frame['payers'],
+        'payer_conversion': _ratio(frame['payers'], frame['mau']),
+        'arppu': _ratio(frame['revenue'], frame['payers']),
+    }, index=frame.index)
+
+
+def _cohort_summary(cohorts: pd.DataFrame, as_of: pd.Timestamp) -> pd.DataFrame:
+    """Retenção, conversão e ARPU por coorte mensal × segmento, só com installs elegíveis"""
+    install = cohorts.index.get_level_values('install_date')
+    cohorts = cohorts[install <= as_of]
+    install = cohorts.index.get_level_values('install_date')
+    age = ((as_of - install) // pd.Timedelta(days=1)).to_numpy()
+
+    columns = {'players': cohorts['players'].to_numpy(dtype=np.float64)}
+    metrics = [(f'retention_d{d}', f'active_d{d}', d) for d in RETENTION_DAYS]
+    metrics += [(f'conversion_d{d}', f'converted_d{d}', d) for d in CONVERSION_DAYS]
+    metrics += [(f'arpu_d{REVENUE_DAYS}', f'revenue_d{REVENUE_DAYS}', REVENUE_DAYS)]
+    for name, source, days in metrics:
+        eligible = age >= days
+        columns[f'{name}_num'] = np.where(eligible, cohorts[source].to_numpy(dtype=np.float64), 0.0)
+        columns[f'{name}_den'] = np.where(eligible, columns['players'], 0.0)
+    sums = pd.DataFrame(columns, index=pd.MultiIndex.from_arrays(
+        [install.to_period('M').astype(str), cohorts.index.get_level_values('segment')],
+        names=['cohort', 'segment']))
+
+    by_segment = sums.groupby(level=['cohort', 'segment']).sum()
+    total = sums.groupby(level='cohort').sum()
+    total.index = pd.MultiIndex.from_arrays([total.index, [TOTAL] * len(total)], names=['cohort', 'segment'])
+    sums = pd.concat([by_segment, total]).sort_index()
+
+    result = pd.DataFrame({'players': sums['players']}, index=sums.index)
+    for name, _, _ in metrics:
+        result[name] = _ratio(sums[f'{name}_num'], sums[f'{name}_den'])
+    return result
+
+
+def build_report(month: str, directory: Path = AGGREGATES_DIR, cohort_months: int = COHORT_MONTHS) -> Dict[str, Any]:
+    """
+    Monta o pacote de KPIs de um mês a partir dos agregados materializados
+
+    Args:
+        month: Mês do relatório (YYYY-MM)
+        directory: Diretório dos agregados (daily_aggregates.materialize)
+        cohort_months: Coortes mensais exibidas
+
+    Returns:
+        {'month', 'as_of' (data de corte), 'kpis' (totais do mês),
+         'segments' (KPIs por segmento), 'daily' (série diária),
+         'cohorts' (coorte × segmento)}
+    """
+    period = pd.Period(month, 'M')
+    meta = read_meta(directory)
+    as_of = min(period.end_time.normalize(), pd.Timestamp(meta['observation_end']))
+
+    daily = load('daily', [str(period - 1), str(period)], directory)
+    monthly = load('monthly', [str(period)], directory)
+    cohorts = load('cohorts', [str(period - i) for i in range(cohort_months - 1, -1, -1)], directory)
+
+    months = daily.index.get_level_values('date').to_period('M')
+    current, previous = daily[months == period], daily[months == period - 1]
+    segments = _segment_summary(current, monthly)
+
+    series = current.groupby(level='date')[['dau', 'revenue']].sum()
+    series['arpdau'] = _ratio(series['revenue'], series['dau'])
+
+    kpis = segments.loc[TOTAL].to_dict() if TOTAL in segments.index else {}
+    previous_revenue = previous['revenue'].sum()
+    kpis['revenue_mom'] = kpis.get('revenue', 0.0) / previous_revenue - 1 if previous_revenue else np.nan
+
+    return {
+        'month': str(period),
+        'as_of': as_of,
+        'kpis': kpis,
+        'segments': segments,
+        'daily': series,
+        'cohorts': _cohort_summary(cohorts, as_of),
+    }
+
+
+# ---- Renderização -----------------------------------------------------------
+
+def _format_value(column: str, value) -> str:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return '—'
+    if column in MONEY:
+        return f"${value:,.2f}"
+    if column in PERCENT:
+        return f"{value:+.1%}" if column == 'revenue_mom' else f"{value:.1%}"
+    return f"{value:,.0f}"
+
+
+def _formatted(frame: pd.DataFrame) -> pd.DataFrame:
+    """Tabela com valores formatados e rótulos em português"""
+    text = pd.DataFrame({column: [_format_value(column, value) for value in frame[column]]
+                         for column in frame.columns}, index=frame.index)
+    return _labeled(text)
+
+
+def _labeled(frame: pd.DataFrame) -> pd.DataFrame:
+    """Rótulos em português para colunas e níveis do índice"""
+    return frame.rename(columns=LABELS).rename_axis(
+        index=[INDEX_LABELS.get(name, name) for name in frame.index.names])
+
+
+def _figures(report: Dict[str, Any]) -> Dict[str, Figure]:
+    """Gráficos do relatório (compartilhados entre HTML e PDF)"""
+    figures = {}
+
+    # Margens fixas e marcações semanais: o layout automático refaria as
+    # contas de ticks a cada savefig e dominaria o tempo de renderização
+    daily = report['daily']
+    figure = Figure(figsize=(10, 5.5))
+    figure.subplots_adjust(left=0.08, right=0.98, top=0.93, bottom=0.1, hspace=0.3)
+    revenue_ax, dau_ax = figure.subplots(2, 1, sharex=True)
+    revenue_ax.bar(daily.index, daily['revenue'], color='#2E86AB')
+    revenue_ax.set_title('Receita diária')
+    dau_ax.plot(daily.index, daily['dau'], color='#F18F01', marker='o', markersize=3)
+    dau_ax.set_title('DAU')
+    dau_ax.xaxis.set_major_locator(WeekdayLocator(byweekday=MO))
+    dau_ax.xaxis.set_major_formatter(DateFormatter('%d/%m'))
+    figures['daily'] = figure
+
+    cohorts = report['cohorts']
+    totals = cohorts.xs(TOTAL, level='segment') if len(cohorts) else cohorts
+    figure = Figure(figsize=(10, 4))
+    figure.subplots_adjust(left=0.08, right=0.98, top=0.9, bottom=0.1)
+    ax = figure.subplots()
+    width = 0.8 / len(RETENTION_DAYS)
+    positions = np.arange(len(totals))
+    for i, d in enumerate(RETENTION_DAYS):
+        ax.bar(positions + i * width, totals[f'retention_d{d}'].fillna(0), width, label=f'D{d}')
+    ax.set_xticks(positions + width * (len(RETENTION_DAYS) - 1) / 2, totals.index)
+    ax.yaxis.set_major_formatter(lambda value, _: f"{value:.0%}")
+    ax.set_title('Retenção por coorte mensal')
+    ax.legend()
+    figures['retention'] = figure
+
+    segments = report['segments'].drop(index=TOTAL, errors='ignore')
+    figure = Figure(figsize=(10, 3))
+    figure.subplots_adjust(left=0.1, right=0.98, top=0.88, bottom=0.12)
+    ax = figure.subplots()
+    ax.barh(segments.index, segments['revenue'], color='#C73E1D')
+    ax.set_title('Receita por segmento')
+    figures['segments'] = figure
+    return figures
+
+
+def _png(figure: Figure) -> str:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', dpi=110)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: -apple-system, 'Segoe UI', Roboto, sans-serif; margin: 2rem auto; max-width: 1100px; color: #222; }}
+h1 {{ margin-bottom: 0; }}
+.subtitle {{ color: #666; margin-top: 0.2rem; }}
+.cards {{ display: flex; flex-wrap: wrap; gap: 0.8rem; margin: 1.5rem 0; }}
+.card {{ border: 1px solid #ddd; border-radius: 8px; padding: 0.8rem 1rem; min-width: 150px; }}
+.card .label {{ color: #666; font-size: 0.85rem; }}
+.card .value {{ font-size: 1.4rem; font-weight: 600; }}
+table {{ border-collapse: collapse; margin: 1rem 0; font-size: 0.9rem; }}
+th, td {{ border-bottom: 1px solid #eee; padding: 0.35rem 0.7rem; text-align: right; }}
+th {{ background: #f6f6f6; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<p class="subtitle">Dados até {as_of}</p>
+<div class="cards">{cards}</div>
+<h2>Segmentos</h2>
+{segments}
+<img src="data:image/png;base64,{segments_chart}" alt="Receita por segmento">
+<h2>Diário</h2>
+<img src="data:image/png;base64,{daily_chart}" alt="Receita e DAU diários">
+<h2>Coortes</h2>
+<img src="data:image/png;base64,{retention_chart}" alt="Retenção por coorte">
+{cohorts}
+</body>
+</html>
+"""
+
+HEADLINE = ('revenue', 'revenue_mom', 'avg_dau', 'mau', 'stickiness', 'arpdau', 'payer_conversion', 'arppu')
+
+
+def render_html(report: Dict[str, Any], path: Path, figures: Optional[Dict[str, Figure]] = None):
+    """HTML autocontido (gráficos embutidos em base64)"""
+    figures = figures or _figures(report)
+    cards = ''.join(
+        f'<div class="card"><div class="label">{escape(LABELS[key])}</div>'
+        f'<div class="value">{escape(_format_value(key, report["kpis"].get(key)))}</div></div>'
+        for key in HEADLINE
+    )
+    html = HTML_TEMPLATE.format(
+        title=escape(f"Relatório Mensal de Negócio — {report['month']}"),
+        as_of=report['as_of'].strftime('%d/%m/%Y'),
+        cards=cards,
+        segments=_formatted(report['segments']).to_html(),
+        cohorts=_formatted(report['cohorts']).to_html(),
+        segments_chart=_png(figures['segments']),
+        daily_chart=_png(figures['daily']),
+        retention_chart=_png(figures['retention']),
+    )
+    Path(path).write_text(html, encoding='utf-8')
+
+
+def _table_page(title: str, frame: pd.DataFrame) -> Figure:
+    """Página A4 (paisagem) com uma tabela formatada"""
+    figure = Figure(figsize=(11.69, 8.27))
+    ax = figure.subplots()
+    ax.axis('off')
+    ax.set_title(title, fontsize=14, loc='left')
+    text = _formatted(frame)
+    labels = [' / '.join(map(str, key)) if isinstance(key, tuple) else str(key) for key in text.index]
+    if len(text):
+        table = ax.table(cellText=text.to_numpy(), colLabels=list(text.columns), rowLabels=labels,
+                         loc='upper center')
+        table.auto_set_font_size(False)
+        table.set_fontsize(8)
+        table.scale(1, 1.3)
+    return figure
+
+
+def render_pdf(report: Dict[str, Any], path: Path, figures: Optional[Dict[str, Figure]] = None):
+    """PDF com resumo, tabelas e gráficos (uma seção por página)"""
+    figures = figures or _figures(report)
+    kpis = pd.DataFrame({key: [report['kpis'].get(key)] for key in HEADLINE}, index=[report['month']])
+    with PdfPages(path) as pdf:
+        pdf.savefig(_table_page(f"Relatório Mensal de Negócio — {report['month']} "
+                                f"(dados até {report['as_of']:%d/%m/%Y})", kpis))
+        pdf.savefig(_table_page('Segmentos', report['segments']))
+        pdf.savefig(figures['segments'])
+        pdf.savefig(figures['daily'])
+        pdf.savefig(_table_page('Coortes', report['cohorts']))
+        pdf.savefig(figures['retention'])
+
+
+EXCEL_FORMATS = {'money': '"$"#,##0.00', 'percent': '0.0%', 'count': '#,##0'}
+
+
+def render_xlsx(report: Dict[str, Any], path: Path, figures: Optional[Dict[str, Figure]] = None):
+    """Planilha com uma aba por tabela, com formatos de moeda, percentual e contagem"""
+    kpis = pd.DataFrame({'KPI': [LABELS[key] for key in HEADLINE],
+                         'Valor': [report['kpis'].get(key) for key in HEADLINE]})
+    sheets = {
+        'Resumo': (kpis, False),
+        'Segmentos': (report['segments'], True),
+        'Diario': (report['daily'].rename_axis('date'), True),
+        'Coortes': (report['cohorts'], True),
+    }
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for name, (frame, index) in sheets.items():
+            _labeled(frame).to_excel(writer, sheet_name=name, index=index)
+            worksheet = writer.sheets[name]
+            offset = frame.index.nlevels if index else 0
+            for position, column in enumerate(frame.columns):
+                kind = 'money' if column in MONEY else 'percent' if column in PERCENT else 'count'
+                if column in ('KPI', 'Valor'):
+                    continue
+                for cell in worksheet.iter_rows(min_row=2, min_col=offset + position + 1,
+                                                max_col=offset + position + 1):
+                    cell[0].number_format = EXCEL_FORMATS[kind]
+            if name == 'Resumo':
+                for row, key in enumerate(HEADLINE, start=2):
+                    kind = 'money' if key in MONEY else 'percent' if key in PERCENT else 'count'
+                    worksheet.cell(row=row, column=2).number_format = EXCEL_FORMATS[kind]
+            for column_cells in worksheet.columns:
+                width = max(len(str(cell.value)) if cell.value is not None else 0 for cell in column_cells)
+                worksheet.column_dimensions[column_cells[0].column_letter].width = min(max(width + 2, 10), 40)
+
+
+RENDERERS = {'html': render_html, 'pdf': render_pdf, 'xlsx': render_xlsx}
+
+
+# ---- Geração ----------------------------------------------------------------
+
+def generate_report(month: str, formats: Sequence[str] = FORMATS, output_dir: Path = REPORTS_DIR,
+                    directory: Path = AGGREGATES_DIR) -> Dict[str, Path]:
+    """
+    Gera os arquivos do relatório de um mês
+
+    Returns:
+        {formato: caminho} (output_dir/business_report_YYYY-MM.{html,pdf,xlsx})
+    """
+    unknown = set(formats) - set(RENDERERS)
+    if unknown:
+        raise ValueError(f"Formato não suportado: {', '.join(sorted(unknown))}")
+    start = time.perf_counter()
+    report = build_report(month, directory)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # Os gráficos são desenhados uma vez e servem ao HTML e ao PDF
+    figures = _figures(report) if {'html', 'pdf'} & set(formats) else None
+    paths = {}
+    for file_format in formats:
+        path = output_dir / f"business_report_{report['month']}.{file_format}"
+        RENDERERS[file_format](report, path, figures)
+        paths[file_format] = path
+    logger.info(f"📄 Relatório {report['month']} gerado em {time.perf_counter() - start:.2f}s "
+                f"({', '.join(formats)})")
+    return paths
+
+
+def last_complete_month(meta: Dict[str, Any]) -> str:
+    """Último mês com dados até o último dia (ou o último mês, se nenhum estiver completo)"""
+    end = pd.Timestamp(meta['observation_end'])
+    period = end.to_period('M')
+    if end < period.end_time.normalize() and str(period - 1) in meta['months']:
+        period -= 1
+    return str(period)
+
+
+def generate_history(months: int = 24, end_month: Optional[str] = None, formats: Sequence[str] = FORMATS,
+                     output_dir: Path = REPORTS_DIR, directory: Path = AGGREGATES_DIR,
+                     workers: Optional[int] = None) -> Dict[str, Dict[str, Path]]:
+    """
+    Regenera os relatórios dos últimos `months` meses, em paralelo por mês
+
+    Cada processo lê só as partições do seu mês, então as tarefas não
+    carregam dados: só o mês e os parâmetros.
+
+    Args:
+        months: Quantidade de meses
+        end_month: Último mês (padrão: last_complete_month)
+        formats / output_dir / directory: Ver generate_report
+        workers: Processos (padrão: os.cpu_count(); 1 gera no próprio processo)
+
+    Returns:
+        {mês: {formato: caminho}}
+    """
+    meta = read_meta(directory)
+    end = pd.Period(end_month or last_complete_month(meta), 'M')
+    targets = [str(end - i) for i in range(months - 1, -1, -1)]
+    missing = [month for month in targets if month not in meta['months']]
+    if missing:
+        logger.warning(f"⚠️ Meses sem dados ignorados: {', '.join(missing)}")
+    targets = [month for month in targets if month in meta['months']]
+    if not targets:
+        return {}
+
+    workers = min(workers or os.cpu_count() or 1, len(targets))
+    task = partial(generate_report, formats=tuple(formats), output_dir=Path(output_dir), directory=Path(directory))
+    start = time.perf_counter()
+    if workers == 1:
+        results = [task(month) for month in targets]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(task, targets))
+    logger.info(f"📚 {len(targets)} relatórios em {time.perf_counter() - start:.2f}s ({workers} processo(s))")
+    return dict(zip(targets, results))
+
+
+def main(argv=None):
+    """Linha de comando: materializa os agregados (opcional) e gera o histórico"""
+    parser = argparse.ArgumentParser(description="Gera os relatórios mensais de negócio")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--dataset', type=Path, help="Dataset bruto (synthetic_data.write_dataset) a materializar")
+    source.add_argument('--synthetic-players', type=int, help="Materializa um histórico sintético com N jogadores")
+    parser.add_argument('--aggregates', type=Path, default=AGGREGATES_DIR, help="Diretório dos agregados")
+    parser.add_argument('--months', type=int, default=24, help="Meses do histórico")
+    parser.add_argument('--end-month', help="Último mês (YYYY-MM)")
+    parser.add_argument('--formats', default=','.join(FORMATS), help="Formatos separados por vírgula")
+    parser.add_argument('--output', type=Path, default=REPORTS_DIR)
+    parser.add_argument('--workers', type=int, help="Processos (padrão: número de CPUs)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.dataset:
+        from operational.utils.synthetic_data import iter_parts
+        materialize(iter_parts(args.dataset), args.aggregates)
+    elif args.synthetic_players:
+        from operational.utils.synthetic_data import iter_chunks
+        days = args.months * 31
+        materialize(iter_chunks(args.synthetic_players, chunk_size=20_000, n_days=days, install_days=days),
+                    args.aggregates)
+
+    formats = [name.strip() for name in args.formats.split(',') if name.strip()]
+    results = generate_history(args.months, args.end_month, formats, args.output, args.aggregates, args.workers)
+    for month, paths in results.items():
+        print(f"✅ {month}: {', '.join(str(path) for path in paths.values())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -48,41 +48,187 @@ class Settings:
         return os.getenv('GOOGLE_SPREADSHEET_ID', 
                         '15k4L7Sib0ZRTWfeo_wgR5F4YLGQkGEiPZPSPFjwZHHw')
     
+    @property
+    def sheets_api_emulator(self) -> Optional[str]:
+        """URL do servidor local que imita a API (Qualidade/tests/fake_sheets_server.py)"""
+        url = os.getenv('SHEETS_API_EMULATOR_URL')
+        return url.rstrip('/') if url else None
+    
+    @property
+    def data_backend(self) -> str:
+        """Origem das abas: 'google' (API ou emulador) ou 'local' (CSVs em LOCAL_SHEETS_DIR)"""
+        return os.getenv('DATA_BACKEND', 'google').lower()
+    
+    @property
+    def local_sheets_dir(self) -> Optional[str]:
+        """Pasta com um {aba}.csv por aba para DATA_BACKEND=local (padrão: data/sheets)"""
+        return os.getenv('LOCAL_SHEETS_DIR') or None
+    
+    @property
+    def sheets_api_url(self) -> str:
+        """URL base da API do Google Sheets (usada pelo cliente assíncrono)"""
+        return self.sheets_api_emulator or os.getenv('SHEETS_API_URL', 'https://sheets.googleapis.com').rstrip('/')
+    
+    @property
+    def quota_per_minute(self) -> int:
+        """Cota de leituras por minuto da API do Sheets (por usuário)"""
+        return int(os.getenv('SHEETS_QUOTA_PER_MINUTE', '60'))
+    
+    @property
+    def quota_burst(self) -> int:
+        """Requisições liberadas de uma vez antes do limitador espaçar as chamadas"""
+        return int(os.getenv('SHEETS_QUOTA_BURST', '10'))
+    
+    @property
+    def api_max_retries(self) -> int:
+        """Novas tentativas em erros 429/5xx da API"""
+        return int(os.getenv('API_MAX_RETRIES', '5'))
+    
+    @property
+    def api_backoff_base(self) -> float:
+        """Espera inicial (segundos) do backoff exponencial"""
+        return float(os.getenv('API_BACKOFF_BASE', '0.5'))
+    
+    @property
+    def api_backoff_max(self) -> float:
+        """Espera máxima (segundos) entre tentativas"""
+        return float(os.getenv('API_BACKOFF_MAX', '32'))
+    
     @property
     def cache_ttl(self) -> int:
         """Tempo de cache em segundos"""
         return int(os.getenv('CACHE_TTL', '300'))  # 5 minutos default
     
+    @property
+    def refresh_mode(self) -> str:
+        """'blocking' (padrão) ou 'stale_while_revalidate'"""
+        return os.getenv('REFRESH_MODE', 'blocking').lower()
+    
+    @property
+    def max_staleness(self) -> int:
+        """Idade máxima em segundos de um dado servido enquanto o refresh roda"""
+        return int(os.getenv('MAX_STALENESS', '3600'))  # 1 hora default
+    
+    @property
+    def change_detection(self) -> bool:
+        """Consulta a versão da planilha no Drive e pula abas sem mudança"""
+        return os.getenv('CHANGE_DETECTION', 'True').lower() == 'true'
+    
+    @property
+    def revision_check_interval(self) -> int:
+        """Intervalo mínimo em segundos entre consultas da versão da planilha"""
+        return int(os.getenv('REVISION_CHECK_INTERVAL', '10'))
+    
+    @property
+    def snapshot_enabled(self) -> bool:
+        """Cache em disco (Parquet) das abas, sobrevive a restarts"""
+        return os.getenv('SNAPSHOT_CACHE', 'True').lower() == 'true'
+    
     @property
     def debug_mode(self) -> bool:
         """Modo debug ativo"""
         return os.getenv('DEBUG', 'False').lower() == 'true'
     
+    @property
+    def metrics_port(self) -> Optional[int]:
+        """Porta do servidor de métricas (/metrics no formato Prometheus, /metrics.json); vazio = desligado"""
+        port = os.getenv('METRICS_PORT', '').strip()
+        return int(port) if port else None
+    
+    @property
+    def chunk_threshold_rows(self) -> int:
+        """Abas com mais linhas que isso são lidas em blocos"""
+        return int(os.getenv('CHUNK_THRESHOLD_ROWS', '20000'))
+    
+    @property
+    def chunk_rows(self) -> int:
+        """Linhas por bloco na leitura paginada de abas grandes"""
+        return int(os.getenv('CHUNK_ROWS', '10000'))
+    
+    @property
+    def sheet_locale(self) -> str:
+        """Locale da planilha, define separadores de números e datas (pt_BR, en_US)"""
+        return os.getenv('SHEET_LOCALE', 'pt_BR')
+    
+    @property
+    def connection_status_ttl(self) -> int:
+        """Por quantos segundos o status da conexão na sidebar é reaproveitado"""
+        return int(os.getenv('CONNECTION_STATUS_TTL', '300'))
+    
+    @property
+    def warmup_enabled(self) -> bool:
+        """Pré-carrega serviço e abas principais na primeira execução do processo"""
+        return os.getenv('WARMUP', 'True').lower() == 'true'
+    
+    @property
+    def warmup_sheets(self) -> list:
+        """Abas pré-carregadas no warm-up"""
+        return [name.strip() for name in os.getenv('WARMUP_SHEETS', 'Cohort,Monetization').split(',') if name.strip()]
+    
     @property
     def available_sheets(self) -> list:
-        """Lista de abas disponíveis na planilha"""
+        """Abas carregadas por padrão (em lote); a aba ABTest é opcional e lida só pela sua página"""
         return ['Cohort', 'Monetization', 'Convertion']
     
     def get_sheet_config(self, sheet_name: str) -> Optional[Dict[str, Any]]:
-        """Configurações específicas por aba"""
+        """Configurações específicas por aba (range None = tamanho real da grade)"""
         configs = {
             'Cohort': {
-                'range': 'A1:E100',
+                'range': None,
                 'required_columns': ['COHORT', 'USERS', 'RETENTION_D1', 'RETENTION_D7', 'RETENTION_D30'],
+                'dtypes': {
+                    'COHORT': 'date',
+                    'USERS': 'int',
+                    'RETENTION_D1': 'percent',
+                    'RETENTION_D7': 'percent',
+                    'RETENTION_D30': 'percent',
+                    # Exportação de sessões (uma linha por sessão)
+                    'player_id': 'string',
+                    'install_date': 'date',
+                    'session_date': 'date'
+                },
                 'display_name': 'Análise de Coorte',
                 'icon': '📈'
             },
             'Monetization': {
-                'range': 'A1:E100', 
+                'range': None,
                 'required_columns': ['INSTALL_DATE', 'REVENUE', 'DAU', 'ARPU', 'CONVERTION'],
+                'dtypes': {
+                    'INSTALL_DATE': 'date',
+                    'REVENUE': 'currency',
+                    'DAU': 'int',
+                    'ARPU': 'currency',
+                    'CONVERTION': 'percent',
+                    # Formato de compras (uma linha por compra)
+                    'player_id': 'string',
+                    'day': 'int',
+                    'value': 'currency',
+                    'segment': 'category',
+                    'active_days': 'int'
+                },
                 'display_name': 'Monetização',
                 'icon': '💰'
             },
             'Convertion': {
-                'range': 'A1:Z100',
+                'range': None,
                 'required_columns': [],
+                'dtypes': {},
                 'display_name': 'Conversão',
                 'icon': '🎯'
+            },
+            'ABTest': {
+                'range': None,
+                'required_columns': ['experiment', 'variant'],
+                'dtypes': {
+                    'experiment': 'category',
+                    'variant': 'category',
+                    'converted': 'int',
+                    'revenue': 'currency',
+                    'retained_d7': 'int',
+                    'pre_revenue': 'currency'
+                },
+                'display_name': 'Testes A/B',
+                'icon': '🧪'
             }
         }
         return configs.get(sheet_name)
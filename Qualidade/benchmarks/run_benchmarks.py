@@ -0,0 +1,420 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmarks dos caminhos de carga, parse, agregação e renderização
+
+Tudo roda offline: as abas vêm do servidor local que imita a API
+(Qualidade/tests/fake_sheets_server.py) e os dados de sessões/compras do
+gerador sintético. Cada execução grava um JSON em Qualidade/benchmarks/results
+com o commit atual, para comparar execuções entre commits.
+
+Uso:
+    python Qualidade/benchmarks/run_benchmarks.py                 # 10k, 1M e 10M linhas
+    python Qualidade/benchmarks/run_benchmarks.py --sizes 10k --only cohort
+    python Qualidade/benchmarks/run_benchmarks.py --compare Qualidade/benchmarks/results/anterior.json
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+BENCHMARKS_DIR = Path(__file__).parent
+PROJECT_ROOT = BENCHMARKS_DIR.parent.parent
+RESULTS_DIR = BENCHMARKS_DIR / "results"
+APP_PATH = PROJECT_ROOT / "Aplicação" / "operational" / "streamlit_app.py"
+PAGES = {
+    'home': APP_PATH,
+    'cohort': APP_PATH.parent / "pages" / "1_📈_Análise_de_Coorte.py",
+    'monetization': APP_PATH.parent / "pages" / "2_💰_Monetização.py",
+}
+
+sys.path.insert(0, str(PROJECT_ROOT / "Aplicação"))
+sys.path.insert(0, str(PROJECT_ROOT / "Configuração"))
+sys.path.insert(0, str(PROJECT_ROOT / "Qualidade" / "tests"))
+
+SPREADSHEET_ID = 'benchmark-spreadsheet'
+
+# Limite do Google Sheets: 10 milhões de células por planilha
+SHEET_CELL_LIMIT = 10_000_000
+
+SIZES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000, '10m': 10_000_000}
+
+# Registro dos benchmarks: nome → (função, depende do tamanho)
+BENCHMARKS: Dict[str, Dict[str, Any]] = {}
+
+
+def benchmark(name: str, sized: bool = True):
+    """Registra uma função de benchmark (setup(size) → callable medido)"""
+    def decorator(func: Callable):
+        BENCHMARKS[name] = {'setup': func, 'sized': sized}
+        return func
+    return decorator
+
+
+# ---- Dados ----------------------------------------------------------------
+
+def cohort_values(rows: int, seed: int = 0) -> List[List[str]]:
+    """Aba Cohort com `rows` linhas no formato da planilha (textos)"""
+    rng = np.random.default_rng(seed)
+    dates = (np.datetime64('2020-01-01') + rng.integers(0, 1500, rows)).astype(str)
+    users = rng.integers(100, 5000, rows).astype(str)
+    d1, d7, d30 = (np.char.add(rng.integers(5, 90, rows).astype(str), '%') for _ in range(3))
+    header = ['COHORT', 'USERS', 'RETENTION_D1', 'RETENTION_D7', 'RETENTION_D30']
+    return [header] + np.column_stack([dates, users, d1, d7, d30]).tolist()
+
+
+def monetization_values(rows: int, seed: int = 1) -> List[List[str]]:
+    """Aba Monetization com `rows` linhas no formato da planilha (textos)"""
+    rng = np.random.default_rng(seed)
+    dates = (np.datetime64('2020-01-01') + rng.integers(0, 1500, rows)).astype(str)
+    revenue = np.char.add('R$ ', rng.integers(1_000, 50_000, rows).astype(str))
+    dau = rng.integers(1_000, 10_000, rows).astype(str)
+    arpu = np.char.replace(rng.uniform(0.5, 9, rows).round(2).astype(str), '.', ',')
+    conversion = np.char.add(rng.integers(1, 9, rows).astype(str), '%')
+    header = ['INSTALL_DATE', 'REVENUE', 'DAU', 'ARPU', 'CONVERTION']
+    return [header] + np.column_stack([dates, revenue, dau, arpu, conversion]).tolist()
+
+
+def purchases_table(rows: int, seed: int = 2):
+    """Tabela plana de compras com `rows` linhas e a tabela de jogadores"""
+    rng = np.random.default_rng(seed)
+    n_players = max(rows // 4, 1)
+    players = pd.DataFrame({
+        'player_id': np.arange(n_players),
+        'segment': pd.Categorical.from_codes(rng.choice(4, n_players, p=[0.01, 0.05, 0.15, 0.79]),
+                                             ['whale', 'dolphin', 'minnow', 'free']),
+        'active_days': rng.integers(1, 90, n_players),
+    })
+    purchases = pd.DataFrame({
+        'player_id': rng.integers(0, n_players, rows),
+        'day': rng.integers(0, 90, rows),
+        'value': rng.uniform(0.99, 99.99, rows).round(2),
+    })
+    return players, purchases
+
+
+def sessions_table(rows: int, seed: int = 3) -> pd.DataFrame:
+    """Sessões sintéticas com aproximadamente `rows` linhas"""
+    from operational.utils.synthetic_data import generate
+    # O gerador produz ~13 sessões por jogador na janela padrão de 90 dias
+    sessions = generate(max(rows // 13, 1), seed=seed)['sessions']
+    return sessions.iloc[:rows]
+
+
+def sheet_rows(size: int, columns: int = 5) -> Optional[int]:
+    """Linhas que cabem numa aba (None se o tamanho passa do limite do Sheets)"""
+    return size if size * columns <= SHEET_CELL_LIMIT else None
+
+
+# ---- Benchmarks -----------------------------------------------------------
+
+@benchmark('sheets_load')
+def bench_sheets_load(size: int, server):
+    """GoogleSheetsClient.get_sheet_data contra o servidor local"""
+    from operational.utils.sheets_client import GoogleSheetsClient
+
+    rows = sheet_rows(size)
+    if rows is None:
+        return None
+    server.set_tab(SPREADSHEET_ID, 'Cohort', cohort_values(rows))
+    client = GoogleSheetsClient()
+
+    def run():
+        client.clear_cache()
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == rows
+    return run
+
+
+@benchmark('sheets_load_local')
+def bench_sheets_load_local(size: int, server):
+    """O mesmo carregamento com DATA_BACKEND=local (CSV em disco, sem HTTP)"""
+    from operational.utils.sheets_backends import LocalFilesBackend
+    from operational.utils.sheets_client import GoogleSheetsClient
+
+    rows = sheet_rows(size)
+    if rows is None:
+        return None
+    server.set_tab(SPREADSHEET_ID, 'Cohort', cohort_values(rows))
+    client = GoogleSheetsClient(LocalFilesBackend(server.data_dir / SPREADSHEET_ID))
+
+    def run():
+        client.clear_cache()
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == rows
+    return run
+
+
+@benchmark('dataframe_build')
+def bench_dataframe_build(size: int, server):
+    """Lista de valores da API → DataFrame tipado (coerção por coluna)"""
+    from operational.utils.sheets_client import GoogleSheetsClient
+
+    rows = sheet_rows(size)
+    if rows is None:
+        return None
+    values = monetization_values(rows)
+    client = GoogleSheetsClient()
+    return lambda: client._values_to_dataframe('Monetization', values)
+
+
+@benchmark('cohort_retention')
+def bench_cohort_retention(size: int, server):
+    """Matriz de retenção coorte × dia a partir das sessões"""
+    from operational.analytics.cohort_engine import build_retention_matrix
+
+    sessions = sessions_table(size)
+    return lambda: build_retention_matrix(sessions)
+
+
+@benchmark('monetization')
+def bench_monetization(size: int, server):
+    """Receita diária, ARPPU, ARPDAU e LTV por segmento a partir das compras"""
+    from operational.analytics.monetization_engine import daily_revenue, monetization_summary
+
+    players, purchases = purchases_table(size)
+
+    def run():
+        daily_revenue(purchases)
+        monetization_summary(players, purchases)
+    return run
+
+
+@benchmark('ltv_forecast')
+def bench_ltv_forecast(size: int, server):
+    """Ajuste da curva de retenção e LTV D90/D180/D365 para `size` coortes"""
+    from strategic.models.ltv_forecast import ParameterCache, forecast_ltv
+
+    rng = np.random.default_rng(4)
+    days = np.maximum(np.arange(31), 1).astype(np.float64)
+    a, b = rng.uniform(0.2, 0.6, size), rng.uniform(0.2, 1.2, size)
+    rates = a[:, None] * days[None, :] ** -b[:, None] * rng.lognormal(0, 0.05, (size, 31))
+    rates[:, 0] = 1.0
+    retention = pd.DataFrame(rates, columns=pd.RangeIndex(31, name='day'))
+    arpdau = pd.Series(rng.uniform(0.05, 0.5, size))
+    # Cache novo a cada rodada: mede o ajuste, não o acerto no cache
+    return lambda: forecast_ltv(retention, arpdau, cache=ParameterCache())
+
+
+@benchmark('bootstrap')
+def bench_bootstrap(size: int, server):
+    """100 réplicas de bootstrap (LTV, retenção, ARPDAU por segmento) sobre ~`size` sessões"""
+    from operational.utils.synthetic_data import generate
+    from strategic.models.bootstrap import bootstrap_intervals
+
+    # O gerador produz ~13 sessões por jogador
+    data = generate(max(size // 13, 1), seed=5)
+    return lambda: bootstrap_intervals(data['players'], data['sessions'], data['purchases'],
+                                       n_replicates=100, seed=0)
+
+
+@benchmark('ab_test')
+def bench_ab_test(size: int, server):
+    """Análise de 30 experimentos × 3 variantes (z, Welch, Mann-Whitney e CUPED) sobre `size` usuários"""
+    from operational.utils.synthetic_data import generate_experiment_users
+    from operational.analytics.ab_test_engine import analyze_experiments
+
+    users = generate_experiment_users(size, n_experiments=30, seed=6)
+    return lambda: analyze_experiments(users, covariates={'revenue': 'pre_revenue'})
+
+
+@benchmark('experiment_ingest')
+def bench_experiment_ingest(size: int, server):
+    """Ingestão incremental de um lote de `size` usuários num store com 30 experimentos (mSPRT incluso)"""
+    from operational.utils.synthetic_data import generate_experiment_users
+    from operational.analytics.experiment_store import ExperimentStore
+
+    users = generate_experiment_users(size, n_experiments=30, seed=7)
+    store = ExperimentStore(root=None)
+    store.ingest(users)
+    return lambda: store.ingest(users)
+
+
+def _page_benchmark(dashboard: str, warm: bool):
+    def setup(size: int, server):
+        """Execução do script da página com AppTest (sem navegador)"""
+        from streamlit.testing.v1 import AppTest
+        from operational.utils.profiling import timings
+        from operational.utils.sheets_client import sheets_client
+        from operational.utils.session_data import SESSION_KEY
+
+        server.set_tab(SPREADSHEET_ID, 'Cohort', cohort_values(1_000))
+        server.set_tab(SPREADSHEET_ID, 'Monetization', monetization_values(1_000))
+        app = AppTest.from_file(str(PAGES[dashboard]), default_timeout=120)
+        app.run()
+
+        def run():
+            if not warm:
+                sheets_client.clear_cache()
+                if SESSION_KEY in app.session_state:
+                    del app.session_state[SESSION_KEY]
+            app.run()
+            assert not app.exception
+            # O AppTest consulta o script em intervalos de 0,1s; o próprio app mede a execução
+            return timings()['app.script_run']
+        return run
+    return setup
+
+
+@benchmark('app_first_paint', sized=False)
+def bench_app_first_paint(size: int, server):
+    """Primeiro render num processo novo (imports + warm-up + script), como após um deploy"""
+    server.set_tab(SPREADSHEET_ID, 'Cohort', cohort_values(1_000))
+    server.set_tab(SPREADSHEET_ID, 'Monetization', monetization_values(1_000))
+    code = (f"from streamlit.testing.v1 import AppTest; "
+            f"app = AppTest.from_file({str(APP_PATH)!r}, default_timeout=120); app.run(); "
+            f"assert not app.exception")
+
+    def run():
+        subprocess.run([sys.executable, '-c', code], check=True, env=os.environ.copy(),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return run
+
+
+for _dashboard in PAGES:
+    benchmark(f'page_render[{_dashboard}]', sized=False)(_page_benchmark(_dashboard, warm=False))
+    benchmark(f'page_rerun[{_dashboard}]', sized=False)(_page_benchmark(_dashboard, warm=True))
+
+
+# ---- Execução -------------------------------------------------------------
+
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    """
+    Executa `func` `repeat` vezes e devolve estatísticas em segundos
+
+    Se `func` devolver um número, ele é usado como o tempo medido (para
+    etapas cronometradas por dentro, como a execução do script do app).
+    """
+    func()  # aquecimento (imports, caches de parse)
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        measured = func()
+        elapsed = time.perf_counter() - start
+        times.append(measured if isinstance(measured, float) else elapsed)
+    return {
+        'min': min(times),
+        'median': statistics.median(times),
+        'mean': statistics.fmean(times),
+        'max': max(times),
+        'repeat': repeat,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Commit atual (para identificar a execução)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: Path, threshold: float) -> List[str]:
+    """Benchmarks que ficaram mais lentos que `threshold` × a execução de referência"""
+    baseline = {(r['name'], r['size']): r for r in json.loads(baseline_path.read_text())['results']}
+    regressions = []
+    for result in current:
+        previous = baseline.get((result['name'], result['size']))
+        if not previous:
+            continue
+        ratio = result['median'] / previous['median'] if previous['median'] else float('inf')
+        label = f"{result['name']} @ {result['size']}"
+        print(f"   {label:<40} {previous['median']:.4f}s → {result['median']:.4f}s ({ratio:.2f}x)")
+        if ratio > threshold:
+            regressions.append(label)
+    return regressions
+
+
+def run(sizes: List[str], only: Optional[str], repeat: int) -> List[Dict[str, Any]]:
+    """Sobe o servidor local, configura o ambiente e executa os benchmarks"""
+    from fake_sheets_server import FakeSheetsServer
+
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir, FakeSheetsServer(Path(data_dir)) as server:
+        # Antes de importar o app: o pool lê o emulador e a cota na importação
+        os.environ.update({
+            'SHEETS_API_EMULATOR_URL': server.url,
+            'GOOGLE_SPREADSHEET_ID': SPREADSHEET_ID,
+            'SHEETS_QUOTA_PER_MINUTE': '1000000',
+            'SHEETS_QUOTA_BURST': '1000000',
+            'SNAPSHOT_CACHE': 'False',
+            'CHANGE_DETECTION': 'False',
+            'ENVIRONMENT': 'production',  # logging em INFO
+        })
+
+        for name, spec in BENCHMARKS.items():
+            if only and only not in name:
+                continue
+            for size_label in (sizes if spec['sized'] else ['-']):
+                size = SIZES[size_label] if spec['sized'] else 0
+                func = spec['setup'](size, server)
+                if func is None:
+                    print(f"⏭️  {name} @ {size_label}: acima do limite de células do Sheets")
+                    continue
+                stats = measure(func, repeat)
+                result = {'name': name, 'size': size_label, 'rows': size, **stats}
+                if size:
+                    result['rows_per_second'] = size / stats['median']
+                results.append(result)
+                print(f"⏱️  {name:<28} {size_label:>5}  mediana {stats['median']:.4f}s  (min {stats['min']:.4f}s)")
+                del func
+                gc.collect()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do dashboard (carga, parse, agregação, renderização)")
+    parser.add_argument('--sizes', default='10k,1m,10m', help=f"Tamanhos separados por vírgula ({', '.join(SIZES)})")
+    parser.add_argument('--only', help="Roda só benchmarks cujo nome contém este texto")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições medidas por benchmark")
+    parser.add_argument('--output', type=Path, default=RESULTS_DIR, help="Diretório dos JSONs de resultado")
+    parser.add_argument('--compare', type=Path, help="JSON de uma execução anterior para comparar")
+    parser.add_argument('--threshold', type=float, default=1.2, help="Razão acima da qual conta como regressão")
+    args = parser.parse_args(argv)
+
+    sizes = [size.strip().lower() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"Tamanhos desconhecidos: {unknown}")
+
+    results = run(sizes, args.only, args.repeat)
+
+    commit = git_commit()
+    report = {
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': results,
+    }
+    args.output.mkdir(parents=True, exist_ok=True)
+    output = args.output / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'local'}.json"
+    output.write_text(json.dumps(report, indent=2))
+    print(f"✅ Resultados em {output}")
+
+    if args.compare:
+        print(f"📊 Comparando com {args.compare}:")
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"❌ Regressões (> {args.threshold:.2f}x): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
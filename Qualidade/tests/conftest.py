@@ -0,0 +1,8 @@
+# tests/conftest.py
+import sys
+from pathlib import Path
+
+# Os testes importam operational.* e config.* como o app faz em execução
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / "Aplicação"))
+sys.path.insert(0, str(project_root / "Configuração"))
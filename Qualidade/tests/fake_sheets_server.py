@@ -0,0 +1,283 @@
+# tests/fake_sheets_server.py
+"""
+Servidor local que imita a parte da API do Google usada pelo sheets_client
+
+Rotas:
+    GET /v4/spreadsheets/{id}                   (spreadsheets.get)
+    GET /v4/spreadsheets/{id}/values/{range}    (values.get)
+    GET /v4/spreadsheets/{id}/values:batchGet   (values.batchGet)
+    GET /drive/v3/files/{id}                    (files.get, versão da planilha)
+
+Cada aba é um CSV em data_dir/{spreadsheet_id}/{aba}.csv (primeira linha =
+cabeçalho), lido pelo mesmo LocalFilesBackend que o app usa com
+DATA_BACKEND=local: o servidor só acrescenta o protocolo HTTP. Latência,
+erros 429/5xx e cota por minuto podem ser injetados para medir e testar o
+caminho de I/O sem acesso ao Google.
+
+Uso:
+    python Qualidade/tests/fake_sheets_server.py --data-dir /tmp/sheets --port 8085
+    SHEETS_API_EMULATOR_URL=http://127.0.0.1:8085 streamlit run Aplicação/operational/streamlit_app.py
+"""
+import argparse
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / "Aplicação"))
+sys.path.insert(0, str(PROJECT_ROOT / "Configuração"))
+
+if TYPE_CHECKING:
+    from operational.utils.sheets_backends import LocalFilesBackend
+
+ERROR_STATUS = {429: 'RESOURCE_EXHAUSTED', 500: 'INTERNAL', 503: 'UNAVAILABLE', 404: 'NOT_FOUND', 400: 'INVALID_ARGUMENT'}
+
+
+class FakeSheetsServer:
+    """
+    Imitação local da API do Sheets/Drive servida por ThreadingHTTPServer
+
+    Args:
+        data_dir: Diretório com data_dir/{spreadsheet_id}/{aba}.csv
+        host / port: Endereço (porta 0 escolhe uma livre)
+        latency: Atraso fixo (segundos) em cada resposta
+        latency_jitter: Atraso aleatório extra, uniforme entre 0 e este valor
+        error_rate: Probabilidade de responder 429 em cada requisição
+        quota_per_minute: Requisições aceitas por minuto antes de responder 429
+        retry_after: Valor do header Retry-After nas respostas 429
+        seed: Seed do sorteio de latência e erros
+    """
+
+    def __init__(self, data_dir: Path, host: str = '127.0.0.1', port: int = 0,
+                 latency: float = 0.0, latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, quota_per_minute: Optional[int] = None,
+                 retry_after: Optional[int] = None, seed: int = 0):
+        self.data_dir = Path(data_dir)
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.quota_per_minute = quota_per_minute
+        self.retry_after = retry_after
+        self.logger = logging.getLogger(__name__)
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._failures: deque = deque()
+        self._recent: deque = deque()
+        self._stores: Dict[str, 'LocalFilesBackend'] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        """URL base para SHEETS_API_EMULATOR_URL"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    # ---- Dados -------------------------------------------------------------
+
+    def store(self, spreadsheet_id: str) -> 'LocalFilesBackend':
+        """Abas de uma planilha (data_dir/{spreadsheet_id}), como no DATA_BACKEND=local"""
+        # Import tardio: o app lê SHEETS_API_EMULATOR_URL e a cota na importação,
+        # e quem sobe o servidor só conhece a URL depois de criá-lo
+        from operational.utils.sheets_backends import LocalFilesBackend
+        with self._lock:
+            if spreadsheet_id not in self._stores:
+                self._stores[spreadsheet_id] = LocalFilesBackend(self.data_dir / spreadsheet_id)
+            return self._stores[spreadsheet_id]
+
+    def set_tab(self, spreadsheet_id: str, sheet_name: str, values: List[List[Any]]):
+        """Grava (ou substitui) uma aba"""
+        self.store(spreadsheet_id).set_tab(sheet_name, values)
+
+    def generate_tab(self, spreadsheet_id: str, sheet_name: str, rows: int, columns: int, seed: int = 0):
+        """Cria uma aba numérica de rows × columns (mais o cabeçalho) para testes de carga"""
+        rng = np.random.default_rng(seed)
+        header = [f"COL_{i + 1}" for i in range(columns)]
+        body = rng.integers(0, 100_000, size=(rows, columns)).astype(str).tolist()
+        self.set_tab(spreadsheet_id, sheet_name, [header] + body)
+
+    # ---- Falhas ------------------------------------------------------------
+
+    def fail_next(self, count: int = 1, status: int = 429):
+        """As próximas `count` requisições respondem com `status`"""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _injected_status(self) -> Optional[int]:
+        """Status de erro a devolver nesta requisição (None = responder normalmente)"""
+        with self._lock:
+            if self._failures:
+                return self._failures.popleft()
+            if self.quota_per_minute is not None:
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] > 60:
+                    self._recent.popleft()
+                if len(self._recent) >= self.quota_per_minute:
+                    return 429
+                self._recent.append(now)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 429
+            delay = self.latency + (self._random.uniform(0, self.latency_jitter) if self.latency_jitter else 0)
+        if delay:
+            time.sleep(delay)
+        return None
+
+    # ---- Rotas -------------------------------------------------------------
+
+    def _spreadsheet(self, spreadsheet_id: str) -> Dict[str, Any]:
+        metadata = self.store(spreadsheet_id).metadata()
+        metadata.update({'spreadsheetId': spreadsheet_id, 'properties': {'title': spreadsheet_id}})
+        return metadata
+
+    def _value_range(self, spreadsheet_id: str, range_name: str) -> Dict[str, Any]:
+        response = {'range': range_name, 'majorDimension': 'ROWS'}
+        values = self.store(spreadsheet_id).values(range_name)
+        if values:
+            response['values'] = values
+        return response
+
+    def _file(self, spreadsheet_id: str) -> Dict[str, Any]:
+        # Versão muda sempre que alguma aba é regravada (como a do Drive a cada edição)
+        version = self.store(spreadsheet_id).revision()
+        return {'id': spreadsheet_id, 'version': version,
+                'modifiedTime': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(int(version) / 1e6))}
+
+    def route(self, path: str, query: Dict[str, List[str]]) -> Tuple[str, Dict[str, Any]]:
+        """Despacha o caminho da URL para a rota (nome da rota, corpo da resposta)"""
+        parts = [unquote(part) for part in path.strip('/').split('/')]
+        if parts[:2] == ['drive', 'v3'] and len(parts) == 4 and parts[2] == 'files':
+            return 'files.get', self._file(parts[3])
+        if parts[:2] != ['v4', 'spreadsheets'] or len(parts) < 3:
+            raise LookupError(path)
+        spreadsheet_id = parts[2]
+        if len(parts) == 3:
+            return 'spreadsheets.get', self._spreadsheet(spreadsheet_id)
+        if parts[3] == 'values:batchGet':
+            ranges = query.get('ranges', [])
+            return 'values.batchGet', {'spreadsheetId': spreadsheet_id,
+                                       'valueRanges': [self._value_range(spreadsheet_id, r) for r in ranges]}
+        if parts[3] == 'values' and len(parts) == 5:
+            return 'values.get', self._value_range(spreadsheet_id, parts[4])
+        raise LookupError(path)
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                server.logger.debug(format % args)
+
+            def _send(self, status: int, body: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _error(self, status: int, message: str):
+                headers = {}
+                if status == 429 and server.retry_after is not None:
+                    headers['Retry-After'] = str(server.retry_after)
+                self._send(status, {'error': {'code': status, 'message': message,
+                                              'status': ERROR_STATUS.get(status, 'UNKNOWN')}}, headers)
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status = server._injected_status()
+                if status is not None:
+                    with server._lock:
+                        server.requests[f'error.{status}'] += 1
+                    self._error(status, 'Quota exceeded' if status == 429 else 'Injected error')
+                    return
+                try:
+                    name, body = server.route(url.path, parse_qs(url.query))
+                except LookupError:
+                    self._error(404, f"Unknown path: {url.path}")
+                    return
+                except FileNotFoundError as e:
+                    self._error(404, str(e))
+                    return
+                except ValueError as e:
+                    self._error(400, str(e))
+                    return
+                with server._lock:
+                    server.requests[name] += 1
+                self._send(200, body)
+
+        return Handler
+
+    # ---- Ciclo de vida -----------------------------------------------------
+
+    def start(self) -> 'FakeSheetsServer':
+        """Sobe o servidor numa thread em segundo plano"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-sheets', daemon=True)
+        self._thread.start()
+        self.logger.info(f"🧪 Fake Sheets API em {self.url} ({self.data_dir})")
+        return self
+
+    def stop(self):
+        """Encerra o servidor"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    """Sobe o servidor em primeiro plano"""
+    parser = argparse.ArgumentParser(description="Servidor local que imita a API do Google Sheets")
+    parser.add_argument('--data-dir', type=Path, required=True, help="Diretório {spreadsheet_id}/{aba}.csv")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8085)
+    parser.add_argument('--latency', type=float, default=0.0, help="Atraso por resposta (s)")
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="Atraso aleatório extra (s)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Chance de 429 por requisição")
+    parser.add_argument('--quota-per-minute', type=int, default=None, help="Cota de requisições por minuto")
+    parser.add_argument('--generate', action='append', default=[], metavar='ID/ABA=LINHASxCOLUNAS',
+                        help="Cria uma aba numérica, ex.: 15k4...HHw/Big=100000x10")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = FakeSheetsServer(args.data_dir, host=args.host, port=args.port, latency=args.latency,
+                              latency_jitter=args.latency_jitter, error_rate=args.error_rate,
+                              quota_per_minute=args.quota_per_minute)
+    for spec in args.generate:
+        target, size = spec.split('=')
+        spreadsheet_id, sheet_name = target.split('/', 1)
+        rows, columns = (int(n) for n in size.lower().split('x'))
+        server.generate_tab(spreadsheet_id, sheet_name, rows, columns)
+
+    print(f"✅ Fake Sheets API em {server.url} — defina SHEETS_API_EMULATOR_URL={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
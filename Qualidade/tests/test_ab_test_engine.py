@@ -0,0 +1,110 @@
+# tests/test_ab_test_engine.py
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from operational.analytics.ab_test_engine import (
+    analyze_experiments, benjamini_hochberg, t_ppf, t_sf_two_sided
+)
+from operational.utils.synthetic_data import generate_experiment_users
+
+
+def two_arm(control, treatment, experiment='exp', **columns):
+    """Usuários de um experimento com controle e uma variante 'b'"""
+    frame = pd.DataFrame({
+        'experiment': experiment,
+        'variant': ['control'] * len(control) + ['b'] * len(treatment),
+        'revenue': np.concatenate([control, treatment]).astype(float),
+    })
+    return frame.assign(**columns)
+
+
+class TestDistributions:
+    def test_student_t_matches_tables(self):
+        np.testing.assert_allclose(t_sf_two_sided(np.array([2.0, 1.0]), np.array([5.0, 30.0])),
+                                   [0.101939, 0.325309], atol=1e-6)
+        np.testing.assert_allclose(t_ppf(0.975, np.array([1.0, 5.0, 30.0, 1e6])),
+                                   [12.7062, 2.5706, 2.0423, 1.9600], atol=1e-4)
+
+    def test_benjamini_hochberg(self):
+        q = benjamini_hochberg(np.array([0.01, 0.04, 0.03, np.nan, 0.5]))
+        np.testing.assert_allclose(q[[0, 1, 2, 4]], [0.04, 0.0533333, 0.0533333, 0.5], rtol=1e-5)
+        assert np.isnan(q[3])
+
+
+class TestTests:
+    def test_proportion_z_test(self):
+        users = pd.DataFrame({
+            'experiment': 'exp',
+            'variant': ['control'] * 1000 + ['b'] * 1000,
+            'converted': np.r_[np.ones(100), np.zeros(900), np.ones(130), np.zeros(870)],
+        })
+        row = analyze_experiments(users, metrics={'converted': 'proportion'}).iloc[0]
+        pooled = 230 / 2000
+        z = 0.03 / math.sqrt(pooled * (1 - pooled) * 2 / 1000)
+        assert row['test'] == 'z'
+        assert row['lift'] == pytest.approx(0.3)
+        assert row['statistic'] == pytest.approx(z)
+        assert row['p_value'] == pytest.approx(math.erfc(z / math.sqrt(2)))
+
+    def test_welch_interval_contains_the_difference(self):
+        rng = np.random.default_rng(0)
+        users = two_arm(rng.normal(10, 2, 40), rng.normal(11, 4, 25))
+        row = analyze_experiments(users, metrics={'revenue': 'mean'}, rank_metrics=()).iloc[0]
+        assert row['test'] == 'welch_t'
+        assert row['ci_low'] < row['diff'] < row['ci_high']
+        # Intervalo e teste concordam: o zero fica fora exatamente quando p < alpha
+        assert (row['ci_low'] > 0 or row['ci_high'] < 0) == (row['p_value'] < 0.05)
+
+    def test_significance_uses_the_corrected_q_value(self):
+        rng = np.random.default_rng(3)
+        users = pd.concat([two_arm(rng.normal(10, 2, 200), rng.normal(10, 2, 200), experiment=f'exp{i}')
+                           for i in range(40)], ignore_index=True)
+        corrected = analyze_experiments(users, metrics={'revenue': 'mean'}, rank_metrics=())
+        raw = analyze_experiments(users, metrics={'revenue': 'mean'}, rank_metrics=(), correction=False)
+        assert (corrected['significant'] == (corrected['q_value'] < 0.05)).all()
+        assert (raw['significant'] == (raw['p_value'] < 0.05)).all()
+        # Sem efeito real, algum p bruto cai abaixo de 5% mas nenhum resiste à correção
+        assert raw['significant'].any() and not corrected['significant'].any()
+
+    def test_mann_whitney_matches_pairwise_counts(self):
+        control, treatment = np.array([0, 0, 1, 3, 5, 5, 8]), np.array([0, 2, 5, 7, 9, 9])
+        users = two_arm(control, treatment)
+        row = analyze_experiments(users, metrics={'revenue': 'mean'}).query("test == 'mann_whitney'").iloc[0]
+        wins = (treatment[:, None] > control[None, :]).sum() + 0.5 * (treatment[:, None] == control[None, :]).sum()
+        assert row['prob_superiority'] == pytest.approx(wins / (len(control) * len(treatment)))
+
+        n_c, n_t, n = len(control), len(treatment), len(control) + len(treatment)
+        _, ties = np.unique(np.r_[control, treatment], return_counts=True)
+        variance = n_c * n_t / 12 * ((n + 1) - (ties ** 3 - ties).sum() / (n * (n - 1)))
+        z = (wins - n_c * n_t / 2 - 0.5) / math.sqrt(variance)
+        assert row['statistic'] == pytest.approx(z)
+
+    def test_cuped_reduces_variance(self):
+        rng = np.random.default_rng(1)
+        pre = rng.lognormal(1, 1, 4000)
+        users = two_arm(pre[:2000] + rng.normal(0, 1, 2000), pre[2000:] + 0.2 + rng.normal(0, 1, 2000),
+                        pre_revenue=pre)
+        row = analyze_experiments(users, metrics={'revenue': 'mean'}, covariates={'revenue': 'pre_revenue'},
+                                  rank_metrics=()).iloc[0]
+        assert row['variance_reduction'] > 0.5
+        assert row['cuped_ci_high'] - row['cuped_ci_low'] < row['ci_high'] - row['ci_low']
+        assert row['cuped_ci_low'] < 0.2 < row['cuped_ci_high']
+
+
+class TestManyExperiments:
+    def test_one_call_matches_separate_calls(self):
+        users = generate_experiment_users(30_000, n_experiments=3, seed=5)
+        together = analyze_experiments(users, covariates={'revenue': 'pre_revenue'})
+        for experiment, group in users.groupby('experiment'):
+            alone = analyze_experiments(group, covariates={'revenue': 'pre_revenue'})
+            mine = together[together['experiment'] == experiment].reset_index(drop=True)
+            columns = ['variant', 'metric', 'test', 'diff', 'statistic', 'p_value', 'cuped_p_value']
+            pd.testing.assert_frame_equal(mine[columns], alone[columns])
+
+    def test_experiments_without_control_are_skipped(self):
+        users = pd.concat([two_arm([1.0, 2.0, 3.0], [2.0, 3.0, 4.0]),
+                           two_arm([1.0, 2.0], [5.0], experiment='other').replace({'control': 'a'})])
+        result = analyze_experiments(users, metrics={'revenue': 'mean'}, rank_metrics=())
+        assert result['experiment'].tolist() == ['exp']
@@ -0,0 +1,171 @@
+# tests/test_async_sheets_client.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import unquote
+
+import pytest
+from operational.utils import async_sheets_client as async_module
+from operational.utils.async_sheets_client import AsyncSheetsClient
+from operational.utils.rate_limiter import TokenBucket
+from operational.utils.service_pool import service_pool
+
+SHEETS = {
+    'Cohort': [['COHORT', 'USERS'], ['2024-01-01', '1000'], ['2024-01-02', '1200']],
+    'Monetization': [['INSTALL_DATE', 'REVENUE'], ['2024-01-01', '15000']],
+    'Convertion': [['STEP', 'RATE'], ['install', '1'], ['tutorial', '0,8']],
+}
+
+
+class SlowSheetsHandler(BaseHTTPRequestHandler):
+    """API falsa que demora 200 ms por resposta e conta requisições simultâneas"""
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    auth_headers = []
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.auth_headers.append(self.headers.get('Authorization'))
+        time.sleep(0.2)
+        sheet = unquote(self.path.rsplit('/', 1)[-1]).split('!')[0]
+        if sheet in SHEETS:
+            status, body = 200, {'range': sheet, 'values': SHEETS[sheet]}
+        else:
+            status, body = 400, {'error': {'message': 'Unable to parse range'}}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        with cls.lock:
+            cls.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    SlowSheetsHandler.max_in_flight = 0
+    SlowSheetsHandler.auth_headers = []
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowSheetsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setenv('SHEETS_API_URL', f'http://127.0.0.1:{server.server_port}')
+    monkeypatch.setenv('SNAPSHOT_CACHE', 'False')
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def client():
+    with mock.patch.object(service_pool, 'access_token', return_value='test-token'):
+        client = AsyncSheetsClient(limiter=TokenBucket(rate=100, capacity=10))
+        client._grid_size = lambda sheet_name: None
+        yield client
+
+
+class TestAsyncSheetsClient:
+    def test_tabs_loaded_concurrently(self, api, client):
+        """Três abas de 200 ms cada carregam em paralelo"""
+        start = time.monotonic()
+        frames = client.load_sheets(['Cohort', 'Monetization', 'Convertion'])
+        elapsed = time.monotonic() - start
+        assert elapsed < 0.5
+        assert SlowSheetsHandler.max_in_flight == 3
+        assert len(frames['Cohort']) == 2
+        assert set(SlowSheetsHandler.auth_headers) == {'Bearer test-token'}
+
+    def test_limiter_spaces_requests(self, api, client):
+        """Sem tokens sobrando, as requisições são espaçadas pela cota"""
+        client._limiter = TokenBucket(rate=10, capacity=1)
+        start = time.monotonic()
+        client.load_sheets(['Cohort', 'Monetization', 'Convertion'])
+        assert time.monotonic() - start >= 0.2
+        assert client._limiter.stats()['throttled'] == 2
+
+    def test_failed_tab_returns_empty_frame(self, api, client):
+        frames = client.load_sheets(['Cohort', 'Inexistente'])
+        assert len(frames['Cohort']) == 2
+        assert frames['Inexistente'].empty
+
+    def test_multiple_spreadsheets(self, api, client):
+        result = client.load_spreadsheets({'planilha-a': ['Cohort'], 'planilha-b': ['Monetization']})
+        assert set(result) == {'planilha-a', 'planilha-b'}
+        assert len(result['planilha-b']['Monetization']) == 1
+
+    def test_facade_inside_running_loop(self, api, client):
+        """A fachada síncrona funciona mesmo com um event loop ativo"""
+        import asyncio
+
+        async def main():
+            return client.load_sheets(['Cohort'])
+
+        frames = asyncio.run(main())
+        assert len(frames['Cohort']) == 2
+
+    def test_cached_tab_not_downloaded_again(self, api, client):
+        """Abas em cache (também as carregadas pelo cliente síncrono) não geram requisição"""
+        client.load_sheets(['Cohort'])
+        frames = client.load_sheets(['Cohort', 'Monetization'])
+        assert len(frames['Cohort']) == 2
+        assert len(SlowSheetsHandler.auth_headers) == 2
+
+    def test_waits_for_a_load_in_progress(self, api, client):
+        """Range já em busca por outro caminho é esperado, não baixado de novo"""
+        key = client._cache_key(client._resolve_range('Cohort'))
+        client._cache.flights.begin([key])
+        cohort = client._values_to_dataframe('Cohort', SHEETS['Cohort'])
+        threading.Timer(0.1, client._cache.flights.finish, args=(key, cohort)).start()
+        frames = client.load_sheets(['Cohort'])
+        assert len(frames['Cohort']) == 2
+        assert SlowSheetsHandler.auth_headers == []
+
+
+def test_global_client_created_lazily(monkeypatch):
+    """Importar o módulo não cria o cliente; o primeiro uso compartilha backend e cache do sheets_client"""
+    monkeypatch.setattr(async_module, '_async_client', None)
+    sync_client = mock.Mock(backend=AsyncSheetsClient(limiter=TokenBucket(rate=100, capacity=10)).backend)
+    monkeypatch.setattr(async_module, 'sheets_client', sync_client)
+    client = async_module.get_async_sheets_client()
+    assert client is async_module.get_async_sheets_client()
+    assert client.backend is sync_client.backend
+    assert client._cache is sync_client._cache
+
+
+class FlakyHandler(SlowSheetsHandler):
+    """Responde 429 nas primeiras requisições"""
+    failures_left = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            fail = cls.failures_left > 0
+            cls.failures_left -= 1
+        if not fail:
+            return super().do_GET()
+        self.send_response(429)
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+
+def test_async_retries_quota_errors(client, monkeypatch):
+    FlakyHandler.failures_left = 2
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv('SHEETS_API_URL', f'http://127.0.0.1:{server.server_port}')
+    monkeypatch.setenv('SNAPSHOT_CACHE', 'False')
+    try:
+        frames = client.load_sheets(['Cohort'])
+    finally:
+        server.shutdown()
+    assert len(frames['Cohort']) == 2
+    assert client.stats()['quota_errors'] == 2
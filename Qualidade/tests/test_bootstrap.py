@@ -0,0 +1,57 @@
+# tests/test_bootstrap.py
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+import pytest
+from operational.utils.synthetic_data import generate
+from strategic.models.bootstrap import (
+    SharedArrays, attach_arrays, bootstrap_intervals, group_slices, resample_weights
+)
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return generate(1500, seed=7)
+
+
+class TestSharedArrays:
+    def test_workers_see_the_same_data_read_only(self):
+        source = {'activity': np.arange(12, dtype=np.float32).reshape(4, 3), 'group': np.array([0, 0, 1, 1])}
+        with SharedArrays(source) as shared:
+            arrays, blocks = attach_arrays(shared.spec)
+            np.testing.assert_array_equal(arrays['activity'], source['activity'])
+            with pytest.raises(ValueError):
+                arrays['group'][0] = 5
+            for block in blocks:
+                block.close()
+            names = [spec[0] for spec in shared.spec.values()]
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=names[0])
+
+
+class TestResampling:
+    def test_counts_stay_inside_each_group(self):
+        bounds = np.array([0, 3, 10])
+        starts, sizes = group_slices(bounds)
+        weights = resample_weights(starts, sizes, np.random.default_rng(0))
+        assert weights[:3].sum() == 3
+        assert weights[3:].sum() == 7
+
+
+class TestBootstrapIntervals:
+    def test_metrics_and_ordered_intervals(self, dataset):
+        result = bootstrap_intervals(dataset['players'], dataset['sessions'], dataset['purchases'],
+                                     n_replicates=60, seed=1, workers=1)
+        assert set(result.columns.get_level_values(0)) == {
+            'ltv_d90', 'ltv_d180', 'ltv_d365', 'retention_d1', 'retention_d7', 'retention_d30', 'arpdau'
+        }
+        for metric in ('ltv_d90', 'retention_d7', 'arpdau'):
+            assert (result[(metric, 'lower')] <= result[(metric, 'upper')]).all()
+        assert (result[('ltv_d90', 'estimate')] <= result[('ltv_d365', 'estimate')]).all()
+
+    def test_process_pool_matches_single_process(self, dataset):
+        args = (dataset['players'], dataset['sessions'], dataset['purchases'])
+        single = bootstrap_intervals(*args, n_replicates=50, seed=3, workers=1)
+        pooled = bootstrap_intervals(*args, n_replicates=50, seed=3, workers=2)
+        pd.testing.assert_frame_equal(single, pooled)
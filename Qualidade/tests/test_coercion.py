@@ -0,0 +1,73 @@
+# tests/test_coercion.py
+import numpy as np
+import pandas as pd
+import pytest
+from operational.utils.coercion import coerce_dataframe, parse_numbers
+
+
+class TestParseNumbers:
+    def test_pt_br_currency_and_percent(self):
+        series = pd.Series(['R$ 1.234,56', '0,8', '45%', '12,5%', '1.234.567', '-3,2'])
+        result = parse_numbers(series, decimal=',', thousands='.')
+        np.testing.assert_allclose(result, [1234.56, 0.8, 0.45, 0.125, 1234567.0, -3.2])
+
+    def test_en_us(self):
+        series = pd.Series(['$1,234.56', '0.8', '1,234,567'])
+        result = parse_numbers(series, decimal='.', thousands=',')
+        np.testing.assert_allclose(result, [1234.56, 0.8, 1234567.0])
+
+    def test_single_separator_is_decimal(self):
+        """0.8 numa planilha pt_BR continua sendo 0,8"""
+        assert parse_numbers(pd.Series(['0.8']), decimal=',', thousands='.')[0] == pytest.approx(0.8)
+
+    def test_leading_zero_is_not_a_thousands_group(self):
+        """0.125 e 0,5 numa planilha pt_BR são frações, não 125 e 5"""
+        result = parse_numbers(pd.Series(['0.125', '0,5', '-0.125']), decimal=',', thousands='.')
+        np.testing.assert_allclose(result, [0.125, 0.5, -0.125])
+
+    def test_invalid_values_become_nan(self):
+        result = parse_numbers(pd.Series(['abc', None, '']))
+        assert result.isna().all()
+
+
+class TestCoerceDataframe:
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({
+            'COHORT': ['2024-01-01', '2024-01-02', '2024-01-03'],
+            'USERS': ['1.000', '1.200', '1.100'],
+            'RETENTION_D1': ['80%', '82%', '79%'],
+            'REVENUE': ['R$ 15.000,50', 'R$ 18.000,00', 'R$ 16.500,25'],
+            'SEGMENT': ['whale', 'free', 'free'],
+        })
+
+    def test_schema_applied(self, df):
+        result = coerce_dataframe(df, {
+            'COHORT': 'date',
+            'USERS': 'int',
+            'RETENTION_D1': 'percent',
+            'REVENUE': 'currency',
+            'SEGMENT': 'category',
+        })
+        assert pd.api.types.is_datetime64_any_dtype(result['COHORT'])
+        assert result['USERS'].dtype == np.int16
+        assert result['USERS'].tolist() == [1000, 1200, 1100]
+        assert result['RETENTION_D1'].dtype == np.float32
+        np.testing.assert_allclose(result['RETENTION_D1'], [0.8, 0.82, 0.79], rtol=1e-6)
+        assert result['REVENUE'].dtype == np.float64
+        assert result['REVENUE'].sum() == pytest.approx(49500.75)
+        assert result['SEGMENT'].dtype == 'category'
+
+    def test_memory_reported_and_reduced(self, df):
+        result = coerce_dataframe(df, {'USERS': 'int', 'RETENTION_D1': 'percent', 'REVENUE': 'currency'})
+        memory = result.attrs['memory']
+        assert memory['after'] < memory['before']
+
+    def test_int_with_missing_is_nullable(self):
+        result = coerce_dataframe(pd.DataFrame({'DAU': ['10', None]}), {'DAU': 'int'})
+        assert str(result['DAU'].dtype) == 'Int64'
+        assert result['DAU'].isna().tolist() == [False, True]
+
+    def test_unknown_columns_ignored(self, df):
+        result = coerce_dataframe(df, {'MISSING': 'int'})
+        pd.testing.assert_frame_equal(result, df)
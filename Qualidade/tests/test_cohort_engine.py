@@ -0,0 +1,96 @@
+# tests/test_cohort_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+from config.settings import settings
+from operational.analytics.cohort_engine import (
+    build_retention_matrix, cohort_counts, has_session_columns, retention_matrix, retention_summary
+)
+from operational.utils.coercion import coerce_dataframe
+
+
+@pytest.fixture
+def sessions():
+    """Sessões aleatórias com sessões repetidas no mesmo dia"""
+    rng = np.random.default_rng(7)
+    n_players = 300
+    installs = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 20, n_players), unit='D')
+    rows = []
+    for player, install in enumerate(installs):
+        days = np.concatenate([[0, 0], rng.integers(0, 40, rng.integers(0, 12))])
+        for day in days:
+            rows.append((f'player_{player}', install, install + pd.Timedelta(days=int(day))))
+    return pd.DataFrame(rows, columns=['player_id', 'install_date', 'session_date'])
+
+
+def naive_counts(sessions, max_day):
+    """Cálculo por laços, como no notebook Board_Analysis"""
+    df = sessions.copy()
+    df['day'] = (df['session_date'] - df['install_date']).dt.days
+    result = {}
+    for install, cohort in df.groupby('install_date'):
+        result[install] = [cohort[cohort['day'] == day]['player_id'].nunique() for day in range(max_day + 1)]
+    return pd.DataFrame.from_dict(result, orient='index')
+
+
+class TestCohortEngine:
+    def test_counts_match_naive_loops(self, sessions):
+        counts, sizes = cohort_counts(sessions, max_day=30)
+        expected = naive_counts(sessions, 30)
+        np.testing.assert_array_equal(counts.to_numpy(), expected.to_numpy())
+        assert (counts[0] == sizes).all()
+
+    def test_precomputed_day_column(self, sessions):
+        sessions['days_since_install'] = (sessions['session_date'] - sessions['install_date']).dt.days
+        by_dates, _ = cohort_counts(sessions, max_day=10)
+        by_days, _ = cohort_counts(sessions, max_day=10, day_col='days_since_install')
+        pd.testing.assert_frame_equal(by_dates, by_days)
+
+    def test_unobserved_days_are_nan(self):
+        sessions = pd.DataFrame({
+            'player_id': ['a', 'b', 'b'],
+            'install_date': pd.to_datetime(['2024-01-01', '2024-01-05', '2024-01-05']),
+            'session_date': pd.to_datetime(['2024-01-01', '2024-01-05', '2024-01-06']),
+        })
+        matrix = build_retention_matrix(sessions, max_day=3)
+        # coorte de 05/01 só foi observada até o dia 1
+        assert matrix.loc['2024-01-05', 1] == 1.0
+        assert np.isnan(matrix.loc['2024-01-05', 2])
+        assert matrix.loc['2024-01-01', 3] == 0.0
+
+    def test_blank_dates_are_ignored(self, sessions):
+        """Datas em branco na planilha viram NaT/NaN e não entram na matriz"""
+        blank = pd.DataFrame({
+            'player_id': ['new', 'new', 'player_0'],
+            'install_date': [None, None, sessions.loc[0, 'install_date']],
+            'session_date': [sessions.loc[0, 'session_date'], None, None],
+        })
+        counts, sizes = cohort_counts(pd.concat([sessions, blank], ignore_index=True), max_day=10)
+        expected, expected_sizes = cohort_counts(sessions, max_day=10)
+        pd.testing.assert_frame_equal(counts, expected)
+        pd.testing.assert_series_equal(sizes, expected_sizes)
+
+    def test_sheet_dates_through_the_schema(self):
+        """Datas dd/mm/aaaa da planilha pt_BR, tipadas pelo schema da aba Cohort"""
+        sheet = pd.DataFrame({
+            'player_id': ['a', 'a', 'b'],
+            'install_date': ['01/02/2024', '01/02/2024', '12/02/2024'],
+            'session_date': ['01/02/2024', '03/02/2024', '13/02/2024'],
+        })
+        sessions = coerce_dataframe(sheet, settings.get_sheet_config('Cohort')['dtypes'], locale='pt_BR')
+        counts, sizes = cohort_counts(sessions, max_day=2)
+        assert list(counts.index.strftime('%Y-%m-%d')) == ['2024-02-01', '2024-02-12']
+        assert counts.loc['2024-02-01'].tolist() == [1, 0, 1]
+        assert counts.loc['2024-02-12'].tolist() == [0, 1, 0]
+
+    def test_summary(self, sessions):
+        counts, sizes = cohort_counts(sessions, max_day=7)
+        matrix = retention_matrix(counts, sizes)
+        summary = retention_summary(matrix, sizes)
+        assert summary.loc[0, 'retention_rate'] == 1.0
+        expected = counts[7].sum() / sizes.sum()
+        assert summary.loc[7, 'weighted_retention_rate'] == pytest.approx(expected)
+
+    def test_has_session_columns(self, sessions):
+        assert has_session_columns(sessions)
+        assert not has_session_columns(pd.DataFrame({'COHORT': [], 'USERS': []}))
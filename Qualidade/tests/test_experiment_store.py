@@ -0,0 +1,118 @@
+# tests/test_experiment_store.py
+import numpy as np
+import pandas as pd
+import pytest
+from operational.analytics.ab_test_engine import analyze_experiments, msprt
+from operational.analytics.experiment_store import KEY, ExperimentStore, batch_stats
+from operational.utils.synthetic_data import generate_experiment_users
+
+
+@pytest.fixture(scope='module')
+def users():
+    return generate_experiment_users(20_000, n_experiments=3, seed=11)
+
+
+def null_batch(rng, n, experiments=200):
+    """Lote A/A: controle e variante com a mesma distribuição"""
+    return pd.DataFrame({
+        'experiment': rng.integers(0, experiments, n).astype(str),
+        'variant': rng.choice(['control', 'b'], n),
+        'revenue': rng.lognormal(0, 1, n),
+    })
+
+
+class TestIngestion:
+    def test_batches_add_up_to_the_full_table(self, users):
+        store = ExperimentStore(root=None)
+        for batch in np.array_split(users, 3):
+            store.ingest(batch)
+        full = batch_stats(users, ['converted', 'revenue', 'retained_d7'])
+        pd.testing.assert_frame_equal(store.stats().set_index(['experiment', 'variant', 'metric']),
+                                      full.sort_index(), check_like=True)
+
+        fixed = analyze_experiments(users, rank_metrics=()).set_index(['experiment', 'variant', 'metric'])
+        live = store.results().set_index(['experiment', 'variant', 'metric'])
+        np.testing.assert_allclose(live['diff'], fixed.loc[live.index, 'diff'])
+
+    def test_batch_ids_are_ingested_once(self, users):
+        store = ExperimentStore(root=None)
+        assert store.ingest(users, batch_id='day-1') == len(users)
+        assert store.ingest(users, batch_id='day-1') == 0
+        assert store.info()['rows'] == len(users)
+
+    def test_state_survives_restarts(self, users, tmp_path):
+        store = ExperimentStore(root=tmp_path)
+        store.ingest_new_rows(users.iloc[:5000], source='ABTest')
+        store.ingest_new_rows(users, source='ABTest')
+
+        restarted = ExperimentStore(root=tmp_path)
+        assert restarted.info()['offsets'] == {'ABTest': len(users)}
+        pd.testing.assert_frame_equal(restarted.results(), store.results())
+        assert restarted.ingest_new_rows(users, source='ABTest') == 0
+        assert restarted.results()['looks'].eq(2).all()
+
+    def test_batch_ids_survive_restarts(self, users, tmp_path):
+        store = ExperimentStore(root=tmp_path)
+        store.ingest(users.iloc[:1000], batch_id='day-1')
+        store.ingest(users.iloc[1000:2000], batch_id='day-2')
+        restarted = ExperimentStore(root=tmp_path)
+        assert restarted.ingest(users.iloc[:1000], batch_id='day-1') == 0
+        assert restarted.info() == store.info()
+
+        restarted.reset()
+        assert ExperimentStore(root=tmp_path).ingest(users.iloc[:1000], batch_id='day-1') == 1000
+
+    def test_rewritten_source_resets_the_store(self, users, tmp_path):
+        store = ExperimentStore(root=tmp_path)
+        store.ingest_new_rows(users, source='ABTest')
+        store.ingest_new_rows(users.iloc[:1000], source='ABTest')
+        assert store.info()['rows'] == 1000
+
+
+class TestSequential:
+    def test_no_evidence_without_a_difference(self):
+        p_value, half_width = msprt(np.array([0.0]), np.array([1.0]), np.array([1.0]))
+        assert p_value[0] == 1.0
+        assert half_width[0] == pytest.approx(np.sqrt(2 * (2 * np.log(20) + np.log(2))))
+
+    def test_p_values_never_increase(self):
+        rng = np.random.default_rng(2)
+        store = ExperimentStore(root=None)
+        previous = None
+        for _ in range(5):
+            store.ingest(null_batch(rng, 20_000, experiments=20))
+            current = store.results()['p_value'].to_numpy()
+            if previous is not None:
+                assert (current <= previous).all()
+            previous = current
+
+    def test_mixing_prior_is_fixed_at_the_first_look(self, tmp_path):
+        rng = np.random.default_rng(5)
+        store = ExperimentStore(root=tmp_path)
+        store.ingest(null_batch(rng, 5_000, experiments=5))
+        first = store.results().set_index(KEY)
+        for scale in (2.0, 5.0):
+            batch = null_batch(rng, 5_000, experiments=5)
+            batch['revenue'] *= scale
+            store.ingest(batch)
+        later = ExperimentStore(root=tmp_path).results().set_index(KEY)
+        assert not np.allclose(later['control_mean'], first['control_mean'])
+        np.testing.assert_array_equal(later['tau'], first['tau'])
+
+    def test_peeking_keeps_the_false_positive_rate(self):
+        rng = np.random.default_rng(3)
+        store = ExperimentStore(root=None)
+        for _ in range(20):
+            store.ingest(null_batch(rng, 40_000))
+        assert store.results()['significant'].mean() <= 0.05
+
+    def test_detects_a_real_effect(self):
+        rng = np.random.default_rng(4)
+        store = ExperimentStore(root=None)
+        for _ in range(5):
+            batch = null_batch(rng, 20_000, experiments=1)
+            batch.loc[batch['variant'] == 'b', 'revenue'] *= 1.2
+            store.ingest(batch)
+        result = store.results().iloc[0]
+        assert result['significant']
+        assert result['cs_low'] > 0
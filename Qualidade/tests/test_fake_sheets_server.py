@@ -0,0 +1,104 @@
+# tests/test_fake_sheets_server.py
+from unittest import mock
+
+import pandas as pd
+import pytest
+from fake_sheets_server import FakeSheetsServer
+from operational.utils import sheets_client as client_module
+from operational.utils.async_sheets_client import AsyncSheetsClient
+from operational.utils.rate_limiter import TokenBucket
+from operational.utils.sheets_backends import GoogleBackend, slice_values, split_range
+from operational.utils.sheets_client import GoogleSheetsClient
+from operational.utils.snapshot_cache import SnapshotCache
+from operational.utils.telemetry import registry
+
+SPREADSHEET_ID = 'fake-spreadsheet'
+COHORT_VALUES = [
+    ['COHORT', 'USERS', 'RETENTION_D1', 'RETENTION_D7', 'RETENTION_D30'],
+    ['2024-01', '1000', '0.8', '0.45', '0.25'],
+    ['2024-02', '1200', '0.82', '0.48', '0.27'],
+]
+
+
+@pytest.fixture
+def server(tmp_path):
+    with FakeSheetsServer(tmp_path / 'sheets') as server:
+        server.set_tab(SPREADSHEET_ID, 'Cohort', COHORT_VALUES)
+        server.generate_tab(SPREADSHEET_ID, 'Big', rows=500, columns=4)
+        yield server
+
+
+@pytest.fixture
+def client(server, tmp_path, monkeypatch):
+    """Cliente real (backend Google: pool, retries, cota) apontando para o servidor local"""
+    monkeypatch.setenv('API_BACKOFF_BASE', '0.01')
+    monkeypatch.setenv('REVISION_CHECK_INTERVAL', '0')
+    backend = GoogleBackend.emulator(server.url, limiter=TokenBucket(rate=1000, capacity=1000),
+                                     spreadsheet_id=SPREADSHEET_ID)
+    with mock.patch.object(client_module, 'snapshot_cache', SnapshotCache(tmp_path / 'snapshots')):
+        yield GoogleSheetsClient(backend)
+
+
+class TestRanges:
+    def test_split_range(self):
+        assert split_range("'Minha Aba'!A1:B2") == ('Minha Aba', 'A1:B2')
+        assert split_range('Cohort') == ('Cohort', '')
+
+    def test_slice_values_trims_trailing_empties(self):
+        values = [['a', 'b', ''], ['c', '', ''], ['', '', '']]
+        assert slice_values(values, '') == [['a', 'b'], ['c']]
+        assert slice_values(values, 'B1:C2') == [['b']]
+        assert slice_values(values, 'A2:A') == [['c']]
+
+
+class TestFakeSheetsServer:
+    def test_client_reads_through_the_fake(self, client, server):
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == 2
+        assert df['USERS'].tolist() == [1000, 1200]
+        assert server.requests['spreadsheets.get'] >= 1  # gridProperties para dimensionar o range
+        assert server.requests['values.get'] == 1
+        assert server.requests['files.get'] == 1
+
+    def test_batch_get(self, client, server):
+        frames = client.get_sheets_data(['Cohort', 'Big'])
+        assert len(frames['Big']) == 500
+        assert server.requests['values.batchGet'] == 1
+
+    def test_quota_errors_are_retried(self, client, server):
+        server.fail_next(2, status=429)
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == 2
+        assert server.requests['error.429'] == 2
+        assert client.stats()['retries'] == 2
+
+    def test_edit_changes_drive_version(self, client, server):
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        client.get_sheet_data('Cohort')
+        assert server.requests['values.get'] == 1  # versão igual: reaproveitado
+
+        server.set_tab(SPREADSHEET_ID, 'Cohort', COHORT_VALUES + [['2024-03', '900', '0.7', '0.4', '0.2']])
+        client._cache.clear()
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == 3
+        assert server.requests['values.get'] == 2
+
+    def test_async_client(self, client, server):
+        async_client = AsyncSheetsClient(limiter=TokenBucket(rate=1000, capacity=1000), backend=client.backend)
+        frames = async_client.load_sheets(['Cohort', 'Big'])
+        assert len(frames['Cohort']) == 2
+        assert len(frames['Big']) == 500
+
+    def test_request_spans_and_payload_sizes(self, client, server):
+        registry.reset()
+        client.get_sheet_data('Big')
+        histograms = registry.to_dict()['histograms']
+        series = {name: {tuple(sorted(item['labels'].items())): item for item in items}
+                  for name, items in histograms.items()}
+        values = (('operation', 'values'),)
+        assert series['sheets_http_request_bytes'][values]['sum'] > 0
+        assert series['sheets_json_decode_seconds'][values]['count'] == 1
+        assert series['sheets_backend_call_rows'][(('backend', 'google'), ('operation', 'values'))]['sum'] == 501
+        assert series['sheets_dataframe_build_cells'][(('sheet', 'Big'),)]['sum'] == 2000
+        assert 'sheets_service_build_seconds' in series
@@ -1,11 +1,11 @@
 # tests/test_google_sheets_integration.py
 import pytest
-from operational.utils.google_sheets_client import sheets_client
+from operational.utils.sheets_client import sheets_client
 
 class TestGoogleSheetsIntegration:
     def test_connection(self):
         """Testa conexão com Google Sheets"""
-        sheets = sheets_client.get_all_sheets()
+        sheets = [sheet['name'] for sheet in sheets_client.get_all_sheets()]
         assert len(sheets) > 0
         assert 'Cohort' in sheets
         assert 'Monetization' in sheets
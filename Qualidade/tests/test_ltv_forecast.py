@@ -0,0 +1,96 @@
+# tests/test_ltv_forecast.py
+import numpy as np
+import pandas as pd
+import pytest
+from strategic.models.ltv_forecast import (
+    ParameterCache, data_hash, fit_power_law, forecast_ltv, ltv_inputs, power_sums
+)
+
+DAYS = pd.RangeIndex(31, name='day')
+
+
+def power_law_matrix(a, b):
+    """Retenção exata a·t^(-b) (dia 0 = 1) para cada par (a, b)"""
+    t = np.maximum(DAYS.to_numpy(), 1).astype(float)
+    rates = np.asarray(a)[:, None] * t[None, :] ** -np.asarray(b)[:, None]
+    rates[:, 0] = 1.0
+    return pd.DataFrame(rates, columns=DAYS)
+
+
+class TestFit:
+    def test_recovers_parameters_for_every_row(self):
+        a, b = np.array([0.4, 0.55, 0.3]), np.array([0.5, 0.8, 0.35])
+        params = fit_power_law(power_law_matrix(a, b))
+        np.testing.assert_allclose(params['a'], a)
+        np.testing.assert_allclose(params['b'], b)
+        assert not params['fallback'].any()
+
+    def test_unobserved_days_are_ignored(self):
+        retention = power_law_matrix([0.4], [0.5])
+        retention.loc[0, 10:] = np.nan
+        params = fit_power_law(retention)
+        assert params['fit_points'].iloc[0] == 9
+        assert params['b'].iloc[0] == pytest.approx(0.5)
+
+    def test_sparse_rows_use_the_pooled_curve(self):
+        retention = power_law_matrix([0.4, 0.4], [0.5, 0.5])
+        retention.loc[1, 2:] = np.nan
+        params = fit_power_law(retention)
+        assert params['fallback'].tolist() == [False, True]
+        assert params['b'].iloc[1] == pytest.approx(0.5)
+
+
+class TestForecast:
+    def test_power_sums_match_the_exact_sum(self):
+        b = np.array([0.0, 0.4, 1.0, 1.6])
+        sums = power_sums(b, [10, 364])
+        for last_day, values in sums.items():
+            exact = [(np.arange(1, last_day + 1) ** -value).sum() for value in b]
+            np.testing.assert_allclose(values, exact, rtol=1e-7)
+
+    def test_ltv_is_arpdau_times_expected_active_days(self):
+        retention = power_law_matrix([1.0, 0.4], [0.0, 0.5])
+        arpdau = pd.Series([2.0, 1.0], index=retention.index)
+        forecast = forecast_ltv(retention, arpdau, cache=ParameterCache())
+        # Retenção sempre 1: 90 dias ativos em D90
+        assert forecast.loc[0, 'ltv_d90'] == pytest.approx(180.0)
+        assert forecast.loc[1, 'ltv_d90'] < forecast.loc[1, 'ltv_d180'] < forecast.loc[1, 'ltv_d365']
+        expected = 1 + 0.4 * (np.arange(1, 90) ** -0.5).sum()
+        assert forecast.loc[1, 'ltv_d90'] == pytest.approx(expected)
+
+    def test_parameters_are_cached_by_data_hash(self):
+        retention = power_law_matrix([0.4], [0.5])
+        cache = ParameterCache()
+        forecast_ltv(retention, 1.0, cache=cache)
+        forecast_ltv(retention.copy(), 2.0, horizons=(30,), cache=cache)
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1}
+
+        changed = retention.copy()
+        changed.iloc[0, 5] = 0.1
+        assert data_hash(changed) != data_hash(retention)
+
+
+class TestInputs:
+    def test_retention_and_arpdau_by_segment(self):
+        players = pd.DataFrame({
+            'player_id': [1, 2, 3],
+            'install_date': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-03']),
+            'segment': ['whale', 'free', 'whale'],
+        })
+        sessions = pd.DataFrame({
+            'player_id': [1, 1, 1, 1, 2, 3, 3],
+            'session_date': pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-02', '2024-01-03',
+                                            '2024-01-01', '2024-01-03', '2024-01-04']),
+        })
+        purchases = pd.DataFrame({'player_id': [1, 3, 99], 'value': [10.0, 2.0, 50.0]})
+
+        retention, arpdau = ltv_inputs(players, sessions, purchases, by=['segment'], max_day=4)
+        assert retention.loc['whale', 0] == 1.0
+        assert retention.loc['whale', 1] == 1.0
+        # Dia 2: o jogador 3 ainda não viveu, só o 1 entra no denominador
+        assert retention.loc['whale', 2] == 1.0
+        assert retention.loc['whale', 3] == 0.0
+        assert np.isnan(retention.loc['whale', 4])
+        # Receita do segmento por dia ativo (3 dias do jogador 1 + 2 do jogador 3)
+        assert arpdau['whale'] == pytest.approx(12.0 / 5)
+        assert arpdau['free'] == 0.0
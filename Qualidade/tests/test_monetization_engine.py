@@ -0,0 +1,93 @@
+# tests/test_monetization_engine.py
+import numpy as np
+import pandas as pd
+import pytest
+from config.settings import settings
+from operational.analytics.monetization_engine import (
+    UNKNOWN_SEGMENT, daily_revenue, flatten_purchases, has_purchase_columns, monetization_summary
+)
+from operational.utils.coercion import coerce_dataframe
+
+
+@pytest.fixture
+def players():
+    """Jogadores no formato do notebook Board_Analysis (lista de compras por jogador)"""
+    rng = np.random.default_rng(123)
+    segments = rng.choice(['whale', 'dolphin', 'minnow', 'free'], size=500, p=[0.02, 0.08, 0.2, 0.7])
+    rows = []
+    for player, segment in enumerate(segments):
+        active_days = int(rng.integers(1, 90))
+        n_purchases = 0 if segment == 'free' else int(rng.integers(0, 6))
+        purchases = [{'day': int(d), 'value': float(v)}
+                     for d, v in zip(rng.integers(0, 90, n_purchases), rng.uniform(0.99, 100, n_purchases))]
+        rows.append({'player_id': player, 'segment': segment, 'active_days': active_days,
+                     'purchases': purchases, 'total_spent': sum(p['value'] for p in purchases)})
+    return pd.DataFrame(rows)
+
+
+class TestMonetizationEngine:
+    def test_flatten_purchases(self, players):
+        flat = flatten_purchases(players)
+        assert has_purchase_columns(flat)
+        assert len(flat) == players['purchases'].str.len().sum()
+        assert flat['value'].sum() == pytest.approx(players['total_spent'].sum())
+
+    def test_daily_revenue_matches_naive_loops(self, players):
+        expected = []
+        for day in range(90):
+            day_revenue = 0
+            for _, player in players.iterrows():
+                for purchase in player['purchases']:
+                    if purchase['day'] == day:
+                        day_revenue += purchase['value']
+            expected.append(day_revenue)
+
+        revenue = daily_revenue(flatten_purchases(players), n_days=90)
+        np.testing.assert_allclose(revenue.to_numpy(), expected)
+
+    def test_summary_matches_pandas(self, players):
+        summary = monetization_summary(players, flatten_purchases(players))
+        paying = players[players['total_spent'] > 0]
+
+        assert summary['total_revenue'] == pytest.approx(players['total_spent'].sum())
+        assert summary['paying_players'] == len(paying)
+        assert summary['conversion_rate'] == pytest.approx(len(paying) / len(players))
+        assert summary['arppu'] == pytest.approx(paying['total_spent'].mean())
+        assert summary['arpdau'] == pytest.approx(players['total_spent'].sum() / players['active_days'].sum())
+
+        ltv = players.groupby('segment')['total_spent'].mean()
+        segments = summary['segments']
+        np.testing.assert_allclose(segments.loc[ltv.index, 'ltv'], ltv.to_numpy())
+        assert segments['revenue_share'].sum() == pytest.approx(1.0)
+
+    def test_blank_segment_is_unknown(self, players):
+        players = players.astype({'segment': 'category'})
+        players.loc[:9, 'segment'] = None
+        segments = monetization_summary(players, flatten_purchases(players))['segments']
+        assert segments.loc[UNKNOWN_SEGMENT, 'players'] == 10
+        assert segments['players'].sum() == len(players)
+        assert segments['revenue'].sum() == pytest.approx(players['total_spent'].sum())
+
+    def test_sheet_text_through_the_schema(self):
+        """Aba de compras em texto pt_BR, tipada pelo schema da aba Monetization"""
+        sheet = pd.DataFrame({
+            'player_id': ['1', '1', '2', '3'],
+            'day': ['0', '2', '2', ''],
+            'value': ['4,99', '1.000,00', '0,99', '9,99'],
+            'segment': ['whale', 'whale', '', 'minnow'],
+            'active_days': ['3', '3', '1', '2'],
+        })
+        purchases = coerce_dataframe(sheet, settings.get_sheet_config('Monetization')['dtypes'], locale='pt_BR')
+        np.testing.assert_allclose(daily_revenue(purchases).to_numpy(), [4.99, 0.0, 1000.99])
+        players = purchases[['player_id', 'segment', 'active_days']].drop_duplicates('player_id')
+        segments = monetization_summary(players, purchases)['segments']
+        assert segments.loc[UNKNOWN_SEGMENT, 'revenue'] == pytest.approx(0.99)
+        assert segments.loc['whale', 'revenue'] == pytest.approx(1004.99)
+
+    def test_empty_purchases(self):
+        players = pd.DataFrame({'player_id': [1, 2], 'active_days': [3, 4]})
+        purchases = pd.DataFrame({'player_id': [], 'day': [], 'value': []})
+        summary = monetization_summary(players, purchases)
+        assert summary['total_revenue'] == 0
+        assert summary['arppu'] == 0
+        assert daily_revenue(purchases).empty
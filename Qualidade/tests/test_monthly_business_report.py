@@ -0,0 +1,95 @@
+# tests/test_monthly_business_report.py
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+from operational.utils.synthetic_data import generate, iter_chunks
+from strategic.reports.daily_aggregates import aggregate_chunk, combine, load, materialize
+from strategic.reports.monthly_business_report import build_report, generate_history, generate_report
+
+OPTIONS = {'n_days': 95, 'install_days': 95}
+
+
+@pytest.fixture(scope='module')
+def dataset():
+    return generate(1500, seed=4, chunk_size=500, **OPTIONS)
+
+
+@pytest.fixture(scope='module')
+def aggregates(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('aggregates')
+    materialize(iter_chunks(1500, seed=4, chunk_size=500, **OPTIONS), directory)
+    return directory
+
+
+class TestAggregates:
+    def test_chunks_add_up_to_one_pass(self, dataset):
+        chunked = combine(aggregate_chunk(**chunk) for chunk in iter_chunks(1500, seed=4, chunk_size=500, **OPTIONS))
+        single = combine([aggregate_chunk(**dataset)])
+        for table in ('daily', 'monthly', 'cohorts'):
+            pd.testing.assert_frame_equal(chunked[table], single[table])
+
+    def test_blank_dates_are_ignored(self, dataset):
+        blank = {name: frame.copy() for name, frame in dataset.items() if name in ('players', 'sessions', 'purchases')}
+        new_player = blank['players'].iloc[[0]].assign(player_id=-1, install_date=pd.NaT)
+        blank['players'] = pd.concat([blank['players'], new_player], ignore_index=True)
+        blank['sessions'] = pd.concat([blank['sessions'], blank['sessions'].iloc[[0]].assign(session_date=pd.NaT),
+                                       blank['sessions'].iloc[[0]].assign(player_id=-1)], ignore_index=True)
+        blank['purchases'] = pd.concat([blank['purchases'], blank['purchases'].iloc[[0]].assign(purchase_date=pd.NaT)],
+                                       ignore_index=True)
+        result, expected = aggregate_chunk(**blank), aggregate_chunk(**dataset)
+        for table in ('daily', 'monthly', 'cohorts'):
+            pd.testing.assert_frame_equal(result[table], expected[table])
+
+    def test_rematerializing_drops_old_partitions(self, tmp_path):
+        materialize(iter_chunks(300, seed=1, chunk_size=300, **OPTIONS), tmp_path)
+        meta = materialize(iter_chunks(300, seed=1, chunk_size=300, n_days=40, install_days=40), tmp_path)
+        for table in ('daily', 'monthly', 'cohorts'):
+            assert sorted(path.stem for path in (tmp_path / table).glob('*.parquet')) == meta['months']
+        assert [path.name for path in tmp_path.iterdir() if path.name.startswith('.')] == []
+
+    def test_matches_the_raw_rows(self, dataset, aggregates):
+        sessions, purchases = dataset['sessions'], dataset['purchases']
+        daily = load('daily', ['2024-02'], aggregates)
+        february = sessions[sessions['session_date'].dt.to_period('M') == '2024-02']
+        dau = february.groupby('session_date')['player_id'].nunique()
+        pd.testing.assert_series_equal(daily.groupby(level='date')['dau'].sum(), dau,
+                                       check_names=False, check_index_type=False, check_dtype=False)
+
+        monthly = load('monthly', ['2024-02'], aggregates)
+        assert monthly['mau'].sum() == february['player_id'].nunique()
+        spent = purchases.loc[purchases['purchase_date'].dt.to_period('M') == '2024-02', 'value'].sum()
+        assert daily['revenue'].sum() == pytest.approx(spent)
+
+
+class TestReport:
+    def test_kpis_and_cohort_cutoff(self, dataset, aggregates):
+        report = build_report('2024-02', aggregates)
+        purchases = dataset['purchases']
+        in_month = purchases[purchases['purchase_date'].dt.to_period('M') == '2024-02']
+        assert report['kpis']['revenue'] == pytest.approx(in_month['value'].sum())
+        assert report['kpis']['payers'] == in_month['player_id'].nunique()
+        assert report['segments'].loc['Total', 'revenue'] == pytest.approx(report['segments'].drop('Total')['revenue'].sum())
+
+        cohorts = report['cohorts']
+        # No corte de 29/02 nenhum jogador instalado em fevereiro tem 30 dias de vida
+        assert np.isnan(cohorts.loc[('2024-02', 'Total'), 'retention_d30'])
+        assert 0 < cohorts.loc[('2024-01', 'Total'), 'retention_d7'] < 1
+
+        players = dataset['players']
+        january = players[players['install_date'].dt.to_period('M') == '2024-01']
+        assert cohorts.loc[('2024-01', 'Total'), 'players'] == len(january)
+
+    def test_renders_every_format(self, aggregates, tmp_path):
+        paths = generate_report('2024-02', output_dir=tmp_path, directory=aggregates)
+        assert set(paths) == {'html', 'pdf', 'xlsx'}
+        assert 'Relatório Mensal de Negócio — 2024-02' in paths['html'].read_text(encoding='utf-8')
+        assert paths['pdf'].read_bytes().startswith(b'%PDF')
+        workbook = openpyxl.load_workbook(paths['xlsx'])
+        assert workbook.sheetnames == ['Resumo', 'Segmentos', 'Diario', 'Coortes']
+
+    def test_history_in_parallel(self, aggregates, tmp_path):
+        results = generate_history(months=4, end_month='2024-04', formats=('xlsx',),
+                                   output_dir=tmp_path, directory=aggregates, workers=2)
+        assert list(results) == ['2024-01', '2024-02', '2024-03', '2024-04']
+        assert all(paths['xlsx'].exists() for paths in results.values())
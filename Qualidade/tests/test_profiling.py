@@ -0,0 +1,22 @@
+# tests/test_profiling.py
+import time
+
+from operational.utils.profiling import import_profile, record, timed, timings
+
+
+class TestProfiling:
+    def test_timed_records_duration(self):
+        with timed('test.sleep'):
+            time.sleep(0.01)
+        assert timings()['test.sleep'] >= 0.01
+
+    def test_record(self):
+        record('test.manual', 1.5)
+        assert timings()['test.manual'] == 1.5
+
+    def test_import_profile_sorted_by_cumulative_time(self):
+        profile = import_profile('json', top=None)
+        assert profile
+        assert any(name == 'json' for name, _, _ in profile)
+        cumulative = [entry[2] for entry in profile]
+        assert cumulative == sorted(cumulative, reverse=True)
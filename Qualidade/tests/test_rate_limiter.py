@@ -0,0 +1,73 @@
+# tests/test_rate_limiter.py
+import asyncio
+import threading
+import time
+
+import pytest
+from operational.utils.rate_limiter import TokenBucket, backoff_delay
+
+
+class TestTokenBucket:
+    def test_burst_passes_without_waiting(self):
+        bucket = TokenBucket(rate=1, capacity=5)
+        waits = [bucket.acquire() for _ in range(5)]
+        assert waits == [0.0] * 5
+        assert bucket.stats()['throttled'] == 0
+
+    def test_waits_after_burst(self):
+        """Sem tokens, a espera segue a taxa de reposição"""
+        bucket = TokenBucket(rate=20, capacity=2)
+        start = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+        assert elapsed == pytest.approx(4 / 20, abs=0.05)
+        assert bucket.stats()['throttled'] == 4
+
+    def test_thread_safe(self):
+        """Threads concorrentes nunca passam da taxa configurada"""
+        bucket = TokenBucket(rate=50, capacity=1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=bucket.acquire) for _ in range(11)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.monotonic() - start >= 10 / 50 - 0.01
+        assert bucket.stats()['acquired'] == 11
+
+    def test_async_acquire(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+
+        async def main():
+            start = time.monotonic()
+            await asyncio.gather(*(bucket.acquire_async() for _ in range(5)))
+            return time.monotonic() - start
+
+        assert asyncio.run(main()) == pytest.approx(4 / 20, abs=0.05)
+
+    def test_per_minute(self):
+        bucket = TokenBucket.per_minute(60, burst=10)
+        assert bucket.rate == 1
+        assert bucket.capacity == 10
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+
+
+class TestBackoffDelay:
+    def test_exponential_with_jitter(self):
+        """A espera fica entre base e o teto exponencial da tentativa"""
+        for attempt in range(6):
+            delay = backoff_delay(attempt, base=0.5, cap=8)
+            assert 0.5 <= delay <= min(8, 0.5 * 2 ** attempt)
+
+    def test_retry_after_wins(self):
+        assert backoff_delay(3, retry_after='1.5') == 1.5
+
+    def test_retry_after_capped(self):
+        assert backoff_delay(0, retry_after=120, cap=32) == 32
+
+    def test_invalid_retry_after_ignored(self):
+        assert 0.5 <= backoff_delay(0, retry_after='Wed, 21 Oct 2015 07:28:00 GMT', base=0.5) <= 0.5
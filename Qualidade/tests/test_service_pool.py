@@ -0,0 +1,105 @@
+# tests/test_service_pool.py
+import threading
+from unittest import mock
+
+import pytest
+from operational.utils import service_pool as pool_module
+from operational.utils.service_pool import SheetsServicePool
+
+
+@pytest.fixture
+def pool():
+    """Pool com credenciais e build falsos (sem acesso à rede)"""
+    creds = mock.Mock(valid=True)
+    with mock.patch.object(pool_module.service_account.Credentials,
+                           'from_service_account_info', return_value=creds), \
+         mock.patch.object(pool_module, 'build', side_effect=lambda *a, **k: object()):
+        yield SheetsServicePool(credentials_loader=lambda: {'client_email': 'test@example.com'})
+
+
+class TestSheetsServicePool:
+    def test_reuses_released_service(self, pool):
+        """Serviço devolvido é reutilizado em vez de reconstruído"""
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as second:
+            pass
+        assert first is second
+        stats = pool.stats()
+        assert stats['builds'] == 1
+        assert stats['hits'] == 1
+        assert stats['credential_loads'] == 1
+
+    def test_concurrent_checkouts_get_distinct_services(self, pool):
+        """Sessões simultâneas não compartilham o mesmo httplib2.Http"""
+        a = pool.checkout()
+        b = pool.checkout()
+        assert a is not b
+        pool.release(a)
+        pool.release(b)
+        assert pool.stats()['builds'] == 2
+        assert pool.stats()['idle'] == 2
+
+    def test_credentials_loaded_once_across_threads(self, pool):
+        """Credenciais são lidas uma única vez mesmo com várias threads"""
+        def worker():
+            for _ in range(20):
+                with pool.acquire():
+                    pass
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stats = pool.stats()
+        assert stats['credential_loads'] == 1
+        assert stats['hits'] + stats['builds'] == 160
+        assert stats['builds'] <= 8
+
+    def test_expired_token_refreshed_once(self, pool):
+        """Token expirado é renovado uma vez e reaproveitado"""
+        creds = pool.credentials
+        creds.valid = False
+
+        def refresh(request):
+            creds.valid = True
+
+        creds.refresh.side_effect = refresh
+        with pool.acquire():
+            pass
+        with pool.acquire():
+            pass
+        assert creds.refresh.call_count == 1
+        assert pool.stats()['token_refreshes'] == 1
+
+    def test_failed_token_refresh_keeps_the_service_pooled(self, pool):
+        """Erro ao renovar o token não deixa serviço emprestado para sempre"""
+        with pool.acquire():
+            pass
+        creds = pool.credentials
+        creds.valid = False
+        creds.refresh.side_effect = RuntimeError('sem rede')
+        with pytest.raises(RuntimeError):
+            pool.checkout()
+        assert pool.stats()['idle'] == 1
+
+    def test_separate_queues_per_api(self, pool):
+        """Serviços do Drive e do Sheets não se misturam"""
+        with pool.acquire() as sheets:
+            pass
+        with pool.acquire('drive', 'v3') as drive:
+            pass
+        assert sheets is not drive
+        assert pool.stats()['builds'] == 2
+
+    def test_changing_loader_resets_pool(self, pool):
+        """Trocar a origem das credenciais descarta serviços antigos"""
+        with pool.acquire():
+            pass
+        pool.set_credentials_loader(lambda: {'client_email': 'other@example.com'})
+        assert pool.stats()['idle'] == 0
+        with pool.acquire():
+            pass
+        assert pool.stats()['credential_loads'] == 2
@@ -0,0 +1,55 @@
+# tests/test_session_data.py
+import time
+from unittest import mock
+
+import pandas as pd
+import pytest
+from operational.utils import session_data as session_module
+from operational.utils.session_data import SessionData
+
+
+def frame(fetched_at=None, stale=False):
+    df = pd.DataFrame({'COHORT': ['2024-01'], 'USERS': [1000]})
+    df.attrs['fetched_at'] = time.time() if fetched_at is None else fetched_at
+    df.attrs['stale'] = stale
+    return df
+
+
+@pytest.fixture
+def load_sheet():
+    with mock.patch.object(session_module.sheets_client, 'load_sheet') as load_sheet:
+        load_sheet.side_effect = lambda name: frame()
+        yield load_sheet
+
+
+class TestSessionData:
+    def test_loads_each_sheet_once(self, load_sheet):
+        data = SessionData()
+        first = data.get('Cohort')
+        assert data.get('Cohort') is first
+        data.get('Monetization')
+        assert load_sheet.call_count == 2
+        assert data.loaded() == ['Cohort', 'Monetization']
+
+    def test_expired_or_stale_frames_are_reloaded(self, load_sheet, monkeypatch):
+        monkeypatch.setenv('CACHE_TTL', '60')
+        data = SessionData()
+        data._frames['Cohort'] = frame(fetched_at=time.time() - 120)
+        data._frames['Monetization'] = frame(stale=True)
+        data.get('Cohort')
+        data.get('Monetization')
+        assert load_sheet.call_count == 2
+
+    def test_invalidate(self, load_sheet):
+        data = SessionData()
+        data.get('Cohort')
+        data.invalidate('Cohort')
+        data.get('Cohort')
+        assert load_sheet.call_count == 2
+
+    def test_empty_frames_are_not_kept(self, load_sheet):
+        load_sheet.side_effect = lambda name: pd.DataFrame()
+        data = SessionData()
+        data.get('Cohort')
+        data.get('Cohort')
+        assert load_sheet.call_count == 2
@@ -0,0 +1,99 @@
+# tests/test_sheet_cache.py
+import threading
+import time
+
+from operational.utils.sheet_cache import SheetCache, sheet_of
+
+SPREADSHEET_ID = 'sheet-1'
+
+
+def key(range_name):
+    return (SPREADSHEET_ID, range_name)
+
+
+class TestSheetCache:
+    def test_sheet_of(self):
+        assert sheet_of('Cohort!A1:E100') == 'Cohort'
+        assert sheet_of("'Minha Aba'!A1:B2") == 'Minha Aba'
+        assert sheet_of('Cohort') == 'Cohort'
+
+    def test_hits_and_misses_per_key(self):
+        cache = SheetCache()
+        calls = []
+        loader = lambda: calls.append(1) or 'dados'
+        assert cache.get_or_load(key('Cohort!A1:E100'), loader) == 'dados'
+        assert cache.get_or_load(key('Cohort!A1:E100'), loader) == 'dados'
+        assert len(calls) == 1
+        stats = cache.stats()
+        assert stats['keys']['Cohort!A1:E100'] == {'misses': 1, 'hits': 1}
+        assert stats['hit_rate'] == 0.5
+
+    def test_expired_entry_reloads(self):
+        cache = SheetCache(ttl=0.01)
+        cache.get_or_load(key('Cohort'), lambda: 'v1')
+        time.sleep(0.02)
+        assert cache.get_or_load(key('Cohort'), lambda: 'v2') == 'v2'
+
+    def test_cache_if_skips_failed_loads(self):
+        cache = SheetCache()
+        cache.get_or_load(key('Cohort'), lambda: '', cache_if=bool)
+        assert cache.get(key('Cohort')) is None
+
+    def test_invalidate_only_that_sheet(self):
+        cache = SheetCache()
+        cache.set(key('Cohort!A1:E100'), 'a')
+        cache.set(key('Cohort!A1:B10'), 'b')
+        cache.set(key('Monetization!A1:E100'), 'c')
+        cache.set(('outra-planilha', 'Cohort!A1:E100'), 'd')
+        assert cache.invalidate('Cohort', SPREADSHEET_ID) == 2
+        assert cache.get(key('Cohort!A1:E100')) is None
+        assert cache.get(key('Monetization!A1:E100')) == 'c'
+        assert cache.get(('outra-planilha', 'Cohort!A1:E100')) == 'd'
+        assert cache.stats()['invalidations'] == 2
+
+    def test_concurrent_loads_share_one_fetch(self):
+        """Sessões simultâneas esperam a mesma busca em vez de repeti-la"""
+        cache = SheetCache()
+        calls = []
+        started = threading.Event()
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return 'dados'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load(key('Cohort'), slow_loader)))
+                   for _ in range(5)]
+        threads[0].start()
+        started.wait()
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ['dados'] * 5
+        assert cache.stats()['coalesced'] == 4
+
+    def test_page_load_waits_for_background_reload(self):
+        """Uma leitura com o TTL vencido espera o refresh em andamento (uma busca só)"""
+        cache = SheetCache(ttl=0.01)
+        cache.set(key('Cohort'), 'v1')
+        time.sleep(0.02)
+        calls = []
+        started = threading.Event()
+
+        def slow_loader():
+            calls.append(1)
+            started.set()
+            time.sleep(0.1)
+            return 'v2'
+
+        refresh = threading.Thread(target=cache.reload, args=(key('Cohort'), slow_loader))
+        refresh.start()
+        started.wait()
+        assert cache.get_or_load(key('Cohort'), slow_loader) == 'v2'
+        refresh.join()
+        assert len(calls) == 1
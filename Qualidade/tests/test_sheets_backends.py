@@ -0,0 +1,124 @@
+# tests/test_sheets_backends.py
+import importlib
+import sys
+
+import pandas as pd
+import pytest
+from operational.utils import sheets_client as client_module
+from operational.utils.sheets_backends import GoogleBackend, LocalFilesBackend, create_backend
+from operational.utils.sheets_client import GoogleSheetsClient
+
+COHORT_VALUES = [
+    ['COHORT', 'USERS', 'RETENTION_D1', 'RETENTION_D7', 'RETENTION_D30'],
+    ['2024-01', '1000', '0.8', '0.45', '0.25'],
+    ['2024-02', '1200', '0.82', '0.48', '0.27'],
+]
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = LocalFilesBackend(tmp_path / 'sheets')
+    backend.set_tab('Cohort', COHORT_VALUES)
+    return backend
+
+
+class TestLocalFilesBackend:
+    def test_metadata_has_grid_size(self, backend):
+        props = backend.metadata()['sheets'][0]['properties']
+        assert props['title'] == 'Cohort'
+        assert props['gridProperties'] == {'rowCount': 3, 'columnCount': 5}
+
+    def test_values_sliced_by_range(self, backend):
+        assert backend.values('Cohort') == COHORT_VALUES
+        assert backend.values('Cohort!A2:B3') == [['2024-01', '1000'], ['2024-02', '1200']]
+        assert backend.batch_values(['Cohort!A1:A1', 'Cohort!B1:B1']) == [[['COHORT']], [['USERS']]]
+
+    def test_unknown_tab_is_an_error(self, backend):
+        with pytest.raises(ValueError):
+            backend.values('Inexistente!A1:B2')
+
+    def test_revision_changes_when_a_tab_is_rewritten(self, backend):
+        before = backend.revision()
+        backend.set_tab('Cohort', COHORT_VALUES[:2])
+        assert backend.revision() != before
+
+    def test_operations_are_timed(self, backend):
+        backend.values('Cohort')
+        backend.values('Cohort')
+        stats = backend.stats()
+        assert stats['backend'] == 'local'
+        assert stats['calls']['values'] == 2
+        assert stats['seconds']['values'] > 0
+
+
+class TestClientOnLocalFiles:
+    def test_same_pipeline_as_the_api(self, backend):
+        """Tipos, cache e metadados saem iguais aos da API"""
+        client = GoogleSheetsClient(backend)
+        df = client.get_sheet_data('Cohort')
+        assert pd.api.types.is_datetime64_any_dtype(df['COHORT'])
+        assert df['USERS'].tolist() == [1000, 1200]
+        assert client.get_all_sheets()[0]['rows'] == 3
+        assert client.has_sheet('Cohort') and not client.has_sheet('ABTest')
+        client.get_sheet_data('Cohort')
+        assert backend.stats()['calls']['values'] == 1
+
+    def test_invalidate_reads_the_new_file(self, backend):
+        client = GoogleSheetsClient(backend)
+        client.get_sheet_data('Cohort')
+        backend.set_tab('Cohort', COHORT_VALUES + [['2024-03', '900', '0.7', '0.4', '0.2']])
+        client.invalidate('Cohort')
+        assert len(client.get_sheet_data('Cohort')) == 3
+
+    def test_no_snapshots_for_local_files(self, backend, tmp_path, monkeypatch):
+        saved = []
+        monkeypatch.setattr(client_module.snapshot_cache, 'save', lambda *args, **kwargs: saved.append(args))
+        GoogleSheetsClient(backend).get_sheet_data('Cohort')
+        assert saved == []
+
+
+class TestCreateBackend:
+    def test_local_backend_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('DATA_BACKEND', 'local')
+        monkeypatch.setenv('LOCAL_SHEETS_DIR', str(tmp_path))
+        backend = create_backend()
+        assert isinstance(backend, LocalFilesBackend)
+        assert backend.folder == tmp_path
+
+    def test_google_is_the_default(self, monkeypatch):
+        monkeypatch.delenv('DATA_BACKEND', raising=False)
+        assert isinstance(create_backend(), GoogleBackend)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            create_backend('ftp')
+
+
+class TestLegacyModules:
+    def test_google_sheets_delegates_to_sheets_client(self, monkeypatch):
+        from operational.utils import google_sheets
+        monkeypatch.setattr(client_module.sheets_client, 'get_sheet_data',
+                            lambda sheet_name, range_cells=None: pd.DataFrame({'sheet': [sheet_name]}))
+        with pytest.warns(DeprecationWarning):
+            df = google_sheets.get_sheet_data(client_module.sheets_client.source_id, 'Cohort')
+        assert df['sheet'].tolist() == ['Cohort']
+
+    def test_google_sheets_honors_the_spreadsheet_id(self, backend, monkeypatch):
+        from operational.utils import google_sheets
+        monkeypatch.setattr(google_sheets, '_other_clients', {})
+        monkeypatch.setattr(client_module, 'sheets_client', GoogleSheetsClient(backend))
+        with pytest.warns(DeprecationWarning), pytest.raises(ValueError):
+            google_sheets.get_sheet_data('outra-planilha', 'Cohort')
+
+        monkeypatch.setattr(client_module, 'sheets_client', GoogleSheetsClient(GoogleBackend(spreadsheet_id='a')))
+        assert google_sheets._client('b').source_id == 'b'
+        assert google_sheets._client('a') is client_module.sheets_client
+
+    def test_google_sheets_client_keeps_the_old_interface(self, backend):
+        sys.modules.pop('operational.utils.google_sheets_client', None)
+        with pytest.warns(DeprecationWarning):
+            legacy = importlib.import_module('operational.utils.google_sheets_client')
+        assert legacy.sheets_client._client is client_module.sheets_client
+        client = legacy.GoogleSheetsClient(GoogleSheetsClient(backend))
+        assert client.get_all_sheets() == ['Cohort']
+        assert client.get_sheet_data('Cohort')['USERS'].tolist() == [1000, 1200]
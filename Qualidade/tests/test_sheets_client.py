@@ -0,0 +1,484 @@
+# tests/test_sheets_client.py
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+
+import httplib2
+import pandas as pd
+import pytest
+from googleapiclient.errors import HttpError
+from operational.utils import sheets_backends as backends_module
+from operational.utils import sheets_client as client_module
+from operational.utils.sheets_backends import GoogleBackend
+from operational.utils.sheets_client import GoogleSheetsClient
+from operational.utils.snapshot_cache import SnapshotCache
+from operational.utils.rate_limiter import TokenBucket
+
+COHORT_VALUES = [
+    ['COHORT', 'USERS', 'RETENTION_D1', 'RETENTION_D7', 'RETENTION_D30'],
+    ['2024-01', '1000', '0.8', '0.45', '0.25'],
+    ['2024-02', '1200', '0.82', '0.48', '0.27'],
+]
+MONETIZATION_VALUES = [
+    ['INSTALL_DATE', 'REVENUE', 'DAU', 'ARPU', 'CONVERTION'],
+    ['2024-01-01', '15000', '5000', '3.0', '0.05'],
+]
+
+
+class FakePool:
+    """Substitui o service_pool por um serviço mockado"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def checkout(self, api='sheets', version='v4'):
+        return self.service
+
+    def release(self, service, api='sheets', version='v4'):
+        pass
+
+    @contextmanager
+    def acquire(self, api='sheets', version='v4'):
+        yield self.service
+
+    def stats(self):
+        return {}
+
+
+@pytest.fixture
+def service():
+    service = mock.MagicMock()
+    values = service.spreadsheets.return_value.values.return_value
+    values.get.return_value.execute.return_value = {'values': COHORT_VALUES}
+    values.batchGet.return_value.execute.return_value = {
+        'valueRanges': [
+            {'range': 'Cohort!A1:E100', 'values': COHORT_VALUES},
+            {'range': 'Monetization!A1:E100', 'values': MONETIZATION_VALUES},
+        ]
+    }
+    service.files.return_value.get.return_value.execute.return_value = {'version': '1'}
+    set_grid(service, Cohort=(100, 5), Monetization=(100, 5))
+    return service
+
+
+def set_grid(service, **sizes):
+    """Metadados da planilha com o tamanho (linhas, colunas) de cada aba"""
+    service.spreadsheets.return_value.get.return_value.execute.return_value = {
+        'sheets': [
+            {'properties': {'title': name, 'gridProperties': {'rowCount': rows, 'columnCount': columns}}}
+            for name, (rows, columns) in sizes.items()
+        ]
+    }
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    return SnapshotCache(tmp_path / 'snapshots')
+
+
+@pytest.fixture
+def client(service, snapshots):
+    backend = GoogleBackend(pool=FakePool(service), limiter=TokenBucket(rate=1000, capacity=1000))
+    with mock.patch.object(client_module, 'snapshot_cache', snapshots):
+        yield GoogleSheetsClient(backend)
+
+
+class TestGoogleSheetsClient:
+    def test_get_sheet_data(self, client, service):
+        """Carrega uma aba como DataFrame"""
+        df = client.get_sheet_data('Cohort')
+        assert list(df.columns) == COHORT_VALUES[0]
+        assert len(df) == 2
+        values = service.spreadsheets.return_value.values.return_value
+        assert values.get.call_args.kwargs['range'] == 'Cohort!A1:E100'
+
+    def test_get_sheets_data_single_batch_call(self, client, service):
+        """Várias abas são carregadas em uma única chamada batchGet"""
+        frames = client.get_sheets_data(['Cohort', 'Monetization'])
+        values = service.spreadsheets.return_value.values.return_value
+        assert values.batchGet.call_count == 1
+        assert values.batchGet.call_args.kwargs['ranges'] == ['Cohort!A1:E100', 'Monetization!A1:E100']
+        assert values.get.call_count == 0
+        assert set(frames) == {'Cohort', 'Monetization'}
+        assert len(frames['Cohort']) == 2
+        assert frames['Monetization']['REVENUE'].tolist() == [15000.0]
+
+    def test_get_sheets_data_error_returns_empty_frames(self, client, service):
+        """Erro na API devolve DataFrames vazios para todas as abas"""
+        values = service.spreadsheets.return_value.values.return_value
+        values.batchGet.return_value.execute.side_effect = RuntimeError('boom')
+        frames = client.get_sheets_data(['Cohort', 'Monetization'])
+        assert all(df.empty for df in frames.values())
+
+    def test_prefetch_does_not_touch_the_ui(self, client, service):
+        """prefetch (warm-up) carrega em lote e sobe o erro em vez de chamar st.*"""
+        with mock.patch.object(client_module, 'st') as st:
+            frames = client.prefetch(['Cohort', 'Monetization'])
+            assert len(frames['Cohort']) == 2
+            client.clear_cache()
+            values = service.spreadsheets.return_value.values.return_value
+            values.batchGet.return_value.execute.side_effect = RuntimeError('boom')
+            with pytest.raises(RuntimeError, match='boom'):
+                client.prefetch(['Monetization'])
+        assert st.mock_calls == []
+
+    def test_snapshot_served_after_memory_cache_cleared(self, client, service):
+        """Snapshot em disco evita nova chamada à API após restart"""
+        client.get_sheet_data('Cohort')
+        client._cache.clear()  # simula restart do processo
+        df = client.get_sheet_data('Cohort')
+        values = service.spreadsheets.return_value.values.return_value
+        assert values.get.call_count == 1
+        assert len(df) == 2
+
+    def test_batch_only_fetches_tabs_without_snapshot(self, client, service, snapshots):
+        """Abas com snapshot válido não entram no batchGet"""
+        client.get_sheet_data('Cohort')
+        values = service.spreadsheets.return_value.values.return_value
+        values.batchGet.return_value.execute.return_value = {
+            'valueRanges': [{'range': 'Monetization!A1:E100', 'values': MONETIZATION_VALUES}]
+        }
+        frames = client.get_sheets_data(['Cohort', 'Monetization'])
+        assert values.batchGet.call_args.kwargs['ranges'] == ['Monetization!A1:E100']
+        assert len(frames['Cohort']) == 2
+        assert len(frames['Monetization']) == 1
+
+    def test_stale_snapshot_used_when_api_fails(self, client, service, snapshots):
+        """Erro na API cai para o último snapshot, mesmo vencido"""
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        values = service.spreadsheets.return_value.values.return_value
+        values.get.return_value.execute.side_effect = RuntimeError('offline')
+        with mock.patch.object(client_module.settings.__class__, 'cache_ttl',
+                               new_callable=mock.PropertyMock, return_value=0):
+            df = client.get_sheet_data('Cohort')
+        assert len(df) == 2
+
+    def test_schema_types_applied_on_load(self, client):
+        """Colunas saem tipadas conforme settings.get_sheet_config"""
+        df = client.get_sheet_data('Cohort')
+        assert pd.api.types.is_datetime64_any_dtype(df['COHORT'])
+        assert pd.api.types.is_integer_dtype(df['USERS'])
+        assert df['RETENTION_D1'].dtype == 'float32'
+
+
+class TestStaleWhileRevalidate:
+    @pytest.fixture(autouse=True)
+    def swr_mode(self, monkeypatch):
+        monkeypatch.setenv('REFRESH_MODE', 'stale_while_revalidate')
+        monkeypatch.setenv('CACHE_TTL', '300')
+        monkeypatch.setenv('MAX_STALENESS', '3600')
+
+    def _seed(self, client, age):
+        """Simula um DataFrame carregado há `age` segundos"""
+        df = client._values_to_dataframe('Cohort', COHORT_VALUES[:2])
+        client._remember('Cohort!A1:E100', df, fetched_at=time.time() - age)
+
+    def test_serves_stale_and_refreshes_in_background(self, client, service):
+        """Dado vencido volta na hora e o refresh roda em outra thread"""
+        self._seed(client, age=1000)
+        df = client.load_sheet('Cohort')
+        assert len(df) == 1
+        assert df.attrs['stale'] is True
+
+        client._refresh_executor.shutdown(wait=True)
+        values = service.spreadsheets.return_value.values.return_value
+        assert values.get.call_count == 1
+
+        fresh = client.load_sheet('Cohort')
+        assert len(fresh) == 2
+        assert fresh.attrs['stale'] is False
+
+    def test_fresh_data_does_not_refresh(self, client, service):
+        """Dentro do TTL não há chamada à API"""
+        self._seed(client, age=10)
+        df = client.load_sheet('Cohort')
+        client._refresh_executor.shutdown(wait=True)
+        values = service.spreadsheets.return_value.values.return_value
+        assert values.get.call_count == 0
+        assert df.attrs['stale'] is False
+
+    def test_too_stale_blocks_on_fetch(self, client, service):
+        """Além de MAX_STALENESS a busca é bloqueante"""
+        self._seed(client, age=7200)
+        df = client.load_sheet('Cohort')
+        assert len(df) == 2
+        assert 'fetched_at' in df.attrs
+
+    def test_blocking_mode_keeps_data_timestamp(self, client, monkeypatch):
+        """O modo padrão também informa o horário dos dados"""
+        monkeypatch.setenv('REFRESH_MODE', 'blocking')
+        df = client.load_sheet('Cohort')
+        assert df.attrs['fetched_at'] <= time.time()
+
+
+class TestChangeDetection:
+    @pytest.fixture(autouse=True)
+    def expire_immediately(self, monkeypatch):
+        """TTL zero: toda leitura passa pela verificação de mudanças"""
+        monkeypatch.setenv('CACHE_TTL', '0')
+        monkeypatch.setenv('REVISION_CHECK_INTERVAL', '0')
+
+    def _values_api(self, service):
+        return service.spreadsheets.return_value.values.return_value
+
+    def test_unchanged_spreadsheet_skips_refetch(self, client, service):
+        """Mesma versão no Drive: os valores não são baixados de novo"""
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        df = client.get_sheet_data('Cohort')
+        assert self._values_api(service).get.call_count == 1
+        assert len(df) == 2
+        assert client.stats()['skipped_fetches'] == 1
+        assert client.stats()['fetches'] == 1
+
+    def test_new_revision_refetches(self, client, service):
+        """Versão nova no Drive força o download"""
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        service.files.return_value.get.return_value.execute.return_value = {'version': '2'}
+        client.get_sheet_data('Cohort')
+        assert self._values_api(service).get.call_count == 2
+        assert client.stats()['skipped_fetches'] == 0
+
+    def test_batch_skips_unchanged_tabs(self, client, service):
+        """No lote só entram as abas sem dado da versão atual"""
+        client.get_sheet_data('Cohort')
+        service.files.return_value.get.return_value.execute.return_value = {'version': '1'}
+        self._values_api(service).batchGet.return_value.execute.return_value = {
+            'valueRanges': [{'range': 'Monetization!A1:E100', 'values': MONETIZATION_VALUES}]
+        }
+        frames = client.get_sheets_data(['Cohort', 'Monetization'])
+        assert self._values_api(service).batchGet.call_args.kwargs['ranges'] == ['Monetization!A1:E100']
+        assert len(frames['Cohort']) == 2
+        assert client.stats()['skipped_fetches'] == 1
+
+    def test_drive_failure_falls_back_to_fetch(self, client, service):
+        """Sem resposta do Drive a aba é baixada normalmente"""
+        service.files.return_value.get.return_value.execute.side_effect = RuntimeError('no drive')
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        client.get_sheet_data('Cohort')
+        assert self._values_api(service).get.call_count == 2
+
+    def test_drive_access_denied_turns_detection_off(self, client, service):
+        """403 do Drive (conta sem escopo ou sem acesso): a versão não é consultada de novo"""
+        files_get = service.files.return_value.get.return_value.execute
+        files_get.side_effect = http_error(403)
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        client.get_sheet_data('Cohort')
+        assert files_get.call_count == 1
+        assert self._values_api(service).get.call_count == 2
+
+    def test_drive_rate_limit_keeps_detection_on(self, client, service):
+        files_get = service.files.return_value.get.return_value.execute
+        files_get.side_effect = HttpError(httplib2.Response({'status': '403'}),
+                                          b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}')
+        client.get_sheet_data('Cohort')
+        client._cache.clear()
+        client.get_sheet_data('Cohort')
+        assert files_get.call_count == 2
+
+
+class TestRangeSizing:
+    def _values_api(self, service):
+        return service.spreadsheets.return_value.values.return_value
+
+    def test_column_letter(self):
+        assert [client_module.column_letter(i) for i in (1, 5, 26, 27, 52, 703)] == \
+            ['A', 'E', 'Z', 'AA', 'AZ', 'AAA']
+
+    def test_range_sized_from_grid(self, client, service):
+        """Sem range fixo, o range vem de gridProperties"""
+        set_grid(service, Cohort=(2500, 30))
+        client.get_sheet_data('Cohort')
+        assert self._values_api(service).get.call_args.kwargs['range'] == 'Cohort!A1:AD2500'
+
+    def test_unknown_grid_requests_whole_tab(self, client, service):
+        """Sem metadados a API recebe só o nome da aba"""
+        client.get_sheet_data('Desconhecida')
+        assert self._values_api(service).get.call_args.kwargs['range'] == 'Desconhecida'
+
+    def _paginated(self, service, total_rows=0, header=None, rows=None):
+        """values().get que responde por faixa de linhas (linhas [] ficam em branco)"""
+        header = header or COHORT_VALUES[0]
+        if rows is None:
+            rows = [[f'2024-01-{i % 28 + 1:02d}', str(i), '0.5', '0.3', '0.1'] for i in range(total_rows)]
+
+        def get(spreadsheetId, range):
+            cells = range.split('!')[1]
+            start, end = cells.split(':')
+            first = int(start[1:])
+            last = int(''.join(ch for ch in end if ch.isdigit()))
+            if first == 1 and last == 1:
+                values = [header]
+            else:
+                values = rows[first - 2:last - 1]
+                # A API omite as linhas em branco do fim do range
+                while values and not values[-1]:
+                    values = values[:-1]
+            request = mock.Mock()
+            request.execute.return_value = {'values': values} if values else {}
+            return request
+
+        self._values_api(service).get.side_effect = get
+
+    def test_iter_sheet_chunks(self, client, service):
+        """Aba lida em blocos de linhas com o cabeçalho em cada bloco"""
+        self._paginated(service, total_rows=25)
+        set_grid(service, Cohort=(26, 5))
+        chunks = list(client.iter_sheet_chunks('Cohort', chunk_rows=10))
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+        assert all(list(chunk.columns) == COHORT_VALUES[0] for chunk in chunks)
+        # cabeçalho + 3 blocos, até a última linha da grade
+        assert self._values_api(service).get.call_count == 4
+
+    def test_blank_block_does_not_end_the_read(self, client, service):
+        """Um bloco de linhas em branco no meio da aba não corta o resto"""
+        rows = [[f'2024-01-{i % 28 + 1:02d}', str(i), '0.5', '0.3', '0.1'] for i in range(30)]
+        rows[10:20] = [[]] * 10
+        self._paginated(service, rows=rows)
+        set_grid(service, Cohort=(31, 5))
+        chunks = list(client.iter_sheet_chunks('Cohort', chunk_rows=10))
+        assert pd.concat(chunks)['USERS'].tolist() == list(range(10)) + list(range(20, 30))
+
+    def test_large_tab_loaded_in_chunks(self, client, service, monkeypatch):
+        """Acima do limite, get_sheet_data junta os blocos"""
+        monkeypatch.setenv('CHUNK_THRESHOLD_ROWS', '50')
+        monkeypatch.setenv('CHUNK_ROWS', '20')
+        self._paginated(service, total_rows=45)
+        set_grid(service, Cohort=(200, 5))
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == 45
+        assert df['USERS'].tolist() == list(range(45))
+
+    def test_large_tab_keeps_categories(self, client, service, monkeypatch):
+        """Os tipos vêm depois de juntar os blocos: categorias não viram object"""
+        monkeypatch.setenv('CHUNK_THRESHOLD_ROWS', '50')
+        monkeypatch.setenv('CHUNK_ROWS', '20')
+        header = ['experiment', 'variant', 'revenue']
+        rows = [[f'exp_{i // 20}', 'control' if i % 2 else 'b', '1,5'] for i in range(60)]
+        self._paginated(service, header=header, rows=rows)
+        set_grid(service, ABTest=(61, 3))
+        df = client.get_sheet_data('ABTest')
+        assert isinstance(df['experiment'].dtype, pd.CategoricalDtype)
+        assert list(df['experiment'].cat.categories) == ['exp_0', 'exp_1', 'exp_2']
+
+
+def http_error(status, retry_after=None):
+    """HttpError como o googleapiclient levanta"""
+    headers = {'status': str(status)}
+    if retry_after is not None:
+        headers['retry-after'] = str(retry_after)
+    return HttpError(httplib2.Response(headers), b'{}')
+
+
+class TestRetries:
+    @pytest.fixture(autouse=True)
+    def fast_backoff(self, monkeypatch):
+        monkeypatch.setenv('API_BACKOFF_BASE', '0.001')
+        monkeypatch.setenv('API_BACKOFF_MAX', '0.01')
+        monkeypatch.setenv('API_MAX_RETRIES', '3')
+
+    def _get(self, service):
+        return service.spreadsheets.return_value.values.return_value.get.return_value
+
+    def test_quota_error_retried(self, client, service):
+        """429 seguido de sucesso não vira DataFrame vazio"""
+        self._get(service).execute.side_effect = [http_error(429), http_error(503), {'values': COHORT_VALUES}]
+        df = client.get_sheet_data('Cohort')
+        assert len(df) == 2
+        stats = client.stats()
+        assert stats['retries'] == 2
+        assert stats['quota_errors'] == 1
+        assert stats['backoff_seconds'] > 0
+
+    def test_gives_up_after_max_retries(self, client, service):
+        self._get(service).execute.side_effect = http_error(429)
+        df = client.get_sheet_data('Cohort')
+        assert df.empty
+        assert self._get(service).execute.call_count == 4
+
+    def test_client_errors_not_retried(self, client, service):
+        self._get(service).execute.side_effect = http_error(400)
+        client.get_sheet_data('Cohort')
+        assert self._get(service).execute.call_count == 1
+
+    def test_retry_after_header_respected(self):
+        assert backends_module.backoff_delay(0, '2', cap=30) == 2.0
+
+
+class TestInvalidation:
+    def _values_api(self, service):
+        return service.spreadsheets.return_value.values.return_value
+
+    def test_repeated_reads_hit_memory_cache(self, client, service):
+        client.get_sheet_data('Cohort')
+        client.get_sheet_data('Cohort')
+        assert self._values_api(service).get.call_count == 1
+        assert client.cache_stats()['keys']['Cohort!A1:E100'] == {'misses': 1, 'hits': 1}
+
+    def test_invalidate_refetches_only_that_sheet(self, client, service):
+        """Recarregar uma aba não descarta as outras"""
+        client.get_sheets_data(['Cohort', 'Monetization'])
+        client.invalidate('Cohort')
+        self._values_api(service).batchGet.return_value.execute.return_value = {
+            'valueRanges': [{'range': 'Cohort!A1:E100', 'values': COHORT_VALUES}]
+        }
+        frames = client.get_sheets_data(['Cohort', 'Monetization'])
+        assert self._values_api(service).batchGet.call_args.kwargs['ranges'] == ['Cohort!A1:E100']
+        assert len(frames['Monetization']) == 1
+        assert client.stats()['fetches'] == 3
+
+    def test_returned_frame_does_not_alter_cache(self, client):
+        df = client.get_sheet_data('Cohort')
+        df['EXTRA'] = 1
+        assert 'EXTRA' not in client.get_sheet_data('Cohort').columns
+
+
+class TestSingleFlight:
+    def _values_api(self, service):
+        return service.spreadsheets.return_value.values.return_value
+
+    def _slow(self, service, method, response):
+        def execute():
+            time.sleep(0.2)
+            return response
+        getattr(self._values_api(service), method).return_value.execute.side_effect = execute
+
+    def _concurrently(self, func, count=4):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(func())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_page_loads_share_one_fetch(self, client, service):
+        """Várias sessões após o TTL vencer disparam uma única busca"""
+        self._slow(service, 'get', {'values': COHORT_VALUES})
+        results = self._concurrently(lambda: client.get_sheet_data('Cohort'))
+        assert self._values_api(service).get.call_count == 1
+        assert all(len(df) == 2 for df in results)
+
+    def test_batch_waits_for_range_already_in_flight(self, client, service):
+        """O lote não pede de novo um range que outra sessão está buscando"""
+        self._slow(service, 'get', {'values': COHORT_VALUES})
+        self._values_api(service).batchGet.return_value.execute.return_value = {
+            'valueRanges': [{'range': 'Monetization!A1:E100', 'values': MONETIZATION_VALUES}]
+        }
+        single = threading.Thread(target=client.get_sheet_data, args=('Cohort',))
+        single.start()
+        time.sleep(0.05)
+        frames = client.get_sheets_data(['Cohort', 'Monetization'])
+        single.join()
+        assert self._values_api(service).batchGet.call_args.kwargs['ranges'] == ['Monetization!A1:E100']
+        assert len(frames['Cohort']) == 2
+
+    def test_shared_result_is_read_only(self, client):
+        df = client.get_sheet_data('Cohort')
+        with pytest.raises(ValueError):
+            df.loc[0, 'USERS'] = 0
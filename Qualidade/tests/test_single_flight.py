@@ -0,0 +1,81 @@
+# tests/test_single_flight.py
+import threading
+import time
+
+import pandas as pd
+import pytest
+from operational.utils.single_flight import SingleFlight, freeze_frame
+
+
+def run_concurrently(func, count=5):
+    """Dispara `count` threads juntas e devolve os resultados"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.1)
+            return object()
+
+        results = run_concurrently(lambda: flights.do('Cohort!A1:E100', fetch))
+        values = {id(value) for value, _ in results}
+        assert len(calls) == 1
+        assert len(values) == 1  # todos recebem o mesmo objeto
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert flights.stats() == {'leaders': 1, 'shared': 4}
+        assert flights.in_flight() == []
+
+    def test_error_reaches_every_waiter(self):
+        flights = SingleFlight()
+
+        def fetch():
+            time.sleep(0.1)
+            raise RuntimeError('quota')
+
+        results = run_concurrently(lambda: flights.do('Cohort', fetch), count=3)
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    def test_sequential_calls_are_not_cached(self):
+        flights = SingleFlight()
+        assert flights.do('Cohort', lambda: 1) == (1, False)
+        assert flights.do('Cohort', lambda: 2) == (2, False)
+
+    def test_begin_splits_leading_and_following(self):
+        flights = SingleFlight()
+        leading, _ = flights.begin(['Cohort'])
+        leading_batch, following = flights.begin(['Cohort', 'Monetization'])
+        assert list(leading_batch) == ['Monetization']
+        assert list(following) == ['Cohort']
+        flights.finish('Cohort', 'dados')
+        assert following['Cohort'].result(timeout=1) == 'dados'
+
+
+class TestFreezeFrame:
+    def test_in_place_writes_are_rejected(self):
+        df = freeze_frame(pd.DataFrame({'USERS': [1000, 1200], 'ARPU': [3.0, 2.5], 'NAME': ['a', 'b']}))
+        view = df.copy(deep=False)
+        for column in ('USERS', 'ARPU', 'NAME'):
+            with pytest.raises(ValueError):
+                view.loc[0, column] = view.loc[1, column]
+        view['USERS'] = view['USERS'] * 2
+        assert df['USERS'].tolist() == [1000, 1200]
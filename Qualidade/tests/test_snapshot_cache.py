@@ -0,0 +1,56 @@
+# tests/test_snapshot_cache.py
+import time
+
+import pandas as pd
+import pytest
+from operational.utils.snapshot_cache import SnapshotCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SnapshotCache(tmp_path)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({'COHORT': ['2024-01', '2024-02'], 'USERS': ['1000', '1200']})
+
+
+class TestSnapshotCache:
+    def test_round_trip(self, cache, df):
+        """Snapshot gravado é lido com os mesmos dados e metadados"""
+        cache.save('sheet-id', 'Cohort!A1:E100', df, revision='42')
+        loaded, meta = cache.load('sheet-id', 'Cohort!A1:E100')
+        pd.testing.assert_frame_equal(loaded, df)
+        assert meta['revision'] == '42'
+        assert meta['rows'] == 2
+        assert meta['range'] == 'Cohort!A1:E100'
+
+    def test_missing_snapshot(self, cache):
+        assert cache.load('sheet-id', 'Cohort!A1:E100') is None
+
+    def test_max_age(self, cache, df):
+        """Snapshot mais velho que max_age é ignorado"""
+        cache.save('sheet-id', 'Cohort!A1:E100', df)
+        time.sleep(0.05)
+        assert cache.load('sheet-id', 'Cohort!A1:E100', max_age=0.01) is None
+        assert cache.load('sheet-id', 'Cohort!A1:E100', max_age=60) is not None
+
+    def test_shared_between_instances(self, tmp_path, df):
+        """Outro processo (outra instância) enxerga o mesmo snapshot"""
+        SnapshotCache(tmp_path).save('sheet-id', 'Cohort!A1:E100', df)
+        assert SnapshotCache(tmp_path).load('sheet-id', 'Cohort!A1:E100') is not None
+
+    def test_non_ascii_ranges_do_not_collide(self, cache, df):
+        """Ranges que só diferem em caracteres fora do ASCII ficam em arquivos separados"""
+        cache.save('sheet-id', "'Análise'!A:Z", df)
+        cache.save('sheet-id', "'Anßlise'!A:Z", df.head(1))
+        assert len(cache.load('sheet-id', "'Análise'!A:Z")[0]) == 2
+        assert len(cache.load('sheet-id', "'Anßlise'!A:Z")[0]) == 1
+
+    def test_clear(self, cache, df):
+        cache.save('sheet-id', 'Cohort!A1:E100', df)
+        cache.save('sheet-id', 'Monetization!A1:E100', df)
+        cache.clear('sheet-id')
+        assert cache.load('sheet-id', 'Cohort!A1:E100') is None
+        assert cache.load('sheet-id', 'Monetization!A1:E100') is None
@@ -0,0 +1,50 @@
+# tests/test_synthetic_data.py
+import pandas as pd
+import pytest
+from operational.analytics.cohort_engine import build_retention_matrix, has_session_columns
+from operational.analytics.monetization_engine import has_purchase_columns, monetization_summary
+from operational.utils.synthetic_data import SEGMENTS, generate, read_table, write_dataset
+
+
+class TestSyntheticData:
+    def test_same_seed_same_data(self):
+        first = generate(2_000, seed=7, chunk_size=500)
+        second = generate(2_000, seed=7, chunk_size=500)
+        other = generate(2_000, seed=8, chunk_size=500)
+        for table in first:
+            pd.testing.assert_frame_equal(first[table], second[table])
+        assert not first['sessions'].equals(other['sessions'])
+
+    def test_tables_are_consistent(self):
+        data = generate(5_000, seed=1, chunk_size=2_000)
+        players, sessions, purchases = data['players'], data['sessions'], data['purchases']
+
+        assert players['player_id'].is_unique
+        assert len(players) == 5_000
+        assert (sessions.groupby('player_id').size() == players.set_index('player_id')['active_days']).all()
+        assert (sessions['session_date'] >= sessions['install_date']).all()
+        assert purchases['value'].sum() == pytest.approx(players['total_spent'].sum(), abs=0.05)
+        assert set(purchases['segment'].unique()) <= {'whale', 'dolphin', 'minnow'}
+
+        share = players['segment'].value_counts(normalize=True)
+        assert share['free'] == pytest.approx(SEGMENTS['free']['prob'], abs=0.03)
+
+    def test_feeds_the_engines(self):
+        data = generate(3_000, seed=3)
+        assert has_session_columns(data['sessions'])
+        assert has_purchase_columns(data['purchases'])
+
+        matrix = build_retention_matrix(data['sessions'])
+        assert (matrix[0].dropna() == 1.0).all()
+        summary = monetization_summary(data['players'], data['purchases'])
+        assert summary['paying_players'] == (data['players']['total_spent'] > 0).sum()
+
+    @pytest.mark.parametrize('file_format', ['parquet', 'csv'])
+    def test_write_and_read_back(self, tmp_path, file_format):
+        rows = write_dataset(tmp_path, 1_500, seed=5, chunk_size=1_000, file_format=file_format)
+        assert rows['players'] == 1_500
+        assert len(list((tmp_path / 'sessions').glob(f'part-*.{file_format}'))) == 2
+
+        sessions = read_table(tmp_path, 'sessions')
+        expected = generate(1_500, seed=5, chunk_size=1_000)['sessions']
+        pd.testing.assert_frame_equal(sessions, expected, check_dtype=False)
@@ -0,0 +1,62 @@
+# tests/test_telemetry.py
+import json
+import urllib.request
+
+import pytest
+from operational.utils.telemetry import MetricsRegistry, start_metrics_server
+
+
+@pytest.fixture
+def metrics():
+    return MetricsRegistry()
+
+
+class TestMetricsRegistry:
+    def test_span_records_duration_and_attributes(self, metrics):
+        with metrics.span('sheets_http_request', operation='values') as s:
+            s.set(bytes=2048, rows=10)
+        histograms = metrics.to_dict()['histograms']
+        assert histograms['sheets_http_request_seconds'][0]['count'] == 1
+        assert histograms['sheets_http_request_bytes'][0]['sum'] == 2048
+        assert histograms['sheets_http_request_rows'][0]['labels'] == {'operation': 'values'}
+
+    def test_span_counts_errors_and_reraises(self, metrics):
+        with pytest.raises(ValueError):
+            with metrics.span('sheets_validation', sheet='Cohort'):
+                raise ValueError('ruim')
+        counters = metrics.to_dict()['counters']
+        assert counters['sheets_validation_errors_total'][0]['value'] == 1
+        assert metrics.recent_spans()[0]['error'] == 'ValueError'
+
+    def test_histogram_buckets_are_cumulative(self, metrics):
+        for value in (0.002, 0.02, 3.0):
+            metrics.observe('op_seconds', value)
+        buckets = metrics.to_dict()['histograms']['op_seconds'][0]['buckets']
+        assert buckets['0.005'] == 1
+        assert buckets['0.025'] == 2
+        assert buckets['5.0'] == 3
+
+    def test_prometheus_text(self, metrics):
+        metrics.inc('sheets_cache_lookups_total', event='hits')
+        metrics.observe('sheets_http_request_seconds', 0.2, operation='values')
+        text = metrics.to_prometheus()
+        assert '# TYPE sheets_cache_lookups_total counter' in text
+        assert 'sheets_cache_lookups_total{event="hits"} 1' in text
+        assert 'sheets_http_request_seconds_bucket{operation="values",le="0.25"} 1' in text
+        assert 'sheets_http_request_seconds_bucket{operation="values",le="+Inf"} 1' in text
+        assert 'sheets_http_request_seconds_count{operation="values"} 1' in text
+
+    def test_dump_json(self, metrics, tmp_path):
+        metrics.inc('x_total', 3)
+        path = metrics.dump(tmp_path / 'metrics.json')
+        assert json.loads(path.read_text())['counters']['x_total'][0]['value'] == 3
+
+    def test_metrics_server(self, metrics):
+        metrics.inc('x_total')
+        server = start_metrics_server(0, host='127.0.0.1', metrics=metrics)
+        try:
+            url = f"http://127.0.0.1:{server.server_port}"
+            assert 'x_total 1' in urllib.request.urlopen(f"{url}/metrics").read().decode()
+            assert 'x_total' in json.loads(urllib.request.urlopen(f"{url}/metrics.json").read())['counters']
+        finally:
+            server.shutdown()